@@ -3,8 +3,10 @@
 from typing import cast
 
 from custom_components.rfplayer.const import DOMAIN, RFPLAYER_GATEWAY
+from custom_components.rfplayer.device_store import DeviceStore
+from custom_components.rfplayer.event_snapshot import EventSnapshot
 from custom_components.rfplayer.gateway import Gateway
-from custom_components.rfplayer.migration import async_migrate_version_1_2
+from custom_components.rfplayer.migration import async_migrate_version_1_2, async_migrate_version_1_3
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
@@ -52,8 +54,16 @@ async def async_remove_config_entry_device(
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the devices and their last events of a removed config entry."""
+    await DeviceStore(hass, entry.entry_id).async_remove()
+    await EventSnapshot(hass, entry.entry_id).async_remove()
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate old entry."""
-    if entry.version == 1 and entry.minor_version <= 3:
-        return await async_migrate_version_1_2(hass, entry)
+    if entry.version == 1 and entry.minor_version < 2 and not await async_migrate_version_1_2(hass, entry):
+        return False
+    if entry.version == 1 and entry.minor_version < 3:
+        return await async_migrate_version_1_3(hass, entry)
     return True
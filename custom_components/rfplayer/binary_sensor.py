@@ -2,10 +2,10 @@
 
 import logging
 
-from custom_components.rfplayer.const import COMMAND_GROUP_LIST, COMMAND_OFF_LIST, COMMAND_ON_LIST
+from custom_components.rfplayer.device_context import DeviceContext
 from custom_components.rfplayer.device_profiles import AnyRfpPlatformConfig, RfpPlatformConfig, RfpSensorConfig
 from custom_components.rfplayer.entity import RfDeviceEntity, async_setup_platform_entry
-from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -31,14 +31,9 @@ def _get_entity_description(
     )
 
 
-def _builder(
-    device: RfDeviceId,
-    platform_configs: list[AnyRfpPlatformConfig],
-    event_data: RfPlayerEventData | None,
-    verbose: bool,
-) -> list[Entity]:
+def _builder(device: DeviceContext, platform_configs: list[AnyRfpPlatformConfig], verbose: bool) -> list[Entity]:
     return [
-        RfPlayerBinarySensor(device, _get_entity_description(config), config, event_data=event_data, verbose=verbose)
+        RfPlayerBinarySensor(device, _get_entity_description(config), config, verbose=verbose)
         for config in platform_configs
     ]
 
@@ -59,43 +54,37 @@ async def async_setup_entry(
     )
 
 
-class RfPlayerBinarySensor(RfDeviceEntity, BinarySensorEntity):
+class RfPlayerBinarySensor(RfDeviceEntity[RfpSensorConfig], BinarySensorEntity):
     """A representation of a RfPlayer binary sensor."""
 
     _attr_force_update = True
     _attr_name = None
+    _group_events = True
 
     def __init__(
         self,
-        device: RfDeviceId,
+        device: DeviceContext,
         entity_description: BinarySensorEntityDescription,
         platform_config: RfpPlatformConfig,
-        event_data: RfPlayerEventData | None,
         verbose: bool,
     ) -> None:
         """Initialize the RfPlayer sensor."""
-        super().__init__(device_id=device, profile_name=platform_config.name, event_data=event_data, verbose=verbose)
+        super().__init__(device, platform_config.name, verbose)
         self.entity_description = entity_description
         assert isinstance(platform_config, RfpSensorConfig)
         self._config = platform_config
-        self._event_data = event_data
 
     def _apply_event(self, event_data: RfPlayerEventData) -> bool:
         """Apply command from RfPlayer."""
         super()._apply_event(event_data)
 
-        state = self._config.state.get_value(event_data)
-        command = state.lower() if state else None
-        if command in COMMAND_ON_LIST:
-            self._attr_is_on = True
-        elif command in COMMAND_OFF_LIST:
-            self._attr_is_on = False
-        else:
-            _LOGGER.info("Unsupported binary sensor command %s", command)
+        state = self._config.state.get_state(event_data)
+        if state is None:
+            _LOGGER.info("Unsupported binary sensor command %s", self._config.state.get_value(event_data))
             return False
 
+        self._attr_is_on = state
         return True
 
     def _group_event(self, event: RfDeviceEvent) -> bool:
-        value = self._config.state.get_value(event.data)
-        return value.lower() in COMMAND_GROUP_LIST if value else False
+        return self._config.state.is_group_command(event.data)
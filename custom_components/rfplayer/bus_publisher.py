@@ -9,6 +9,9 @@ from homeassistant.core import HomeAssistant
 class DeviceHandler(ABC):
     """Class responsible for converting protocol events to HA publishable events."""
 
+    protocol: str | None = None
+    """Protocol of the events matched by the handler, None for any protocol."""
+
     @abstractmethod
     def match(self, event: RfDeviceEvent) -> bool:
         """Determine if the handler can process the given event."""
@@ -36,6 +39,10 @@ class BusPublisher:
         """Register a handler for a specific event type."""
         self._handlers.append(handler)
 
+    def publishes(self, protocol: str) -> bool:
+        """Tell if events of a protocol may be fired to the HA bus."""
+        return any(handler.protocol in (None, protocol) for handler in self._handlers)
+
     async def async_fire(self, hass: HomeAssistant, event: RfDeviceEvent):
         """Dispatch an event to the appropriate handlers."""
         for handler in self._handlers:
@@ -2,15 +2,15 @@
 
 import logging
 
-from custom_components.rfplayer.const import COMMAND_OFF_LIST, COMMAND_ON_LIST
+from custom_components.rfplayer.device_context import DeviceContext
 from custom_components.rfplayer.device_profiles import (
     AnyRfpPlatformConfig,
     ClimateEventTypes,
     RfpClimateConfig,
     RfpPlatformConfig,
+    command_state,
 )
 from custom_components.rfplayer.entity import RfDeviceEntity, async_setup_platform_entry
-from custom_components.rfplayer.rfplayerlib.device import RfDeviceId
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
 from homeassistant.components.climate import (
     ATTR_PRESET_MODE,
@@ -22,7 +22,7 @@ from homeassistant.components.climate import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import STATE_ON, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -36,13 +36,9 @@ def _get_entity_description(
     return ClimateEntityDescription(key=config.name)
 
 
-def _builder(
-    device: RfDeviceId, platform_config: list[AnyRfpPlatformConfig], event_data: RfPlayerEventData | None, verbose: bool
-) -> list[Entity]:
+def _builder(device: DeviceContext, platform_config: list[AnyRfpPlatformConfig], verbose: bool) -> list[Entity]:
     return [
-        RfPlayerClimate(
-            device, _get_entity_description(config, event_data), config, event_data=event_data, verbose=verbose
-        )
+        RfPlayerClimate(device, _get_entity_description(config, device.event_data), config, verbose=verbose)
         for config in platform_config
     ]
 
@@ -63,7 +59,7 @@ async def async_setup_entry(
     )
 
 
-class RfPlayerClimate(RfDeviceEntity, ClimateEntity):
+class RfPlayerClimate(RfDeviceEntity[RfpClimateConfig], ClimateEntity):
     """A representation of a RfPlayer climate device."""
 
     _attr_supported_features = (
@@ -78,31 +74,24 @@ class RfPlayerClimate(RfDeviceEntity, ClimateEntity):
 
     def __init__(
         self,
-        device: RfDeviceId,
+        device: DeviceContext,
         entity_description: ClimateEntityDescription,
         platform_config: RfpPlatformConfig,
-        event_data: RfPlayerEventData | None,
         verbose: bool,
     ) -> None:
         """Initialize the RfPlayer light."""
-        super().__init__(device_id=device, profile_name=platform_config.name, event_data=event_data, verbose=verbose)
+        super().__init__(device, platform_config.name, verbose)
         self.entity_description = entity_description
         assert isinstance(platform_config, RfpClimateConfig)
         self._config = platform_config
-        self._event_data = event_data
         self._attr_preset_modes = list(self._config.preset_modes.values())
         self._attr_preset_mode = None
 
-    async def async_added_to_hass(self) -> None:
+    def _restore_state(self, old_state: State) -> None:
         """Restore climate device state."""
-        await super().async_added_to_hass()
-
-        if self._event_data is None:
-            old_state = await self.async_get_last_state()
-            if old_state is not None:
-                self._attr_is_on = old_state.state == STATE_ON
-                if preset_mode := old_state.attributes.get(ATTR_PRESET_MODE):
-                    self._attr_preset_mode = preset_mode
+        self._attr_is_on = old_state.state == STATE_ON
+        if preset_mode := old_state.attributes.get(ATTR_PRESET_MODE):
+            self._attr_preset_mode = preset_mode
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
@@ -141,18 +130,16 @@ class RfPlayerClimate(RfDeviceEntity, ClimateEntity):
 
         event_type = self._config.event_types[event_code]
         if event_type in (ClimateEventTypes.STATE, ClimateEventTypes.ALL):
-            state = self._config.state.get_value(event_data)
-            if not state:
+            value = self._config.state.get_native_value(event_data)
+            if value is None or value == "":
                 _LOGGER.warning("Missing state value")
                 return False
 
-            command = state.lower()
-            if command in COMMAND_ON_LIST:
-                self._attr_is_on = True
-            elif command in COMMAND_OFF_LIST:
-                self._attr_is_on = False
+            state = command_state(value)
+            if state is None:
+                _LOGGER.info("Unsupported climate state %s", value)
             else:
-                _LOGGER.info("Unsupported climate state %s", command)
+                self._attr_is_on = state
 
         if event_type in (ClimateEventTypes.PRESET_MODE, ClimateEventTypes.ALL):
             preset_code = self._config.preset_mode.get_value(event_data)
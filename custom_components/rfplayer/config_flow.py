@@ -1,6 +1,5 @@
 """Config flow for RfPlayer integration."""
 
-import copy
 import ipaddress
 import os
 from typing import Any, cast
@@ -9,33 +8,39 @@ from serialx.tools import list_ports
 import voluptuous as vol
 
 from custom_components.rfplayer.const import (
+    CONF_ALLOW_DEVICES,
     CONF_AUTOMATIC_ADD,
+    CONF_BINARY_FORMAT,
+    CONF_DENY_DEVICES,
     CONF_DEVICE_SERIAL,
     CONF_DEVICE_SIMULATOR,
     CONF_INIT_COMMANDS,
+    CONF_MIN_RF_LEVEL,
+    CONF_OVERFLOW_POLICY,
     CONF_RECEIVER_PROTOCOLS,
     CONF_RECONNECT_INTERVAL,
+    CONF_RECORD_EVENT_DATA,
     CONF_REDIRECT_ADDRESS,
+    CONF_REPEAT_WINDOW,
     CONF_VERBOSE_MODE,
+    DEFAULT_OVERFLOW_POLICY,
     DEFAULT_RECEIVER_PROTOCOLS,
     DEFAULT_RECONNECT_INTERVAL,
+    DEFAULT_REPEAT_WINDOW,
     DOMAIN,
     INIT_COMMANDS_EMPTY,
+    RFPLAYER_GATEWAY,
 )
 from custom_components.rfplayer.device_profiles import async_get_profile_registry
-from custom_components.rfplayer.helpers import build_device_id_from_device_info, get_device_id_string_from_identifiers
+from custom_components.rfplayer.device_store import DeviceStore
+from custom_components.rfplayer.gateway import Gateway
+from custom_components.rfplayer.helpers import get_device_id_string_from_identifiers
 from custom_components.rfplayer.rfplayerlib import DEVICE_PROTOCOLS, RECEIVER_MODES, SIMULATOR_PORT
 from custom_components.rfplayer.rfplayerlib.device import RfDeviceId
+from custom_components.rfplayer.rfplayerlib.event_queue import OverflowPolicy
+from custom_components.rfplayer.rfplayerlib.receive_filter import DeviceRules
 from homeassistant.config_entries import HANDLERS, ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
-from homeassistant.const import (
-    CONF_ADDRESS,
-    CONF_DEVICE,
-    CONF_DEVICES,
-    CONF_IP_ADDRESS,
-    CONF_PORT,
-    CONF_PROFILE_NAME,
-    CONF_PROTOCOL,
-)
+from homeassistant.const import CONF_ADDRESS, CONF_DEVICE, CONF_IP_ADDRESS, CONF_PORT, CONF_PROFILE_NAME, CONF_PROTOCOL
 from homeassistant.core import callback
 from homeassistant.helpers import device_registry as dr
 import homeassistant.helpers.config_validation as cv
@@ -50,7 +55,7 @@ class RfplayerConfigFlow(ConfigFlow):
     """Handle a rfplayer config flow."""
 
     VERSION = 1
-    MINOR_VERSION = 2
+    MINOR_VERSION = 3
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         """Config flow started from UI."""
@@ -89,8 +94,13 @@ class RfplayerConfigFlow(ConfigFlow):
                     CONF_RECEIVER_PROTOCOLS: DEFAULT_RECEIVER_PROTOCOLS,
                     CONF_INIT_COMMANDS: INIT_COMMANDS_EMPTY,
                     CONF_VERBOSE_MODE: False,
-                    CONF_DEVICES: {},
-                    CONF_REDIRECT_ADDRESS: {},
+                    CONF_RECORD_EVENT_DATA: False,
+                    CONF_BINARY_FORMAT: False,
+                    CONF_REPEAT_WINDOW: DEFAULT_REPEAT_WINDOW,
+                    CONF_OVERFLOW_POLICY: DEFAULT_OVERFLOW_POLICY,
+                    CONF_ALLOW_DEVICES: "",
+                    CONF_DENY_DEVICES: "",
+                    CONF_MIN_RF_LEVEL: None,
                 }
                 return self.async_create_entry(title=device_port, data=entry_data)
 
@@ -149,13 +159,25 @@ class RfPlayerOptionsFlowHandler(OptionsFlow):
                 CONF_RECEIVER_PROTOCOLS: user_input[CONF_RECEIVER_PROTOCOLS],
                 CONF_INIT_COMMANDS: user_input.get(CONF_INIT_COMMANDS, INIT_COMMANDS_EMPTY),
                 CONF_VERBOSE_MODE: user_input[CONF_VERBOSE_MODE],
+                CONF_RECORD_EVENT_DATA: user_input[CONF_RECORD_EVENT_DATA],
+                CONF_BINARY_FORMAT: user_input[CONF_BINARY_FORMAT],
+                CONF_REPEAT_WINDOW: user_input[CONF_REPEAT_WINDOW],
+                CONF_OVERFLOW_POLICY: user_input[CONF_OVERFLOW_POLICY],
+                CONF_ALLOW_DEVICES: user_input.get(CONF_ALLOW_DEVICES, ""),
+                CONF_DENY_DEVICES: user_input.get(CONF_DENY_DEVICES, ""),
+                CONF_MIN_RF_LEVEL: user_input.get(CONF_MIN_RF_LEVEL),
             }
 
             if not user_input[CONF_RECEIVER_PROTOCOLS]:
                 errors.update({CONF_RECEIVER_PROTOCOLS: "no_receiver_protocol"})
+            for key in (CONF_ALLOW_DEVICES, CONF_DENY_DEVICES):
+                try:
+                    DeviceRules.parse(global_options[key])
+                except ValueError:
+                    errors.update({key: "invalid_device_rules"})
 
             if not errors:
-                self.update_config_data(global_options=global_options)
+                self.update_config_data(global_options)
 
                 return self.async_create_entry(title="", data={})
 
@@ -178,6 +200,19 @@ class RfPlayerOptionsFlowHandler(OptionsFlow):
             # if the form field is empty, default value is set instead of an empty value.
             vol.Optional(CONF_INIT_COMMANDS, description={"suggested_value": data[CONF_INIT_COMMANDS]}): str,
             vol.Required(CONF_VERBOSE_MODE, default=data[CONF_VERBOSE_MODE]): bool,
+            vol.Required(CONF_RECORD_EVENT_DATA, default=data.get(CONF_RECORD_EVENT_DATA, False)): bool,
+            vol.Required(CONF_BINARY_FORMAT, default=data.get(CONF_BINARY_FORMAT, False)): bool,
+            vol.Required(
+                CONF_REPEAT_WINDOW,
+                default=data.get(CONF_REPEAT_WINDOW, DEFAULT_REPEAT_WINDOW),
+            ): vol.All(int, vol.Range(min=0)),
+            vol.Required(
+                CONF_OVERFLOW_POLICY,
+                default=data.get(CONF_OVERFLOW_POLICY, DEFAULT_OVERFLOW_POLICY),
+            ): vol.In([policy.value for policy in OverflowPolicy]),
+            vol.Optional(CONF_ALLOW_DEVICES, description={"suggested_value": data.get(CONF_ALLOW_DEVICES)}): str,
+            vol.Optional(CONF_DENY_DEVICES, description={"suggested_value": data.get(CONF_DENY_DEVICES)}): str,
+            vol.Optional(CONF_MIN_RF_LEVEL, description={"suggested_value": data.get(CONF_MIN_RF_LEVEL)}): int,
         }
 
         return self.async_show_form(step_id="configure_gateway", data_schema=vol.Schema(options), errors=errors)
@@ -198,10 +233,9 @@ class RfPlayerOptionsFlowHandler(OptionsFlow):
                 id_string = get_device_id_string_from_identifiers(entry.identifiers)
                 assert id_string
 
-                devices: dict[str, dict[str, Any]] = {id_string: user_input}
-                devices[id_string].setdefault(CONF_REDIRECT_ADDRESS, None)
-
-                self.update_config_data(devices=devices)
+                await self.async_update_devices(
+                    {id_string: {CONF_REDIRECT_ADDRESS: user_input.get(CONF_REDIRECT_ADDRESS)}}
+                )
 
                 return self.async_create_entry(title="", data={})
 
@@ -231,7 +265,7 @@ class RfPlayerOptionsFlowHandler(OptionsFlow):
 
                 device_info = user_input.copy()
                 device_info[CONF_REDIRECT_ADDRESS] = None
-                self.update_config_data(devices={id_string: device_info})
+                await self.async_update_devices({id_string: device_info})
 
                 return self.async_create_entry(title="", data={})
 
@@ -249,31 +283,24 @@ class RfPlayerOptionsFlowHandler(OptionsFlow):
         return self.async_show_form(step_id="add_rf_device", data_schema=vol.Schema(option_schema), errors=errors)
 
     @callback
-    def update_config_data(
-        self,
-        *,
-        global_options: dict[str, Any] | None = None,
-        devices: dict[str, Any] | None = None,
-    ) -> None:
+    def update_config_data(self, global_options: dict[str, Any]) -> None:
         """Update data in ConfigEntry."""
-        entry_data = self.config_entry.data.copy()
-        entry_data[CONF_DEVICES] = cast(dict[str, dict], copy.deepcopy(self.config_entry.data[CONF_DEVICES]))
-        if global_options:
-            entry_data.update(global_options)
-        if devices:
-            for id_string, device_options in devices.items():
-                entry_data[CONF_DEVICES].setdefault(id_string, {}).update(device_options)
-
-            entry_data[CONF_REDIRECT_ADDRESS].clear()
-            for id_string, device_info in entry_data[CONF_DEVICES].items():
-                if device_info.get(CONF_REDIRECT_ADDRESS):
-                    redirect_device_info = device_info.copy()
-                    redirect_device_info[CONF_ADDRESS] = device_info[CONF_REDIRECT_ADDRESS]
-                    redirect_id_string = build_device_id_from_device_info(redirect_device_info).id_string
-                    entry_data[CONF_REDIRECT_ADDRESS][redirect_id_string] = id_string
+        entry_data = {**self.config_entry.data, **global_options}
         self.hass.config_entries.async_update_entry(self.config_entry, data=entry_data)
         self.hass.async_create_task(self.hass.config_entries.async_reload(self.config_entry.entry_id))
 
+    async def async_update_devices(self, devices: dict[str, dict[str, Any]]) -> None:
+        """Update RF devices in the device store, without reloading the config entry."""
+        gateway = cast(Gateway | None, self.hass.data.get(DOMAIN, {}).get(RFPLAYER_GATEWAY))
+        if gateway is not None and gateway.entry is self.config_entry:
+            gateway.async_update_devices(devices)
+            return
+
+        store = DeviceStore(self.hass, self.config_entry.entry_id)
+        await store.async_load()
+        store.async_update_devices(devices)
+        await store.async_flush()
+
     def _list_rf_devices(self) -> dict[str, str]:
         device_entries = dr.async_entries_for_config_entry(self.device_registry, self.config_entry.entry_id)
 
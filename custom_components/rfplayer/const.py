@@ -1,11 +1,23 @@
 """Constants for RfPlayer integration."""
 
+from datetime import timedelta
+
 from custom_components.rfplayer.rfplayerlib import RECEIVER_MODES
+from custom_components.rfplayer.rfplayerlib.event_queue import OverflowPolicy
 
 CONF_RECONNECT_INTERVAL = "reconnect_interval"
 CONF_VERBOSE_MODE = "verbose_mode"
+CONF_BINARY_FORMAT = "binary_format"
+CONF_REPEAT_WINDOW = "repeat_window"
+CONF_OVERFLOW_POLICY = "overflow_policy"
+CONF_ALLOW_DEVICES = "allow_devices"
+CONF_DENY_DEVICES = "deny_devices"
+CONF_MIN_RF_LEVEL = "min_rf_level"
+CONF_RECORD_EVENT_DATA = "record_event_data"
 
 DEFAULT_RECONNECT_INTERVAL = 10
+DEFAULT_REPEAT_WINDOW = 0
+DEFAULT_OVERFLOW_POLICY = OverflowPolicy.DROP_OLDEST.value
 DEFAULT_RECEIVER_PROTOCOLS = RECEIVER_MODES
 
 CONF_DEVICE_SIMULATOR = "device_simulator"
@@ -17,6 +29,7 @@ CONF_INIT_COMMANDS = "init_commands"
 CONF_ADD_DEVICE = "add_device"
 CONF_REDIRECT_ADDRESS = "redirect_address"
 ATTR_EVENT_DATA = "event_data"
+ATTR_RECORDED_EVENT_DATA = "recorded_event_data"
 ATTR_COMMAND = "command"
 ATTR_INFO_TYPE = "info_type"
 ATTR_INFOS = "infos"
@@ -35,7 +48,24 @@ RFPLAYER_GATEWAY = "rfplayer_gateway"
 DOMAIN = "rfplayer"
 SIGNAL_RFPLAYER_EVENT = f"{DOMAIN}_event"
 SIGNAL_RFPLAYER_AVAILABILITY = f"{DOMAIN}_availability"
+SIGNAL_RFPLAYER_PROFILES_CHANGED = f"{DOMAIN}_profiles_changed"
+
+PROFILE_OVERLAYS_DIR = "rfplayer_profiles"
+"""Directory of the user device profile overlay files, in the HA configuration directory."""
+PROFILE_OVERLAYS_SCAN_INTERVAL = timedelta(seconds=30)
+
+DISCOVERY_BATCH_DELAY = timedelta(milliseconds=500)
+"""Delay to add the entities of the devices discovered together in one batch."""
+DISCOVERY_MISS_EXPIRY = timedelta(minutes=10)
+"""Delay before matching again the events of a device without matching profile."""
+DEVICES_SAVE_DELAY = timedelta(seconds=10)
+"""Delay to save the devices discovered together in one write of the device store."""
+EVENT_SNAPSHOT_SAVE_DELAY = timedelta(minutes=15)
+"""Delay to save the last events of the devices, they are also saved when Home Assistant stops."""
 
 COMMAND_ON_LIST = ["true", "1", "on", "all_on"]
 COMMAND_OFF_LIST = ["false", "0", "off", "all_on"]
 COMMAND_GROUP_LIST = ["all_on", "all_off"]
+COMMAND_STATES = dict.fromkeys(COMMAND_OFF_LIST, False) | dict.fromkeys(COMMAND_ON_LIST, True)
+"""On/off state of lower case commands, on commands take precedence."""
+COMMAND_GROUPS = frozenset(COMMAND_GROUP_LIST)
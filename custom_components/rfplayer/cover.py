@@ -3,14 +3,14 @@
 import logging
 from typing import Any
 
+from custom_components.rfplayer.device_context import DeviceContext
 from custom_components.rfplayer.device_profiles import AnyRfpPlatformConfig, RfpCoverConfig, RfpPlatformConfig
 from custom_components.rfplayer.entity import RfDeviceEntity, async_setup_platform_entry
-from custom_components.rfplayer.rfplayerlib.device import RfDeviceId
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
 from homeassistant.components.cover import CoverEntity, CoverEntityDescription, CoverEntityFeature, CoverState
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -24,13 +24,9 @@ def _get_entity_description(
     return CoverEntityDescription(key=config.name)
 
 
-def _builder(
-    device: RfDeviceId, platform_config: list[AnyRfpPlatformConfig], event_data: RfPlayerEventData | None, verbose
-) -> list[Entity]:
+def _builder(device: DeviceContext, platform_config: list[AnyRfpPlatformConfig], verbose: bool) -> list[Entity]:
     return [
-        RfPlayerCover(
-            device, _get_entity_description(config, event_data), config, event_data=event_data, verbose=verbose
-        )
+        RfPlayerCover(device, _get_entity_description(config, device.event_data), config, verbose=verbose)
         for config in platform_config
     ]
 
@@ -51,7 +47,7 @@ async def async_setup_entry(
     )
 
 
-class RfPlayerCover(RfDeviceEntity, CoverEntity):
+class RfPlayerCover(RfDeviceEntity[RfpCoverConfig], CoverEntity):
     """A representation of a RF cover device."""
 
     _attr_supported_features = CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE
@@ -60,32 +56,25 @@ class RfPlayerCover(RfDeviceEntity, CoverEntity):
 
     def __init__(
         self,
-        device: RfDeviceId,
+        device: DeviceContext,
         entity_description: CoverEntityDescription,
         platform_config: RfpPlatformConfig,
-        event_data: RfPlayerEventData | None,
         verbose: bool,
     ) -> None:
         """Initialize the RfPlayer cover."""
-        super().__init__(device_id=device, profile_name=platform_config.name, event_data=event_data, verbose=verbose)
+        super().__init__(device, platform_config.name, verbose)
         self.entity_description = entity_description
         assert isinstance(platform_config, RfpCoverConfig)
         self._config = platform_config
-        self._event_data = event_data
         if self._config.cmd_stop:
             if self._attr_supported_features is None:
                 self._attr_supported_features = CoverEntityFeature.STOP
             else:
                 self._attr_supported_features |= CoverEntityFeature.STOP
 
-    async def async_added_to_hass(self) -> None:
+    def _restore_state(self, old_state: State) -> None:
         """Restore device state."""
-        await super().async_added_to_hass()
-
-        if self._event_data is None:
-            old_state = await self.async_get_last_state()
-            if old_state is not None:
-                self._attr_is_closed = old_state.state != CoverState.OPEN
+        self._attr_is_closed = old_state.state != CoverState.OPEN
 
     async def async_open_cover(self, **kwargs: Any) -> None:
         """Open cover."""
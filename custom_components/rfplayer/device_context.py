@@ -0,0 +1,76 @@
+"""RF device context shared by the entities of all the platforms."""
+
+from dataclasses import dataclass, field
+
+from custom_components.rfplayer.device_profiles import (
+    UNDEFINED_PROFILE,
+    AnyRfpPlatformConfig,
+    ProfileRegistry,
+    RfpDeviceProfile,
+)
+from custom_components.rfplayer.helpers import (
+    build_device_id_from_device_info,
+    build_event_data_from_device_info,
+    get_identifiers_from_device_id,
+)
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceId
+from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
+from homeassistant.const import CONF_PROFILE_NAME, Platform
+from homeassistant.helpers.device_registry import DeviceInfo
+
+
+@dataclass(slots=True)
+class DeviceContext:
+    """RF device prepared once for the entities of all the platforms.
+
+    The device id, event and profile are resolved once per device, and the entities of
+    the device share its device registry info.
+    """
+
+    device_id: RfDeviceId
+    device_info: dict[str, str]
+    """Device info map persisted in the device store."""
+    event_data: RfPlayerEventData | None
+    """Last event of the device, applied by its entities when they are added."""
+    profile: RfpDeviceProfile | None
+    """Device profile, None if it is undefined or not supported."""
+    registry_info: DeviceInfo = field(init=False)
+    """Device registry info shared by the entities of the device."""
+
+    def __post_init__(self) -> None:
+        """Build the device registry info."""
+        device_id = self.device_id
+        self.registry_info = DeviceInfo(
+            identifiers=get_identifiers_from_device_id(device_id),
+            manufacturer=device_id.protocol,
+            model=device_id.model,
+            name=f"{device_id.protocol} {device_id.model} {device_id.address}"
+            if device_id.model
+            else f"{device_id.protocol} {device_id.address}",
+        )
+
+    @property
+    def id_string(self) -> str:
+        """Unique device id."""
+        return self.device_id.id_string
+
+    @property
+    def profile_name(self) -> str:
+        """Name of the device profile."""
+        return self.device_info.get(CONF_PROFILE_NAME, UNDEFINED_PROFILE)
+
+    def get_platform_configs(self, platform: Platform) -> list[AnyRfpPlatformConfig]:
+        """Return the configurations of the entities of a platform."""
+        return (self.profile.platforms.get(platform) or []) if self.profile else []
+
+
+def build_device_context(
+    profile_registry: ProfileRegistry, device_info: dict[str, str], event_data: RfPlayerEventData | None = None
+) -> DeviceContext:
+    """Create the context of a device, with the event it was discovered with if no event is given."""
+    return DeviceContext(
+        build_device_id_from_device_info(device_info),
+        device_info,
+        event_data if event_data is not None else build_event_data_from_device_info(device_info),
+        profile_registry.get_profile(device_info.get(CONF_PROFILE_NAME, UNDEFINED_PROFILE)),
+    )
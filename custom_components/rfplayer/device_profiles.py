@@ -1,16 +1,28 @@
 """RfPlayer device profile registry."""
 
+from collections.abc import Iterator
+from dataclasses import dataclass
 from enum import StrEnum
 import functools
+import hashlib
+import json
 import logging
 import os
 from pathlib import Path
+import pickle
 import re
+import sys
+from typing import Any, Final, Self
 
-from jsonpath_ng.ext import parse
-from pydantic import BaseModel, TypeAdapter
+import pydantic
+from pydantic import BaseModel, PrivateAttr, TypeAdapter
 import yaml
 
+from custom_components.rfplayer import json_path
+from custom_components.rfplayer.const import COMMAND_GROUPS, COMMAND_STATES, PROFILE_OVERLAYS_DIR
+from custom_components.rfplayer.json_path import NOT_FOUND, ValueExtractor, compile_json_path, project
+from custom_components.rfplayer.rfplayerlib import DEVICE_PROTOCOLS
+from custom_components.rfplayer.rfplayerlib.device import FrameHeader
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.components.cover import CoverState
@@ -20,9 +32,108 @@ from homeassistant.core import HomeAssistant
 
 RfDeviceClass = SensorDeviceClass | BinarySensorDeviceClass
 
+# C accelerated loader when libyaml is available
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 _LOGGER = logging.getLogger(__name__)
 
 UNDEFINED_PROFILE = "undefined"
+UNDEFINED_VALUE = "undefined"
+"""Value of map conversions without entry for the raw value."""
+_LITERAL_PROTOCOLS_PATTERN = re.compile(r"\w+(\|\w+)*")
+PROFILES_CACHE_VERSION = 3
+"""Version of the compiled profile registry cache format."""
+_PENDING: Final = object()
+"""Marker of a plan value not computed yet for the current frame."""
+_MATCH_EXTRACTORS: Final = tuple(
+    compile_json_path(f"$.frame.{path}")
+    for path in (
+        "header.protocolMeaning",
+        "header.infoType",
+        "infos.subType",
+        "infos.id_PHY",
+        "infos.id_PHYMeaning",
+        "infos.subTypeMeaning",
+        "infos.id",
+        "infos.id_channel",
+        "infos.adr_channel",
+    )
+)
+"""Frame fields identifying a device and its profile, kept in the persisted event payloads."""
+
+
+NativeValue = str | int | float
+"""Value converted from a frame field: raw or mapped text, bit field or scaled number."""
+
+_INT_COMMAND_STATES = {int(command): state for command, state in COMMAND_STATES.items() if command.isdigit()}
+
+
+def command_state(value: NativeValue | None) -> bool | None:
+    """Return the on/off state of a command value, None if it is not an on/off command."""
+    if isinstance(value, str):
+        return COMMAND_STATES.get(value.lower())
+    if isinstance(value, int):
+        return _INT_COMMAND_STATES.get(value)
+    return None
+
+
+def _int_keys(mapping: dict[str, str]) -> dict[int, str]:
+    """Return the entries of a map whose key is the text of an integer, keyed by integer."""
+    table: dict[int, str] = {}
+    for key, value in mapping.items():
+        try:
+            if str(int(key)) == key:
+                table[int(key)] = value
+        except ValueError:
+            continue
+    return table
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class ValueConversion:
+    """Typed conversion of raw frame values compiled from a value configuration.
+
+    Bit fields are decoded as integers, maps are looked up in tables keyed by the type of the
+    converted value and factors scale to float, without string round trips.
+    """
+
+    bit_mask: int | None = None
+    bit_offset: int | None = None
+    text_map: dict[str, str] | None = None
+    int_map: dict[int, str] | None = None
+    factor: float | None = None
+
+    @property
+    def bit_field(self) -> bool:
+        """True if the raw value is an integer whose bits are extracted."""
+        return self.bit_mask is not None or self.bit_offset is not None
+
+    def convert(self, value: Any) -> NativeValue:
+        """Convert a raw value."""
+        if self.bit_field:
+            return self.convert_bit_field(int(value))
+        if self.text_map is not None:
+            value = self.text_map.get(value, UNDEFINED_VALUE)
+        if self.factor is not None:
+            return float(value) * self.factor
+        return value
+
+    def convert_bit_field(self, bits: int) -> NativeValue:
+        """Convert the integer value of a raw bit field."""
+        if self.bit_mask is not None:
+            bits &= self.bit_mask
+        if self.bit_offset is not None:
+            bits >>= self.bit_offset
+        if self.int_map is not None:
+            value = self.int_map.get(bits, UNDEFINED_VALUE)
+            return float(value) * self.factor if self.factor is not None else value
+        if self.factor is not None:
+            return bits * self.factor
+        return bits
+
+
+ConversionKey = tuple[int | None, int | None, tuple[tuple[str, str], ...] | None, float | None]
+"""Bit mask, bit offset, map items and factor of a value conversion."""
 
 
 class BaseValueConfig(BaseModel):
@@ -33,43 +144,215 @@ class BaseValueConfig(BaseModel):
     map: dict[str, str] | None = None
     factor: float | None = None
 
-    def _convert(self, value: str) -> str:
-        """Convert a raw value."""
+    def conversion_key(self) -> ConversionKey:
+        """Return a key identifying the conversion applied to raw values."""
+        map_items = tuple(self.map.items()) if self.map else None
+        return (self.bit_mask, self.bit_offset, map_items, self.factor)
 
-        result = value
-        if self.bit_mask:
-            result = str(int(result) & self.bit_mask)
-        if self.bit_offset:
-            result = str(int(result) >> self.bit_offset)
-        if self.map:
-            result = self.map.get(result, "undefined")
-        if self.factor:
-            result = str(float(result) * self.factor)
-        return result
+    def compile_conversion(self) -> ValueConversion | None:
+        """Compile the conversion of raw values, None if raw values are used as is."""
+        if not (self.bit_mask or self.bit_offset or self.map or self.factor):
+            return None
+        bit_field = bool(self.bit_mask or self.bit_offset)
+        return ValueConversion(
+            bit_mask=self.bit_mask or None,
+            bit_offset=self.bit_offset or None,
+            text_map=self.map if self.map and not bit_field else None,
+            int_map=_int_keys(self.map) if self.map and bit_field else None,
+            factor=self.factor or None,
+        )
+
+
+class EvaluationPlan:
+    """Values of all the entities of a device profile, computed in one pass per frame.
+
+    Each distinct JSON path of the profile is extracted once per frame, integer bit fields are
+    decoded once per path and each distinct conversion is applied once. Paths and conversions
+    are evaluated on first read so that a conversion error only affects the entities using it.
+    Entities of a device read their value from the slots of the frame they are handling: the
+    cost of a frame grows with the number of distinct fields rather than with the number of entities.
+    The persisted payload of a frame is also serialized once for all the entities of the device.
+    """
+
+    __slots__ = (
+        "_bit_fields",
+        "_event_data",
+        "_extractors",
+        "_outputs",
+        "_paths",
+        "_payload",
+        "_pending_paths",
+        "_pending_slots",
+        "_raw_values",
+        "_slots",
+        "_values",
+    )
+
+    def __init__(self) -> None:
+        """Create an empty plan."""
+        self._extractors: list[ValueExtractor] = []
+        self._paths: dict[str, int] = {}
+        self._outputs: list[tuple[int, ValueConversion | None]] = []
+        self._slots: dict[tuple[int, ConversionKey], int] = {}
+        self._reset()
+
+    def __getstate__(self) -> tuple:
+        """Return the compiled plan, without the values of the last frame."""
+        return (self._extractors, self._paths, self._outputs, self._slots)
+
+    def __setstate__(self, state: tuple) -> None:
+        """Restore a compiled plan."""
+        self._extractors, self._paths, self._outputs, self._slots = state
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pending_paths: list[Any] = [_PENDING] * len(self._extractors)
+        self._pending_slots: list[Any] = [_PENDING] * len(self._outputs)
+        self._event_data: RfPlayerEventData | None = None
+        self._raw_values: list[Any] = []
+        self._bit_fields: dict[int, int] = {}
+        self._values: list[Any] = []
+        self._payload: str | None = None
+
+    @property
+    def path_count(self) -> int:
+        """Number of distinct JSON paths extracted per frame."""
+        return len(self._extractors)
+
+    @property
+    def slot_count(self) -> int:
+        """Number of distinct converted values per frame."""
+        return len(self._outputs)
+
+    def add(self, path: str, config: BaseValueConfig) -> int:
+        """Add a value converted from a JSON path and return its slot."""
+        path_index = self._paths.get(path)
+        if path_index is None:
+            path_index = self._paths[path] = len(self._extractors)
+            self._extractors.append(compile_json_path(path))
+            self._pending_paths.append(_PENDING)
+        key = (path_index, config.conversion_key())
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = len(self._outputs)
+            self._outputs.append((path_index, config.compile_conversion()))
+            self._pending_slots.append(_PENDING)
+        return slot
+
+    def get_value(self, event_data: RfPlayerEventData, slot: int) -> Any:
+        """Return the native value of a slot for a frame, None if the path is not found.
+
+        Values without conversion are the raw JSON values of the frame.
+        """
+        if event_data is not self._event_data:
+            self._start_frame(event_data)
+        value = self._values[slot]
+        if value is _PENDING:
+            value = self._values[slot] = self._compute(event_data, slot)
+        return value
+
+    def get_payload(self, event_data: RfPlayerEventData) -> str:
+        """Return the compact JSON of a frame, with only the fields read by the profile or used to match it."""
+        if event_data is not self._event_data:
+            self._start_frame(event_data)
+        if self._payload is None:
+            payload = project(event_data, (*_MATCH_EXTRACTORS, *self._extractors))
+            self._payload = json.dumps(payload, separators=(",", ":"))
+        return self._payload
+
+    def _start_frame(self, event_data: RfPlayerEventData) -> None:
+        self._event_data = event_data
+        self._raw_values = self._pending_paths.copy()
+        self._values = self._pending_slots.copy()
+        if self._bit_fields:
+            self._bit_fields = {}
+        self._payload = None
+
+    def _compute(self, event_data: RfPlayerEventData, slot: int) -> Any:
+        path_index, conversion = self._outputs[slot]
+        raw_value = self._raw_values[path_index]
+        if raw_value is _PENDING:
+            raw_value = self._raw_values[path_index] = self._extractors[path_index].find(event_data)
+        if raw_value is NOT_FOUND:
+            return None
+        if conversion is None:
+            return raw_value
+        if not conversion.bit_field:
+            return conversion.convert(raw_value)
+        bits = self._bit_fields.get(path_index)
+        if bits is None:
+            bits = self._bit_fields[path_index] = int(raw_value)
+        return conversion.convert_bit_field(bits)
+
+
+@dataclass(frozen=True, slots=True)
+class ValueBinding:
+    """Slots of a value configuration in an evaluation plan."""
+
+    plan: EvaluationPlan
+    value_slot: int
+    unit_slot: int | None
+    converted: bool
+    """True if the raw values are converted, converted values are read as text."""
+
+    def get_text(self, event_data: RfPlayerEventData, slot: int) -> Any:
+        """Return the value of a slot, as text if it is converted."""
+        value = self.plan.get_value(event_data, slot)
+        if value is None or not self.converted or isinstance(value, str):
+            return value
+        return str(value)
 
 
 class JsonValueConfig(BaseValueConfig):
-    """Generic json value extraction configuration."""
+    """Generic json value extraction configuration.
+
+    Values are read from the evaluation plan of the device profile, bound when the profile
+    is loaded. A configuration used on its own is bound to its own plan on first use.
+    """
 
     value_path: str
     unit_path: str | None = None
-
-    def get_value(self, event_data: RfPlayerEventData) -> str | None:
-        """Extract value from json event."""
-        return self._find_value(event_data, self.value_path)
-
-    def get_unit(self, event_data: RfPlayerEventData) -> str | None:
-        """Extract value from json event."""
-        return self._find_value(event_data, self.unit_path) if self.unit_path else None
-
-    def _find_value(self, event_data: RfPlayerEventData, json_path: str) -> str | None:
+    _binding: ValueBinding | None = PrivateAttr(default=None)
+    """Evaluation plan, value slot and unit slot."""
+
+    def bind(self, plan: EvaluationPlan) -> ValueBinding:
+        """Read values from an evaluation plan."""
+        value_slot = plan.add(self.value_path, self)
+        unit_slot = plan.add(self.unit_path, self) if self.unit_path else None
+        self._binding = binding = ValueBinding(plan, value_slot, unit_slot, self.compile_conversion() is not None)
+        return binding
+
+    def _get_binding(self) -> ValueBinding:
+        return self._binding or self.bind(EvaluationPlan())
+
+    def get_native_value(self, event_data: RfPlayerEventData) -> NativeValue | None:
+        """Extract the typed value from json event."""
+        binding = self._get_binding()
+        return binding.plan.get_value(event_data, binding.value_slot)
+
+    def get_value(self, event_data: RfPlayerEventData) -> Any:
+        """Extract value from json event.
+
+        Converted values are returned as text, other values as the raw JSON value.
+        """
+        binding = self._get_binding()
+        return binding.get_text(event_data, binding.value_slot)
+
+    def get_state(self, event_data: RfPlayerEventData) -> bool | None:
+        """Extract the on/off state of a command from json event, None if it is not an on/off command."""
+        return command_state(self.get_native_value(event_data))
+
+    def is_group_command(self, event_data: RfPlayerEventData) -> bool:
+        """Tell if the value of json event is a group command."""
+        value = self.get_native_value(event_data)
+        return isinstance(value, str) and value.lower() in COMMAND_GROUPS
+
+    def get_unit(self, event_data: RfPlayerEventData) -> Any:
         """Extract value from json event."""
-
-        expr = parse(json_path)
-        all_match = expr.find(event_data)
-        if all_match:
-            return self._convert(all_match[0].value)
-        return None
+        binding = self._get_binding()
+        if binding.unit_slot is None:
+            return None
+        return binding.get_text(event_data, binding.unit_slot)
 
 
 class RfpPlatformConfig(BaseModel):
@@ -79,6 +362,15 @@ class RfpPlatformConfig(BaseModel):
     device_class: str | None = None
     category: EntityCategory | None = None
     unit: str | None = None
+    _plan: EvaluationPlan | None = PrivateAttr(default=None)
+    """Evaluation plan of the device profile, None until the profile is loaded."""
+
+    def get_event_payload(self, event_data: RfPlayerEventData) -> str:
+        """Return the JSON of an event persisted in the entity state, shared by the entities of the device."""
+        plan = self._plan
+        if plan is None:
+            return json.dumps(event_data)
+        return plan.get_payload(event_data)
 
 
 class RfpSensorConfig(RfpPlatformConfig):
@@ -213,6 +505,18 @@ class RfpPlatformConfigMap(BaseModel):
         """Return the config for the given platform."""
         return vars(self).get(platform, [])
 
+    def platform_configs(self) -> Iterator[AnyRfpPlatformConfig]:
+        """Iterate over the configurations of all platforms."""
+        for platform_configs in vars(self).values():
+            yield from platform_configs or []
+
+    def value_configs(self) -> Iterator[JsonValueConfig]:
+        """Iterate over the value extraction configurations of all platforms."""
+        for platform_config in self.platform_configs():
+            for value in vars(platform_config).values():
+                if isinstance(value, JsonValueConfig):
+                    yield value
+
 
 class RfPDeviceMatch(BaseModel):
     """Frame matching rule to detect device."""
@@ -221,6 +525,24 @@ class RfPDeviceMatch(BaseModel):
     info_type: str
     sub_type: str | None = None
     id_phy: str | None = None
+    _protocol_pattern: re.Pattern = PrivateAttr()
+    _id_phy_pattern: re.Pattern | None = PrivateAttr(default=None)
+
+    def model_post_init(self, context: Any) -> None:
+        """Compile regular expressions once when the profile is loaded."""
+        self._protocol_pattern = re.compile(self.protocol)
+        if self.id_phy:
+            self._id_phy_pattern = re.compile(self.id_phy)
+
+    def is_matching_protocol(self, protocol: str) -> bool:
+        """Check if the protocol matches the rule."""
+        return self._protocol_pattern.match(protocol) is not None
+
+    def is_matching_id_phy(self, id_phy: str | None) -> bool:
+        """Check if the physical id matches the rule."""
+        if self._id_phy_pattern is None:
+            return True
+        return id_phy is not None and self._id_phy_pattern.match(id_phy) is not None
 
 
 class RfpDeviceProfile(BaseModel):
@@ -229,41 +551,176 @@ class RfpDeviceProfile(BaseModel):
     name: str
     match: RfPDeviceMatch
     platforms: RfpPlatformConfigMap
+    _plan: EvaluationPlan = PrivateAttr(default_factory=EvaluationPlan)
+
+    def model_post_init(self, context: Any) -> None:
+        """Compile the evaluation plan shared by the entities of the profile."""
+        for value_config in self.platforms.value_configs():
+            value_config.bind(self._plan)
+        for platform_config in self.platforms.platform_configs():
+            platform_config._plan = self._plan  # noqa: SLF001
+
+    @property
+    def plan(self) -> EvaluationPlan:
+        """Evaluation plan of the values of all the entities of the profile."""
+        return self._plan
+
+
+MatchKey = tuple[str, str, str | None]
+"""Protocol, info type and sub type of an event."""
 
 
 class ProfileRegistry:
-    """Registry to store RF device profiles."""
+    """Registry to store RF device profiles.
+
+    Profiles are indexed by (protocol, info type, sub type) so that matching an event only
+    evaluates the candidates of the index entry, in the order of the profile file.
+
+    User overlay files add profiles or replace the profiles with the same name. Overlay profiles
+    are matched before the bundled ones, in the order of the overlay file names.
+    """
 
-    def __init__(self, filename: Path, verbose: bool):
-        """Create a new registry."""
+    @classmethod
+    def load(cls, filename: Path, verbose: bool, cache_dir: Path | None = None) -> Self:
+        """Load a registry from a compiled cache in cache_dir, or from the profile file.
+
+        The cache is keyed by a hash of the profile file and of the code compiling it, it holds the
+        validated profiles with their match index and evaluation plans. A registry compiled from the
+        profile file is saved to the cache, errors reading or writing the cache are only logged.
+        """
+
+        content = filename.read_bytes()
+        cache_file = cache_dir / f"{filename.stem}.{_cache_key(content)}.pickle" if cache_dir else None
+        if cache_file is not None and cache_file.exists():
+            try:
+                with open(cache_file, "rb") as f:
+                    registry = pickle.load(f)
+            except Exception:  # noqa: BLE001
+                _LOGGER.warning("Ignoring invalid profile registry cache %s", cache_file, exc_info=True)
+            else:
+                if isinstance(registry, cls):
+                    registry.verbose = verbose
+                    return registry
+
+        registry = cls(None, verbose)
+        registry.register_profiles(content.decode("utf-8"))
+        if cache_file is not None:
+            _save_cache(cache_file, registry)
+        return registry
+
+    def __init__(self, filename: Path | None, verbose: bool):
+        """Create a new registry with the profiles of a file, empty without file."""
         self._registry: list[RfpDeviceProfile] = []
+        self._bundled: list[RfpDeviceProfile] = []
+        self._overlays: dict[str, list[RfpDeviceProfile]] = {}
+        self._overlay_stats: dict[str, tuple[int, int]] = {}
+        self._profiles_by_name: dict[str, RfpDeviceProfile] = {}
+        self._match_index: dict[MatchKey, tuple[RfpDeviceProfile, ...]] = {}
+        self._sub_types: dict[str, set[str]] = {}
         self.verbose = verbose
-        with open(filename, encoding="utf-8") as f:
-            self.register_profiles(f.read())
+        if filename is not None:
+            with open(filename, encoding="utf-8") as f:
+                self.register_profiles(f.read())
 
-    def register_profiles(self, content: str) -> None:
-        """Add new yaml device profiles into the registry."""
+    def register_profiles(self, content: str, source: str | None = None) -> set[str]:
+        """Add new yaml device profiles into the registry and return the names of the changed profiles.
 
-        obj = yaml.safe_load(content)
-        adapter = TypeAdapter(list[RfpDeviceProfile])
-        items = adapter.validate_python(obj)
-        self._registry.extend(items)
+        Profiles of an overlay source replace the previous profiles of the source, the match index
+        is only rebuilt for the info types of the changed profiles.
+        """
 
-    def get_profile_name_from_event(self, event_data: RfPlayerEventData) -> str:
-        """Get a plaform config matching an event."""
-        matching_profiles = (entry for entry in self._registry if self._event_is_matching(event_data, entry))
+        obj = yaml.load(content, Loader=_YamlLoader)  # noqa: S506
+        adapter = TypeAdapter(list[RfpDeviceProfile])
+        items = adapter.validate_python(obj or [])
+        if source is None:
+            self._bundled.extend(items)
+        elif items:
+            self._overlays[source] = items
+        else:
+            self._overlays.pop(source, None)
+
+        previous = self._profiles_by_name
+        self._registry = [profile for source in sorted(self._overlays) for profile in self._overlays[source]]
+        overlay_names = {profile.name for profile in self._registry}
+        self._registry.extend(profile for profile in self._bundled if profile.name not in overlay_names)
+        self._profiles_by_name = {}
+        for profile in self._registry:
+            self._profiles_by_name.setdefault(profile.name, profile)
+
+        changed = {
+            name
+            for name in previous.keys() | self._profiles_by_name.keys()
+            if _profile_dump(previous.get(name)) != _profile_dump(self._profiles_by_name.get(name))
+        }
+        info_types = {
+            profile.match.info_type for name in changed for profile in self._profiles_with_name(name, previous)
+        }
+        self._build_index(info_types if previous else None)
+        return changed
+
+    def scan_overlays(self, overlay_dir: Path) -> dict[str, str | None]:
+        """Return the content of the overlay files changed since the last scan, None for removed files.
+
+        Only file sizes and modification times are read for unchanged files.
+        """
+
+        stats: dict[str, tuple[int, int]] = {}
+        changes: dict[str, str | None] = {}
+        for path in sorted(overlay_dir.glob("*.yaml")):
+            try:
+                stat = path.stat()
+                stats[path.name] = (stat.st_mtime_ns, stat.st_size)
+                if self._overlay_stats.get(path.name) != stats[path.name]:
+                    changes[path.name] = path.read_text(encoding="utf-8")
+            except OSError as err:
+                _LOGGER.warning("Unable to read device profile overlay %s: %s", path, err)
+        changes.update((name, None) for name in self._overlay_stats if name not in stats)
+        self._overlay_stats = stats
+        return changes
+
+    def apply_overlays(self, changes: dict[str, str | None]) -> set[str]:
+        """Register the scanned overlay changes and return the names of the changed profiles.
+
+        Invalid overlay files are logged and ignored, their previous profiles are kept.
+        """
+
+        changed: set[str] = set()
+        for source, content in changes.items():
+            try:
+                changed |= self.register_profiles(content or "", source)
+            except (yaml.YAMLError, pydantic.ValidationError) as err:
+                _LOGGER.warning("Ignoring invalid device profile overlay %s: %s", source, err)
+        if changed:
+            _LOGGER.info("Device profiles changed: %s", ", ".join(sorted(changed)))
+        return changed
+
+    def get_profile_name_from_event(self, event_data: RfPlayerEventData, header: FrameHeader | None = None) -> str:
+        """Get a plaform config matching an event, from its frame header if already read."""
+        if header is None:
+            header = FrameHeader.from_frame(event_data["frame"])
+        candidates = self._get_candidates(header.protocol, header.info_type, header.sub_type)
+
+        id_phy = header.id_phy
+        for profile in candidates:
+            if profile.match.is_matching_id_phy(id_phy):
+                return profile.name
+            self._verbose_debug(
+                "profile %s not matching: expected id phy %s, actual %s", profile.name, profile.match.id_phy, id_phy
+            )
 
-        profile = next(matching_profiles, None)
-
-        if not profile:
-            return UNDEFINED_PROFILE
-        return profile.name
+        self._verbose_debug(
+            "no profile matching protocol %s, info type %s, sub type %s",
+            header.protocol,
+            header.info_type,
+            header.sub_type,
+        )
+        return UNDEFINED_PROFILE
 
     def get_platform_config(self, profile_name: str, platform: Platform) -> list[AnyRfpPlatformConfig]:
         """Get a plaform config matching an event."""
         platform_config: list[AnyRfpPlatformConfig] = []
 
-        profile = self._get_profile(profile_name)
+        profile = self.get_profile(profile_name)
 
         if profile:
             platform_config = profile.platforms.get(platform)
@@ -276,77 +733,136 @@ class ProfileRegistry:
         """Get the list of available profile names."""
         return [item.name for item in self._registry]
 
+    def get_json_paths(self) -> set[str]:
+        """Get all the json paths referenced by the registered profiles."""
+        return {
+            path
+            for profile in self._registry
+            for value_config in profile.platforms.value_configs()
+            for path in (value_config.value_path, value_config.unit_path)
+            if path
+        }
+
     def is_valid_protocol(self, profile_name: str, protocol: str) -> bool:
         """Check if a protocol is valid for the given profile."""
-        profile = self._get_profile(profile_name)
+        profile = self.get_profile(profile_name)
 
         if profile is None:
             return False
 
-        return re.match(profile.match.protocol, protocol) is not None
+        return profile.match.is_matching_protocol(protocol)
 
-    def _get_profile(self, profile_name: str) -> RfpDeviceProfile | None:
+    def get_profile(self, profile_name: str) -> RfpDeviceProfile | None:
+        """Get a profile by name, None if it is undefined or not supported."""
         if profile_name == UNDEFINED_PROFILE:
             return None
 
-        matching_profiles = (entry for entry in self._registry if entry.name == profile_name)
-
-        profile = next(matching_profiles, None)
+        profile = self._profiles_by_name.get(profile_name)
 
         if not profile:
             _LOGGER.warning("Profile name %s not supported", profile_name)
             return None
         return profile
 
-    def _event_is_matching(self, event_data: RfPlayerEventData, profile: RfpDeviceProfile):
-        m = profile.match
-        if m.protocol:
-            protocol = event_data["frame"]["header"]["protocolMeaning"]
-            if not re.match(m.protocol, protocol):
-                self._verbose_debug(
-                    "profile %s not matching: expected protocol %s, actual %s",
-                    profile.name,
-                    m.protocol,
-                    protocol,
-                )
-                return False
-        info_type = event_data["frame"]["header"]["infoType"]
-        if info_type != m.info_type:
-            self._verbose_debug(
-                "profile %s not matching: expected info type %s, actual %s", profile.name, m.info_type, info_type
+    def _profiles_with_name(self, name: str, previous: dict[str, RfpDeviceProfile]) -> Iterator[RfpDeviceProfile]:
+        """Iterate over the previous and current profiles with a name."""
+        for profiles_by_name in (previous, self._profiles_by_name):
+            if (profile := profiles_by_name.get(name)) is not None:
+                yield profile
+
+    def _build_index(self, info_types: set[str] | None = None) -> None:
+        """Index profiles by match key for all known protocols, only for some info types if given."""
+        self._sub_types = {}
+        for profile in self._registry:
+            sub_types = self._sub_types.setdefault(profile.match.info_type, set())
+            if profile.match.sub_type:
+                sub_types.add(profile.match.sub_type)
+
+        # Protocols known by the library or explicitly listed by a profile are indexed upfront
+        known_protocols = set(DEVICE_PROTOCOLS)
+        for profile in self._registry:
+            if _LITERAL_PROTOCOLS_PATTERN.fullmatch(profile.match.protocol):
+                known_protocols.update(profile.match.protocol.split("|"))
+
+        if info_types is None:
+            self._match_index = {}
+        else:
+            self._match_index = {key: value for key, value in self._match_index.items() if key[1] not in info_types}
+        for protocol in sorted(known_protocols):
+            for info_type, sub_types in self._sub_types.items():
+                if info_types is not None and info_type not in info_types:
+                    continue
+                for sub_type in (None, *sub_types):
+                    self._get_candidates(protocol, info_type, sub_type)
+
+    def _get_candidates(self, protocol: str, info_type: str, sub_type: str | None) -> tuple[RfpDeviceProfile, ...]:
+        """Get the profiles matching an event key, in registration order."""
+        if sub_type not in self._sub_types.get(info_type, ()):
+            # Only profiles without sub type rule can match
+            sub_type = None
+        key = (protocol, info_type, sub_type)
+        candidates = self._match_index.get(key)
+        if candidates is None:
+            # Unknown protocol, index it on first use
+            candidates = tuple(
+                profile
+                for profile in self._registry
+                if profile.match.info_type == info_type
+                and profile.match.sub_type in (None, sub_type)
+                and profile.match.is_matching_protocol(protocol)
             )
-            return False
-        if m.sub_type:
-            sub_type = event_data["frame"]["infos"]["subType"]
-            if sub_type != m.sub_type:
-                self._verbose_debug(
-                    "profile %s not matching: expected sub type %s, actual %s",
-                    profile.name,
-                    m.sub_type,
-                    sub_type,
-                )
-                return False
-        if m.id_phy:
-            id_phy = event_data["frame"]["infos"]["id_PHY"]
-            if not re.match(m.id_phy, id_phy):
-                self._verbose_debug(
-                    "profile %s not matching: expected id phy %s, actual %s", profile.name, m.id_phy, id_phy
-                )
-                return False
-        return True
+            self._match_index[key] = candidates
+        return candidates
 
     def _verbose_debug(self, msg, *args, **kwargs):
         if self.verbose:
             _LOGGER.debug(msg, *args, **kwargs)
 
 
+def _profile_dump(profile: RfpDeviceProfile | None) -> dict[str, Any] | None:
+    return profile.model_dump() if profile is not None else None
+
+
+def _cache_key(content: bytes) -> str:
+    """Hash profile file content with the code and library versions compiling it."""
+    digest = hashlib.sha256(f"{PROFILES_CACHE_VERSION}|{sys.version}|{pydantic.VERSION}".encode())
+    for module_file in (__file__, json_path.__file__):
+        digest.update(Path(module_file).read_bytes())
+    digest.update(content)
+    return digest.hexdigest()[:32]
+
+
+def _save_cache(cache_file: Path, registry: ProfileRegistry) -> None:
+    """Atomically replace the cached registries of the profile file."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(registry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+        for stale_file in cache_file.parent.glob(f"{cache_file.name.split('.')[0]}.*.pickle"):
+            if stale_file != cache_file:
+                stale_file.unlink(missing_ok=True)
+    except OSError as err:
+        _LOGGER.debug("Unable to save profile registry cache %s: %s", cache_file, err)
+
+
 @functools.lru_cache(maxsize=1)
 def _get_profile_registry(verbose: bool) -> ProfileRegistry:
     """Get the profile registry singleton."""
     module_path = Path(os.path.abspath(__file__)).parent
-    return ProfileRegistry(module_path / "device-profiles.yaml", verbose)
+    return ProfileRegistry.load(module_path / "device-profiles.yaml", verbose, module_path / "__pycache__")
 
 
 async def async_get_profile_registry(hass: HomeAssistant, verbose: bool) -> ProfileRegistry:
-    """Asynchronously load the RF device profile registry."""
-    return await hass.async_add_executor_job(_get_profile_registry, verbose)
+    """Asynchronously load the RF device profile registry, with the user profile overlays."""
+    registry = await hass.async_add_executor_job(_get_profile_registry, verbose)
+    await async_update_profile_overlays(hass, registry)
+    return registry
+
+
+async def async_update_profile_overlays(hass: HomeAssistant, registry: ProfileRegistry) -> set[str]:
+    """Apply the changes of the user profile overlay files and return the names of the changed profiles."""
+    overlay_dir = Path(hass.config.path(PROFILE_OVERLAYS_DIR))
+    changes = await hass.async_add_executor_job(registry.scan_overlays, overlay_dir)
+    return registry.apply_overlays(changes) if changes else set()
@@ -9,9 +9,11 @@ from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent
 class EdisioHandler(DeviceHandler):
     """Handler for Edisio devices."""
 
+    protocol = "EDISIO"
+
     def match(self, event: RfDeviceEvent) -> bool:
         """Determine if the handler can process the given event."""
-        return event.device.protocol == "EDISIO" and event.data["frame"]["header"]["infoType"] == "15"
+        return event.header is not None and event.header.protocol == "EDISIO" and event.header.info_type == "15"
 
     def get_event_type(self) -> str:
         """Return the HA event type to fire."""
@@ -0,0 +1,102 @@
+"""Storage of the RF devices configured for a RfPlayer gateway."""
+
+from collections.abc import Mapping
+import logging
+from typing import Any
+
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import CONF_REDIRECT_ADDRESS, DEVICES_SAVE_DELAY, DOMAIN
+from .helpers import build_device_id_from_device_info
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+DeviceInfo = dict[str, Any]
+
+
+class DeviceStore:
+    """RF devices of a config entry, saved in their own storage file.
+
+    Changes are saved with a delay so that the devices changed together, e.g. during a
+    discovery burst, are written once. The config entry is never updated.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Create the store of the devices of a config entry, load it before use."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.devices")
+        self._devices: dict[str, DeviceInfo] = {}
+        self._redirects: dict[str, str] = {}
+        self._save_pending = False
+        self.coalesced_writes = 0
+        """Number of device changes saved with a previous change instead of their own write."""
+
+    async def async_load(self) -> None:
+        """Load the devices from the storage file."""
+        data = await self._store.async_load()
+        self._devices = dict(data["devices"]) if data else {}
+        self._update_redirects()
+
+    @property
+    def devices(self) -> Mapping[str, DeviceInfo]:
+        """Device info maps by device id string."""
+        return self._devices
+
+    @property
+    def redirects(self) -> Mapping[str, str]:
+        """Id strings of the devices by id string of their redirect address."""
+        return self._redirects
+
+    def __contains__(self, id_string: object) -> bool:
+        """Tell if a device is configured."""
+        return id_string in self._devices
+
+    @callback
+    def async_update_devices(self, devices: Mapping[str, DeviceInfo]) -> None:
+        """Add devices or update the options of existing devices."""
+        for id_string, device_options in devices.items():
+            self._devices[id_string] = {**self._devices.get(id_string, {}), **device_options}
+        if any(CONF_REDIRECT_ADDRESS in device_options for device_options in devices.values()):
+            self._update_redirects()
+        self._schedule_save()
+
+    @callback
+    def async_remove_device(self, id_string: str) -> None:
+        """Remove a device."""
+        if self._devices.pop(id_string, None) is not None:
+            self._update_redirects()
+            self._schedule_save()
+
+    async def async_flush(self) -> None:
+        """Save the pending changes now."""
+        if self._save_pending:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the storage file."""
+        await self._store.async_remove()
+
+    def _update_redirects(self) -> None:
+        self._redirects = {}
+        for id_string, device_info in self._devices.items():
+            if device_info.get(CONF_REDIRECT_ADDRESS):
+                redirect_device_info = {**device_info, CONF_ADDRESS: device_info[CONF_REDIRECT_ADDRESS]}
+                self._redirects[build_device_id_from_device_info(redirect_device_info).id_string] = id_string
+
+    def _schedule_save(self) -> None:
+        # A pending save writes the devices as they are when it runs: it is not postponed by
+        # later changes so that continuous discoveries are still saved at each delay
+        if self._save_pending:
+            self.coalesced_writes += 1
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, DEVICES_SAVE_DELAY.total_seconds())
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        _LOGGER.debug("Saving %d devices (%d writes coalesced)", len(self._devices), self.coalesced_writes)
+        return {"devices": self._devices}
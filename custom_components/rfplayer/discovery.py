@@ -0,0 +1,143 @@
+"""Discover new RF devices from their first events and add their entities to the platforms."""
+
+from collections.abc import Callable
+import logging
+from time import monotonic
+
+from custom_components.rfplayer.device_context import DeviceContext, build_device_context
+from custom_components.rfplayer.device_profiles import UNDEFINED_PROFILE, ProfileRegistry
+from custom_components.rfplayer.helpers import build_device_info_from_event
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent
+from homeassistant.const import CONF_EVENT_DATA, CONF_PROFILE_NAME, Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DISCOVERY_BATCH_DELAY, DISCOVERY_MISS_EXPIRY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+EntityBuilder = Callable[[DeviceContext], list[Entity]]
+
+
+class DiscoveryService:
+    """Classify unknown devices once and add their entities to all the platforms in batches.
+
+    The profile of a new device is matched once for all the platforms. Devices without
+    matching profile are remembered until the miss expires, so that their next frames
+    are not matched again. New devices are added in one batch per platform when no
+    other device was discovered during the batch delay.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        profile_registry: ProfileRegistry,
+        configured: Callable[[str], bool],
+        device_callback: Callable[[DeviceContext], None],
+    ) -> None:
+        """Create a discovery service.
+
+        configured tells if a device id string is already configured, device_callback is called once
+        for each discovered device.
+        """
+        self._profile_registry = profile_registry
+        self._configured = configured
+        self._device_callback = device_callback
+        self._discovered: set[str] = set()
+        # Expiry of the devices without profile, in expiry order
+        self._misses: dict[str, float] = {}
+        self._pending: dict[str, DeviceContext] = {}
+        self._platforms: dict[Platform, tuple[EntityBuilder, AddEntitiesCallback]] = {}
+        self._debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=DISCOVERY_BATCH_DELAY.total_seconds(),
+            immediate=False,
+            function=self._async_add_pending,
+        )
+
+    @callback
+    def async_register_platform(
+        self, platform: Platform, builder: EntityBuilder, async_add_entities: AddEntitiesCallback
+    ) -> CALLBACK_TYPE:
+        """Register the entity builder of a platform and return a function to unregister it."""
+        self._platforms[platform] = (builder, async_add_entities)
+
+        @callback
+        def _async_unregister() -> None:
+            self._platforms.pop(platform, None)
+
+        return _async_unregister
+
+    @callback
+    def async_discover(self, event: RfDeviceEvent) -> None:
+        """Discover the device of an event if it is new."""
+        id_string = event.device.id_string
+        if (pending := self._pending.get(id_string)) is not None:
+            pending.event_data = event.data
+            return
+        if id_string in self._discovered or self._configured(id_string):
+            return
+        now = monotonic()
+        if self._misses.get(id_string, now) > now:
+            return
+
+        device_info = build_device_info_from_event(self._profile_registry, event)
+        if device_info[CONF_PROFILE_NAME] == UNDEFINED_PROFILE:
+            _LOGGER.debug("No matching profile for device %s event %s", id_string, device_info[CONF_EVENT_DATA])
+            self._add_miss(id_string, now)
+            return
+
+        self._misses.pop(id_string, None)
+        device = build_device_context(self._profile_registry, device_info, event.data)
+        self._add_device(device)
+        self._device_callback(device)
+
+    @callback
+    def async_add_device(self, device: DeviceContext) -> None:
+        """Add the entities of a configured device, e.g. added manually."""
+        self._add_device(device)
+
+    @callback
+    def async_forget(self, id_string: str) -> None:
+        """Discover a removed device again."""
+        self._discovered.discard(id_string)
+
+    @callback
+    def async_clear_misses(self) -> None:
+        """Match again the devices without profile, e.g. when profiles changed."""
+        self._misses.clear()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the pending batch."""
+        self._debouncer.async_shutdown()
+        self._pending.clear()
+
+    def _add_device(self, device: DeviceContext) -> None:
+        self._discovered.add(device.id_string)
+        self._pending[device.id_string] = device
+        self._debouncer.async_schedule_call()
+
+    def _add_miss(self, id_string: str, now: float) -> None:
+        # Misses all have the same lifetime so that the oldest ones are first
+        while self._misses:
+            oldest = next(iter(self._misses))
+            if self._misses[oldest] > now:
+                break
+            del self._misses[oldest]
+        self._misses.pop(id_string, None)
+        self._misses[id_string] = now + DISCOVERY_MISS_EXPIRY.total_seconds()
+
+    @callback
+    def _async_add_pending(self) -> None:
+        devices = list(self._pending.values())
+        self._pending.clear()
+        for platform, (builder, async_add_entities) in self._platforms.items():
+            entities = [entity for device in devices for entity in builder(device)]
+            if entities:
+                _LOGGER.debug("Adding %d discovered %s entities", len(entities), platform)
+                async_add_entities(entities)
@@ -5,24 +5,16 @@ import json
 import logging
 from typing import cast
 
-from custom_components.rfplayer.device_profiles import (
-    UNDEFINED_PROFILE,
-    AnyRfpPlatformConfig,
-    async_get_profile_registry,
-)
-from custom_components.rfplayer.helpers import (
-    build_device_id_from_device_info,
-    build_device_info_from_event,
-    build_event_data_from_device_info,
-    get_identifiers_from_device_id,
-)
+from custom_components.rfplayer.device_context import DeviceContext
+from custom_components.rfplayer.device_profiles import AnyRfpPlatformConfig, RfpPlatformConfig
+from custom_components.rfplayer.event_snapshot import EventSnapshot
+from custom_components.rfplayer.gateway import Gateway
 from custom_components.rfplayer.rfplayerlib import RfPlayerClient
 from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_DEVICES, CONF_PROFILE_NAME, Platform
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, State, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -31,12 +23,14 @@ from homeassistant.util import slugify
 
 from .const import (
     ATTR_EVENT_DATA,
-    CONF_AUTOMATIC_ADD,
+    ATTR_RECORDED_EVENT_DATA,
+    CONF_RECORD_EVENT_DATA,
     CONF_VERBOSE_MODE,
     DOMAIN,
     RFPLAYER_CLIENT,
+    RFPLAYER_GATEWAY,
     SIGNAL_RFPLAYER_AVAILABILITY,
-    SIGNAL_RFPLAYER_EVENT,
+    SIGNAL_RFPLAYER_PROFILES_CHANGED,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -47,126 +41,108 @@ async def async_setup_platform_entry(
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
     platform: Platform,
-    builder: Callable[
-        [RfDeviceId, list[AnyRfpPlatformConfig], RfPlayerEventData | None, bool],
-        list[Entity],
-    ],
+    builder: Callable[[DeviceContext, list[AnyRfpPlatformConfig], bool], list[Entity]],
 ) -> None:
     """Set up config entry."""
-    entry_data = config_entry.data
+    gateway = cast(Gateway, hass.data[DOMAIN][RFPLAYER_GATEWAY])
+    verbose = config_entry.data.get(CONF_VERBOSE_MODE, False)
     # Set of device IDs already configured for the current platform
     string_ids: set[str] = set()
+    # Entities of the current platform by device profile name, to rebind them when the profile changes
+    entities_by_profile: dict[str, list[RfDeviceEntity]] = {}
 
-    profile_registry = await async_get_profile_registry(hass, entry_data.get(CONF_VERBOSE_MODE, False))
-
-    # Add entities from config
-    entities = []
-    for id_string, device_info in entry_data[CONF_DEVICES].items():
-        if id_string in string_ids:
-            _LOGGER.info(
-                "Device %s already configured for platform %s",
-                id_string,
-                platform,
-            )
-            continue
-
-        profile_name = device_info.get(CONF_PROFILE_NAME, UNDEFINED_PROFILE)
-        if profile_name == UNDEFINED_PROFILE:
-            _LOGGER.debug("Device %s has undefined profile, skipping", id_string)
-            continue
-
-        platform_config = profile_registry.get_platform_config(profile_name, platform)
-        if not platform_config:
-            continue
-
-        device_id = build_device_id_from_device_info(device_info)
-        event_data = build_event_data_from_device_info(device_info)
+    def _track_entities(profile_name: str, new_entities: list[Entity]) -> list[Entity]:
+        profile_entities = entities_by_profile.setdefault(profile_name, [])
+        for entity in new_entities:
+            if isinstance(entity, RfDeviceEntity):
+                profile_entities.append(entity)
+                entity.async_on_remove(lambda entity=entity: profile_entities.remove(entity))
+        return new_entities
 
-        string_ids.add(id_string)
-        entities.extend(builder(device_id, platform_config, event_data, entry_data.get(CONF_VERBOSE_MODE, False)))
-
-    async_add_entities(entities)
-
-    # If automatic add is on, hookup listener
-    if entry_data[CONF_AUTOMATIC_ADD]:
-
-        @callback
-        def _update(event: RfDeviceEvent) -> None:
-            if event.device.id_string in string_ids:
-                return
+    @callback
+    def _build(device: DeviceContext) -> list[Entity]:
+        if device.id_string in string_ids:
+            return []
+        platform_configs = device.get_platform_configs(platform)
+        if not platform_configs:
+            return []
+        string_ids.add(device.id_string)
+        return _track_entities(device.profile_name, builder(device, platform_configs, verbose))
+
+    # Add the entities of the configured devices, prepared once by the gateway for all the platforms
+    async_add_entities([entity for device in gateway.device_contexts.values() for entity in _build(device)])
 
-            # Add the device to the list of already processed devices
-            # so that we don't try to match a device profile again
-            # regardless of whether the platform is supported or not
-            string_ids.add(event.device.id_string)
+    @callback
+    def _rebind(profile_names: set[str]) -> None:
+        for profile_name in profile_names & entities_by_profile.keys():
+            platform_config = gateway.profile_registry.get_platform_config(profile_name, platform) or []
+            for entity in entities_by_profile[profile_name]:
+                entity.async_rebind(platform_config)
 
-            device_info = build_device_info_from_event(profile_registry, event)
-            device_id = build_device_id_from_device_info(device_info)
-            profile_name = device_info.get(CONF_PROFILE_NAME, UNDEFINED_PROFILE)
-            platform_config = profile_registry.get_platform_config(profile_name, platform)
-            if not platform_config:
-                _LOGGER.debug("Device %s does not support platform %s", event.device.id_string, platform)
-                return
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_RFPLAYER_PROFILES_CHANGED, _rebind)  # type: ignore[has-type]
+    )
 
-            async_add_entities(
-                builder(device_id, platform_config, event.data, entry_data.get(CONF_VERBOSE_MODE, False))
-            )
+    # Build the entities of the devices discovered, if automatic add is on, or added from the options
+    config_entry.async_on_unload(gateway.discovery.async_register_platform(platform, _build, async_add_entities))
 
-        config_entry.async_on_unload(
-            async_dispatcher_connect(hass, SIGNAL_RFPLAYER_EVENT, _update)  # type: ignore[has-type]
-        )
 
-
-class RfDeviceEntity(RestoreEntity):
+class RfDeviceEntity[ConfigT: RfpPlatformConfig](RestoreEntity):
     """Represents a RfPlayer device.
 
-    Contains the common logic for RfPlayer lights and switches.
+    Contains the common logic for RfPlayer lights and switches, generic over the platform
+    configuration of the entity.
     """
 
     _attr_assumed_state = True
     _attr_has_entity_name = True
     _attr_should_poll = False
+    # The event payload changes with each frame: recording it would add a row of attributes per state change
+    _unrecorded_attributes = frozenset({ATTR_EVENT_DATA})
+    _record_event_data = False
+    """True if the event payload is also exposed under a recorded attribute, for debugging."""
+    _group_events = False
+    """True if the entity accepts group commands sent to its device group."""
     _device_id: RfDeviceId
     _event_data: RfPlayerEventData | None
+    _event_snapshot: EventSnapshot
+    _config: ConfigT
 
-    def __init__(
-        self, device_id: RfDeviceId, profile_name: str, event_data: RfPlayerEventData | None, verbose: bool
-    ) -> None:
+    def __init__(self, device: DeviceContext, profile_name: str, verbose: bool) -> None:
         """Initialize the device.
 
         profile_name must be a stable identifier from the device profile to ensure correct behavior
         for unique_id generation and device registry. It is not intended to be user modified.
         """
-        self._attr_device_info = DeviceInfo(
-            identifiers=get_identifiers_from_device_id(device_id),
-            manufacturer=device_id.protocol,
-            model=device_id.model,
-            name=f"{device_id.protocol} {device_id.model} {device_id.address}"
-            if device_id.model
-            else f"{device_id.protocol} {device_id.address}",
-        )
+        self._attr_device_info = device.registry_info
         self._attr_name = profile_name
-        self._attr_unique_id = slugify(f"{device_id.id_string}_{profile_name}")
+        self._attr_unique_id = slugify(f"{device.id_string}_{profile_name}")
         # HA will generate the entity_id
-        self._event_data = event_data
-        self._device_id = device_id
+        self._event_data = device.event_data
+        self._device_id = device.device_id
         self._verbose = verbose
 
     async def async_added_to_hass(self) -> None:
-        """Restore RfPlayer device from last event stored in attributes."""
+        """Restore RfPlayer device from the last event of the device."""
+        gateway = cast(Gateway, self.hass.data[DOMAIN][RFPLAYER_GATEWAY])
+        self._event_snapshot = gateway.event_snapshot
+        # Devices without event in the snapshot, e.g. only controlled by Home Assistant
         if self._event_data is None and (old_state := await self.async_get_last_state()) is not None:
-            json_event_data = cast(str, old_state.attributes.get(ATTR_EVENT_DATA))
-            self._event_data = json.loads(json_event_data) if json_event_data else None
+            if json_event_data := cast(str | None, old_state.attributes.get(ATTR_EVENT_DATA)):
+                self._event_data = json.loads(json_event_data)
+            else:
+                self._restore_state(old_state)
 
         if self._event_data:
             self._apply_event(self._event_data)
 
+        self._record_event_data = gateway.config.get(CONF_RECORD_EVENT_DATA, False)
         self.async_on_remove(
-            async_dispatcher_connect(  # type: ignore[has-type]
-                self.hass, SIGNAL_RFPLAYER_EVENT, self._handle_event
-            )
+            gateway.router.async_register(self._device_id, self._handle_event, group=self._group_events)
         )
 
+        # The gateway may still be connecting
+        self._attr_available = cast(RfPlayerClient, self.hass.data[DOMAIN][RFPLAYER_CLIENT]).connected
         self.async_on_remove(
             async_dispatcher_connect(  # type: ignore[has-type]
                 self.hass, SIGNAL_RFPLAYER_AVAILABILITY, self._handle_availability
@@ -178,7 +154,10 @@ class RfDeviceEntity(RestoreEntity):
         """Return the device state attributes."""
         if not self._event_data:
             return None
-        return {ATTR_EVENT_DATA: json.dumps(self._event_data)}
+        payload = self._config.get_event_payload(self._event_data)
+        if self._record_event_data:
+            return {ATTR_EVENT_DATA: payload, ATTR_RECORDED_EVENT_DATA: payload}
+        return {ATTR_EVENT_DATA: payload}
 
     def _event_applies(self, event: RfDeviceEvent) -> bool:
         """Check if event applies to me."""
@@ -191,6 +170,9 @@ class RfDeviceEntity(RestoreEntity):
     def _group_event(self, event: RfDeviceEvent) -> bool:
         return False
 
+    def _restore_state(self, old_state: State) -> None:
+        """Restore the last state of an entity without event data."""
+
     def _apply_event(self, event_data: RfPlayerEventData) -> bool:
         """Apply a received event."""
         self._event_data = event_data
@@ -205,9 +187,26 @@ class RfDeviceEntity(RestoreEntity):
         if self._apply_event(event.data):
             _LOGGER.debug("%s updated", self.entity_id)
             self.async_write_ha_state()
+            if event.device.id_string != self._device_id.id_string:
+                # The gateway records the frames of the device itself, not the group commands it applies
+                self._event_snapshot.async_record(self._device_id.id_string, self._config.get_event_payload(event.data))
         elif self._verbose:
             _LOGGER.debug("%s not updated", self.entity_id)
 
+    @callback
+    def async_rebind(self, platform_configs: list[AnyRfpPlatformConfig]) -> None:
+        """Use the platform configuration of a changed device profile and apply the last event again."""
+        platform_config = next((c for c in platform_configs if c.name == self._config.name), None)
+        if not isinstance(platform_config, type(self._config)):
+            _LOGGER.warning("%s removed from its device profile, reload the integration to remove it", self.entity_id)
+            return
+
+        self._config = platform_config
+        if self._event_data:
+            self._apply_event(self._event_data)
+        if self.hass is not None:
+            self.async_write_ha_state()
+
     @callback
     def _handle_availability(self, available: bool) -> None:
         self._attr_available = available
@@ -0,0 +1,76 @@
+"""Route RF device events to the entities they apply to."""
+
+from collections.abc import Callable
+import logging
+
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
+from homeassistant.core import CALLBACK_TYPE, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+EventHandler = Callable[[RfDeviceEvent], None]
+
+GroupKey = tuple[str, str | None]
+"""Protocol and group code of a device."""
+
+
+class EventRouter:
+    """Routing table from RF device identifiers to event handlers.
+
+    Handlers are indexed by device id string and, for entities accepting group commands,
+    by protocol and group code. A received frame only reaches the handlers of the
+    matching device or group so that dispatch cost doesn't grow with the number of entities.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty routing table."""
+        self._device_routes: dict[str, tuple[EventHandler, ...]] = {}
+        self._group_routes: dict[GroupKey, tuple[EventHandler, ...]] = {}
+        self._redirects: dict[str, str] = {}
+
+    @callback
+    def async_register(self, device_id: RfDeviceId, handler: EventHandler, *, group: bool = False) -> CALLBACK_TYPE:
+        """Register an event handler for a device and return a function to unregister it.
+
+        A group handler receives all the events of the device group and must filter them itself.
+        """
+        routes: dict = self._group_routes if group else self._device_routes
+        key = (device_id.protocol, device_id.group_code) if group else device_id.id_string
+        routes[key] = (*routes.get(key, ()), handler)
+
+        @callback
+        def _async_unregister() -> None:
+            handlers = tuple(h for h in routes.get(key, ()) if h is not handler)
+            if handlers:
+                routes[key] = handlers
+            else:
+                routes.pop(key, None)
+
+        return _async_unregister
+
+    @callback
+    def async_set_redirect(self, id_string: str, address: str) -> None:
+        """Redirect the events of a device to another address."""
+        self._redirects[id_string] = address
+
+    @callback
+    def async_set_redirects(self, redirects: dict[str, str]) -> None:
+        """Replace all the redirects with addresses by device id string."""
+        self._redirects = redirects
+
+    def get_redirect_address(self, id_string: str) -> str | None:
+        """Return the address events of a device are redirected to, if any."""
+        return self._redirects.get(id_string)
+
+    def has_routes(self, device: RfDeviceId) -> bool:
+        """Tell if some handlers receive the events of a device."""
+        return device.id_string in self._device_routes or (device.protocol, device.group_code) in self._group_routes
+
+    @callback
+    def async_route(self, event: RfDeviceEvent) -> None:
+        """Call the handlers of the event device and group."""
+        device = event.device
+        for handler in self._device_routes.get(device.id_string, ()):
+            handler(event)
+        for handler in self._group_routes.get((device.protocol, device.group_code), ()):
+            handler(event)
@@ -0,0 +1,83 @@
+"""Snapshot of the last events of the RF devices, restored in bulk at startup."""
+
+from collections.abc import Container
+import logging
+from typing import Any
+
+import orjson
+
+from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, EVENT_SNAPSHOT_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class EventSnapshot:
+    """Last event payload of each RF device of a config entry, saved in its own storage file.
+
+    Entities record the compact payload of the events they apply, as serialized for their
+    state attributes, and seed their state from the snapshot when they are added. The
+    snapshot is read once at setup instead of a restore state lookup and a JSON parse
+    per entity, and the entities of a device share the same restored event.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Create the snapshot of the devices of a config entry, load it before use."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.events")
+        # Events loaded from the storage file, until a new event of the device is recorded
+        self._events: dict[str, RfPlayerEventData] = {}
+        # Serialized payloads of the events recorded since the snapshot was loaded
+        self._payloads: dict[str, str] = {}
+        self._save_pending = False
+
+    async def async_load(self, id_strings: Container[str]) -> None:
+        """Load the last events of the devices with the given id strings."""
+        data = await self._store.async_load()
+        events: dict[str, RfPlayerEventData] = data["events"] if data else {}
+        self._events = {id_string: event for id_string, event in events.items() if id_string in id_strings}
+        _LOGGER.debug("Restored the last events of %d devices", len(self._events))
+
+    def get(self, id_string: str) -> RfPlayerEventData | None:
+        """Return the restored last event of a device."""
+        return self._events.get(id_string)
+
+    @callback
+    def async_record(self, id_string: str, payload: str) -> None:
+        """Record the JSON payload of the last event of a device."""
+        self._payloads[id_string] = payload
+        self._events.pop(id_string, None)
+        self._schedule_save()
+
+    @callback
+    def async_remove_device(self, id_string: str) -> None:
+        """Forget the last event of a removed device."""
+        if self._payloads.pop(id_string, None) is not None or self._events.pop(id_string, None) is not None:
+            self._schedule_save()
+
+    async def async_flush(self) -> None:
+        """Save the recorded events now."""
+        if self._save_pending:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the storage file."""
+        await self._store.async_remove()
+
+    def _schedule_save(self) -> None:
+        # Pending changes are also saved by the store when Home Assistant stops
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, EVENT_SNAPSHOT_SAVE_DELAY.total_seconds())
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        # Recorded payloads are written as they are, without being parsed and serialized again
+        events: dict[str, Any] = dict(self._events)
+        events.update((id_string, orjson.Fragment(payload)) for id_string, payload in self._payloads.items())
+        return {"events": events}
@@ -1,55 +1,69 @@
 """RfPlayer gateway."""
 
 import asyncio
-import copy
 from datetime import datetime
 import json
 import logging
-from typing import cast
+from typing import Any, cast
 
 import voluptuous as vol
 
-from custom_components.rfplayer.device_profiles import UNDEFINED_PROFILE, async_get_profile_registry
+from custom_components.rfplayer.device_context import DeviceContext, build_device_context
+from custom_components.rfplayer.device_profiles import async_get_profile_registry, async_update_profile_overlays
 from custom_components.rfplayer.device_publishers import get_bus_publisher
-from custom_components.rfplayer.helpers import build_device_info_from_event, get_device_id_string_from_identifiers
+from custom_components.rfplayer.device_store import DeviceStore
+from custom_components.rfplayer.discovery import DiscoveryService
+from custom_components.rfplayer.event_router import EventRouter
+from custom_components.rfplayer.event_snapshot import EventSnapshot
+from custom_components.rfplayer.helpers import get_device_id_string_from_identifiers
 from custom_components.rfplayer.rfplayerlib import COMMAND_PROTOCOLS, RfPlayerClient, RfPlayerException
 from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
+from custom_components.rfplayer.rfplayerlib.event_queue import OverflowPolicy
+from custom_components.rfplayer.rfplayerlib.receive_filter import DeviceRules, ReceiveFilter
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_DEVICE_ID,
     CONF_ADDRESS,
     CONF_DEVICE,
-    CONF_DEVICES,
     CONF_PROFILE_NAME,
     CONF_PROTOCOL,
     EVENT_HOMEASSISTANT_STOP,
 )
-from homeassistant.core import CoreState, Event, HassJob, HomeAssistant, ServiceCall, callback
-from homeassistant.exceptions import ConfigEntryNotReady, PlatformNotReady
+from homeassistant.core import CALLBACK_TYPE, CoreState, Event, HassJob, HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import PlatformNotReady
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import EventDeviceRegistryUpdatedData
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 
 from .const import (
     ATTR_COMMAND,
     ATTR_EVENT_DATA,
+    CONF_ALLOW_DEVICES,
     CONF_AUTOMATIC_ADD,
+    CONF_BINARY_FORMAT,
+    CONF_DENY_DEVICES,
     CONF_INIT_COMMANDS,
+    CONF_MIN_RF_LEVEL,
+    CONF_OVERFLOW_POLICY,
     CONF_RECEIVER_PROTOCOLS,
     CONF_RECONNECT_INTERVAL,
-    CONF_REDIRECT_ADDRESS,
+    CONF_REPEAT_WINDOW,
     CONF_VERBOSE_MODE,
     CONNECTION_TIMEOUT,
+    DEFAULT_OVERFLOW_POLICY,
+    DEFAULT_REPEAT_WINDOW,
     DOMAIN,
     INIT_COMMANDS_EMPTY,
     INIT_COMMANDS_SEPARATOR,
+    PROFILE_OVERLAYS_SCAN_INTERVAL,
     RFPLAYER_CLIENT,
     SERVICE_SEND_PAIRING_COMMAND,
     SERVICE_SEND_RAW_COMMAND,
     SERVICE_SIMULATE_EVENT,
     SIGNAL_RFPLAYER_AVAILABILITY,
     SIGNAL_RFPLAYER_EVENT,
+    SIGNAL_RFPLAYER_PROFILES_CHANGED,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -72,15 +86,30 @@ class Gateway:
         self.entry = entry
         self.config = entry.data
         self.device_registry = dr.async_get(hass)
-        # All RfPlayer gateways are configured by default with a Jamming detector
-        self.config[CONF_DEVICES].update({JAMMING_DEVICE_ID_STRING: JAMMING_DEVICE_INFO})
+        self.device_store = DeviceStore(hass, entry.entry_id)
+        self.event_snapshot = EventSnapshot(hass, entry.entry_id)
+        self.router = EventRouter()
+        self._cancel_reconnect: CALLBACK_TYPE | None = None
+        self._closed = False
 
     async def async_setup(self):
         """Load a RfPlayer gateway."""
 
+        await self.device_store.async_load()
+        # All RfPlayer gateways are configured by default with a Jamming detector
+        if JAMMING_DEVICE_ID_STRING not in self.device_store:
+            self.device_store.async_update_devices({JAMMING_DEVICE_ID_STRING: JAMMING_DEVICE_INFO})
+        self._update_redirects()
+        await self.event_snapshot.async_load(self.device_store)
+
         self.verbose = self.config.get(CONF_VERBOSE_MODE, False)
         self.profile_registry = await async_get_profile_registry(self.hass, self.verbose)
+        self.device_contexts = self._prepare_device_contexts()
         self.bus_publisher = get_bus_publisher()
+        self.discovery = DiscoveryService(
+            self.hass, self.profile_registry, self._configured_device, self._add_rf_device
+        )
+        self.entry.async_on_unload(self.discovery.async_shutdown)
 
         # Initialize library
         client = RfPlayerClient(
@@ -91,16 +120,30 @@ class Gateway:
             receiver_protocols=self.config[CONF_RECEIVER_PROTOCOLS],
             init_commands=self._prepare_init_commands(),
             verbose=self.verbose,
+            binary_format=self.config.get(CONF_BINARY_FORMAT, False),
+            repeat_window=self.config.get(CONF_REPEAT_WINDOW, DEFAULT_REPEAT_WINDOW) / 1000,
+            overflow_policy=OverflowPolicy(self.config.get(CONF_OVERFLOW_POLICY, DEFAULT_OVERFLOW_POLICY)),
+            receive_filter=self._create_receive_filter(),
         )
         self.hass.data[DOMAIN][RFPLAYER_CLIENT] = client
 
-        await self.entry.async_create_task(self.hass, self._connect_gateway())
+        # Connect in the background so that the platforms and the entities are set up meanwhile,
+        # the entities are unavailable until the gateway is connected
+        self.entry.async_create_background_task(self.hass, self._connect_gateway(), "RfPlayer connection")
 
         self.entry.async_on_unload(
             self.hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, self._updated_rf_device)
         )
 
-        self.entry.async_on_unload(self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, lambda _: client.close()))
+        self.entry.async_on_unload(
+            self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, callback(lambda _: client.close()))
+        )
+
+        self.entry.async_on_unload(
+            async_track_time_interval(
+                self.hass, self._async_check_profile_overlays, PROFILE_OVERLAYS_SCAN_INTERVAL, cancel_on_shutdown=True
+            )
+        )
 
         self.hass.services.async_register(
             DOMAIN,
@@ -124,9 +167,40 @@ class Gateway:
     async def async_unload(self):
         """Unload a RfPlayer gateway."""
 
+        # The client of an unloaded gateway must not be reconnected
+        self._closed = True
+        if self._cancel_reconnect:
+            self._cancel_reconnect()
+            self._cancel_reconnect = None
+
         self.hass.services.async_remove(DOMAIN, SERVICE_SEND_RAW_COMMAND)
 
-        await self.hass.async_add_executor_job(self._get_client().close)
+        # Closed from the event loop which owns the transport and the held frames
+        self._get_client().close()
+        await self.device_store.async_flush()
+        await self.event_snapshot.async_flush()
+
+    @callback
+    def async_update_devices(self, devices: dict[str, dict[str, Any]]) -> None:
+        """Add RF devices or update their options, the entities of the new devices are added."""
+
+        new_id_strings = devices.keys() - self.device_store.devices.keys()
+        self.device_store.async_update_devices(devices)
+        self._update_redirects()
+        for id_string in new_id_strings:
+            device = build_device_context(self.profile_registry, self.device_store.devices[id_string])
+            self.device_contexts[id_string] = device
+            self.discovery.async_add_device(device)
+
+    async def _async_check_profile_overlays(self, _now: datetime) -> None:
+        """Rebind the entities of the device profiles changed by user overlay files."""
+
+        if changed := await async_update_profile_overlays(self.hass, self.profile_registry):
+            for device in self.device_contexts.values():
+                if device.profile_name in changed:
+                    device.profile = self.profile_registry.get_profile(device.profile_name)
+            self.discovery.async_clear_misses()
+            async_dispatcher_send(self.hass, SIGNAL_RFPLAYER_PROFILES_CHANGED, changed)
 
     def _prepare_init_commands(self) -> list[str]:
         command_string = cast(str, self.config[CONF_INIT_COMMANDS])
@@ -134,6 +208,30 @@ class Gateway:
         commands = [c.strip() for c in commands]
         return [c for c in commands if c != INIT_COMMANDS_EMPTY]
 
+    def _create_receive_filter(self) -> ReceiveFilter:
+        return ReceiveFilter(
+            allow=DeviceRules.parse(self.config.get(CONF_ALLOW_DEVICES)),
+            deny=DeviceRules.parse(self.config.get(CONF_DENY_DEVICES)),
+            min_rf_level=self.config.get(CONF_MIN_RF_LEVEL),
+            discovery=self.config[CONF_AUTOMATIC_ADD],
+            known_device=self._known_device,
+        )
+
+    @callback
+    def _configured_device(self, id_string: str) -> bool:
+        return id_string in self.device_store
+
+    @callback
+    def _known_device(self, device: RfDeviceId) -> bool:
+        """Tell if the events of a device are used even if discovery is disabled."""
+
+        return (
+            self._configured_device(device.id_string)
+            or device.id_string in self.device_store.redirects
+            or self.router.has_routes(device)
+            or self.bus_publisher.publishes(device.protocol)
+        )
+
     @callback
     def _async_handle_receive(self, event: RfDeviceEvent) -> None:
         """Event handler connected to the client."""
@@ -142,55 +240,71 @@ class Gateway:
         if self.verbose:
             _LOGGER.debug("Event data %s", json.dumps(event.data))
 
-        if event.device.id_string not in self.entry.data[CONF_DEVICES] and self.config[CONF_AUTOMATIC_ADD]:
-            self._add_rf_device(event)
-            # Still send event for group events
+        if self.config[CONF_AUTOMATIC_ADD]:
+            self.discovery.async_discover(event)
 
         # Replace event address if device has redirect configuration
-        if event.device.id_string in self.config[CONF_REDIRECT_ADDRESS]:
-            redirected_id_string = self.config[CONF_REDIRECT_ADDRESS][event.device.id_string]
-            event.device.address = self.config[CONF_DEVICES][redirected_id_string][CONF_ADDRESS]
+        if (redirected_address := self.router.get_redirect_address(event.device.id_string)) is not None:
+            event = RfDeviceEvent(event.device.with_address(redirected_address), event.data, event.header)
 
         # Callback to HA registered components.
         async_dispatcher_send(self.hass, SIGNAL_RFPLAYER_EVENT, event)  # type: ignore[has-type]
 
+        # Callback to the entities of the device
+        self.router.async_route(event)
+
+        # Keep the last event of a configured device once for all its entities
+        if (device := self.device_contexts.get(event.device.id_string)) is not None and device.profile is not None:
+            self.event_snapshot.async_record(device.id_string, device.profile.plan.get_payload(event.data))
+
         self.hass.async_create_task(self.bus_publisher.async_fire(self.hass, event))
 
     @callback
-    def _add_rf_device(self, event: RfDeviceEvent) -> None:
-        device_info = build_device_info_from_event(self.profile_registry, event)
-        if device_info[CONF_PROFILE_NAME] == UNDEFINED_PROFILE:
-            _LOGGER.debug("No matching profile for device %s event %s", event.device.id_string, json.dumps(event.data))
-            return
-
-        data = self.entry.data.copy()
-        data[CONF_DEVICES] = copy.deepcopy(self.entry.data[CONF_DEVICES])
-        data[CONF_DEVICES][event.device.id_string] = device_info
-        self.hass.config_entries.async_update_entry(entry=self.entry, data=data)
+    def _add_rf_device(self, device: DeviceContext) -> None:
+        self.device_store.async_update_devices({device.id_string: device.device_info})
+        self.device_contexts[device.id_string] = device
         _LOGGER.debug(
             "Device %s added (Proto: %s Addr: %s Model: %s)",
-            event.device.id_string,
-            event.device.protocol,
-            event.device.address,
-            event.device.model,
+            device.id_string,
+            device.device_id.protocol,
+            device.device_id.address,
+            device.device_id.model,
         )
 
+    def _prepare_device_contexts(self) -> dict[str, DeviceContext]:
+        # Parse the configured devices once for all the platforms
+        device_contexts = {}
+        for id_string, device_info in self.device_store.devices.items():
+            # The last event of the device is more recent than the event it was discovered with
+            device = build_device_context(self.profile_registry, device_info, self.event_snapshot.get(id_string))
+            if device.profile is None:
+                _LOGGER.debug("Device %s has undefined profile, skipping", id_string)
+                continue
+            device_contexts[id_string] = device
+        return device_contexts
+
     @callback
     def _remove_rf_device(self, id_string: str) -> None:
-        data = {
-            **self.entry.data,
-            CONF_DEVICES: {
-                device_config_id: entity_info
-                for device_config_id, entity_info in self.entry.data[CONF_DEVICES].items()
-                if device_config_id != id_string
-            },
-        }
-        self.hass.config_entries.async_update_entry(entry=self.entry, data=data)
+        self.device_store.async_remove_device(id_string)
+        self.event_snapshot.async_remove_device(id_string)
+        self.device_contexts.pop(id_string, None)
+        self._update_redirects()
+        self.discovery.async_forget(id_string)
         _LOGGER.debug(
             "Device %s removed",
             id_string,
         )
 
+    @callback
+    def _update_redirects(self) -> None:
+        devices = self.device_store.devices
+        self.router.async_set_redirects(
+            {
+                redirect_id_string: devices[id_string][CONF_ADDRESS]
+                for redirect_id_string, id_string in self.device_store.redirects.items()
+            }
+        )
+
     @callback
     def _updated_rf_device(self, event: Event[EventDeviceRegistryUpdatedData]) -> None:
         if event.data["action"] != "remove":
@@ -209,6 +323,9 @@ class Gateway:
 
     async def _connect_gateway(self):
         """Set up connection and hook it into HA for reconnect/shutdown."""
+        self._cancel_reconnect = None
+        if self._closed:
+            return
         _LOGGER.debug("Initiating RFPlayer connection")
 
         client = self._get_client()
@@ -219,7 +336,7 @@ class Gateway:
         except (
             RfPlayerException,
             TimeoutError,
-        ) as exc:
+        ):
             reconnect_interval = self.config[CONF_RECONNECT_INTERVAL]
             _LOGGER.exception("Error connecting to RfPlayer, reconnecting in %s", reconnect_interval)
             # Connection to RfPlayer gateway is lost, make entities unavailable
@@ -229,9 +346,8 @@ class Gateway:
                 await self._connect_gateway()
 
             reconnect_job = HassJob(target=connect_target, name="RfPlayer reconnect", cancel_on_shutdown=True)
-            async_call_later(self.hass, reconnect_interval, reconnect_job)
-
-            raise ConfigEntryNotReady(f"Failed to connect gateway: {exc!s}") from exc
+            self._cancel_reconnect = async_call_later(self.hass, reconnect_interval, reconnect_job)
+            return
 
         # There is a valid connection to a RfPlayer gateway now so
         # mark entities as available
@@ -249,8 +365,8 @@ class Gateway:
 
         async_dispatcher_send(self.hass, SIGNAL_RFPLAYER_AVAILABILITY, False)  # type: ignore[has-type]
 
-        # If HA is not stopping, initiate new connection
-        if self.hass.state is not CoreState.stopping:
+        # If HA is not stopping and the gateway is not unloaded, initiate new connection
+        if self.hass.state is not CoreState.stopping and not self._closed:
             _LOGGER.warning("Disconnected from RfPlayer, reconnecting")
             self.hass.async_create_task(self._connect_gateway(), eager_start=False)
 
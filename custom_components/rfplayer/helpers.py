@@ -46,6 +46,6 @@ def build_device_info_from_event(profile_registy: ProfileRegistry, event: RfDevi
     device_info[CONF_ADDRESS] = event.device.address
     device_info[CONF_MODEL] = event.device.model or ""
     device_info[CONF_REDIRECT_ADDRESS] = ""
-    device_info[CONF_PROFILE_NAME] = profile_registy.get_profile_name_from_event(event.data)
+    device_info[CONF_PROFILE_NAME] = profile_registy.get_profile_name_from_event(event.data, event.header)
     device_info[CONF_EVENT_DATA] = json.dumps(event.data)
     return device_info
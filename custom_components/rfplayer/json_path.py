@@ -0,0 +1,189 @@
+"""Precompiled JSON path value extractors for RfPlayer events."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+import re
+from typing import Any, Final
+
+from jsonpath_ng.ext import parse
+
+from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
+
+NOT_FOUND: Final = object()
+"""Sentinel returned when a path doesn't match anything in the event."""
+
+_FIELDS = r"((?:\.\w+)+)"
+_KEY_PATH_PATTERN = re.compile(rf"\${_FIELDS}")
+_FILTER_PATH_PATTERN = re.compile(rf"\${_FIELDS}\[\?\(@\.(\w+)\s*==\s*'([^']*)'\)\]((?:\.\w+)*)")
+
+Mask = dict[str | int, "Mask | bool"]
+"""Keys or list indexes of the parts of an event to keep, True to keep a whole value."""
+
+
+def _split_fields(fields: str) -> tuple[str, ...]:
+    return tuple(fields.split(".")[1:]) if fields else ()
+
+
+def _walk(value: Any, keys: tuple[str, ...]) -> Any:
+    for key in keys:
+        if not isinstance(value, dict) or key not in value:
+            return NOT_FOUND
+        value = value[key]
+    return value
+
+
+def _mark(mask: Mask, keys: tuple[str | int, ...]) -> None:
+    for key in keys[:-1]:
+        node = mask.get(key)
+        if isinstance(node, dict):
+            mask = node
+        elif node is True:
+            # The whole value is already kept
+            return
+        else:
+            child: Mask = {}
+            mask[key] = child
+            mask = child
+    mask[keys[-1]] = True
+
+
+def _prune(value: Any, mask: Mask | bool) -> Any:
+    if mask is True:
+        return value
+    assert isinstance(mask, dict)
+    if isinstance(value, list):
+        return [_prune(value[index], mask[index]) for index in sorted(mask) if isinstance(index, int)]
+    return {key: _prune(value[key], key_mask) for key, key_mask in mask.items() if key in value}
+
+
+class ValueExtractor(ABC):
+    """Return the first value matching a JSON path in an event."""
+
+    __slots__ = ("path",)
+
+    def __init__(self, path: str) -> None:
+        """Create a new extractor for the given JSON path."""
+        self.path = path
+
+    @abstractmethod
+    def find(self, event_data: RfPlayerEventData) -> Any:
+        """Return the first matching value or NOT_FOUND."""
+        raise NotImplementedError
+
+    def mark(self, event_data: RfPlayerEventData, mask: Mask) -> bool:
+        """Add the parts of the event read by the extractor to a mask, False if they are unknown."""
+        return False
+
+    def __repr__(self) -> str:
+        """Return a debug representation."""
+        return f"{type(self).__name__}({self.path!r})"
+
+
+class _KeyPathExtractor(ValueExtractor):
+    """Plain dotted path such as `$.frame.infos.qualifier` resolved with direct dict lookups."""
+
+    __slots__ = ("_keys",)
+
+    def __init__(self, path: str, keys: tuple[str, ...]) -> None:
+        super().__init__(path)
+        self._keys = keys
+
+    def find(self, event_data: RfPlayerEventData) -> Any:
+        return _walk(event_data, self._keys)
+
+    def mark(self, event_data: RfPlayerEventData, mask: Mask) -> bool:
+        if self._keys and _walk(event_data, self._keys) is not NOT_FOUND:
+            _mark(mask, self._keys)
+        return bool(self._keys)
+
+
+class _FilterPathExtractor(ValueExtractor):
+    """Keyed lookup in a list such as `$.frame.infos.measures[?(@.type=='power')].value`."""
+
+    __slots__ = ("_filter_key", "_filter_value", "_keys", "_value_keys")
+
+    def __init__(
+        self, path: str, keys: tuple[str, ...], filter_key: str, filter_value: str, value_keys: tuple[str, ...]
+    ) -> None:
+        super().__init__(path)
+        self._keys = keys
+        self._filter_key = filter_key
+        self._filter_value = filter_value
+        self._value_keys = value_keys
+
+    def find(self, event_data: RfPlayerEventData) -> Any:
+        match = self._find_item(event_data)
+        return NOT_FOUND if match is None else match[1]
+
+    def mark(self, event_data: RfPlayerEventData, mask: Mask) -> bool:
+        # The whole matching item is kept so that it still matches the filter
+        if (match := self._find_item(event_data)) is not None:
+            _mark(mask, (*self._keys, match[0]))
+        return True
+
+    def _find_item(self, event_data: RfPlayerEventData) -> tuple[str | int, Any] | None:
+        """Return the key or index of the first matching item and its value."""
+        items = _walk(event_data, self._keys)
+        if isinstance(items, dict):
+            indexed_items: Iterable[tuple[str | int, Any]] = items.items()
+        elif isinstance(items, list):
+            indexed_items = enumerate(items)
+        else:
+            return None
+        for index, item in indexed_items:
+            if isinstance(item, dict) and item.get(self._filter_key, NOT_FOUND) == self._filter_value:
+                value = _walk(item, self._value_keys)
+                if value is not NOT_FOUND:
+                    return index, value
+        return None
+
+
+class _JsonPathExtractor(ValueExtractor):
+    """Fallback on jsonpath_ng for expressions not supported by the fast extractors."""
+
+    __slots__ = ("_expr",)
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self._expr = parse(path)
+
+    def find(self, event_data: RfPlayerEventData) -> Any:
+        all_match = self._expr.find(event_data)
+        return all_match[0].value if all_match else NOT_FOUND
+
+    def __getstate__(self) -> str:
+        # jsonpath_ng expressions are rebuilt from the source path
+        return self.path
+
+    def __setstate__(self, state: str) -> None:
+        self.path = state
+        self._expr = parse(state)
+
+
+def compile_json_path(path: str) -> ValueExtractor:
+    """Compile a JSON path into the fastest extractor able to evaluate it."""
+
+    if m := _KEY_PATH_PATTERN.fullmatch(path):
+        return _KeyPathExtractor(path, _split_fields(m.group(1)))
+    if m := _FILTER_PATH_PATTERN.fullmatch(path):
+        return _FilterPathExtractor(
+            path,
+            keys=_split_fields(m.group(1)),
+            filter_key=m.group(2),
+            filter_value=m.group(3),
+            value_keys=_split_fields(m.group(4)),
+        )
+    return _JsonPathExtractor(path)
+
+
+def project(event_data: RfPlayerEventData, extractors: Iterable[ValueExtractor]) -> RfPlayerEventData:
+    """Return a copy of an event with only the parts read by the extractors.
+
+    The whole event is returned if the parts read by one of the extractors are unknown.
+    """
+
+    mask: Mask = {}
+    for extractor in extractors:
+        if not extractor.mark(event_data, mask):
+            return event_data
+    return _prune(event_data, mask)
@@ -3,15 +3,15 @@
 import logging
 from typing import Any
 
-from custom_components.rfplayer.const import COMMAND_GROUP_LIST, COMMAND_OFF_LIST, COMMAND_ON_LIST
+from custom_components.rfplayer.device_context import DeviceContext
 from custom_components.rfplayer.device_profiles import AnyRfpPlatformConfig, RfpLightConfig, RfpPlatformConfig
 from custom_components.rfplayer.entity import RfDeviceEntity, async_setup_platform_entry
-from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
 from homeassistant.components.light import ATTR_BRIGHTNESS, STATE_ON, ColorMode, LightEntity, LightEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -25,13 +25,9 @@ def _get_entity_description(
     return LightEntityDescription(key=config.name)
 
 
-def _builder(
-    device: RfDeviceId, platform_config: list[AnyRfpPlatformConfig], event_data: RfPlayerEventData | None, verbose: bool
-) -> list[Entity]:
+def _builder(device: DeviceContext, platform_config: list[AnyRfpPlatformConfig], verbose: bool) -> list[Entity]:
     return [
-        RfPlayerLight(
-            device, _get_entity_description(config, event_data), config, event_data=event_data, verbose=verbose
-        )
+        RfPlayerLight(device, _get_entity_description(config, device.event_data), config, verbose=verbose)
         for config in platform_config
     ]
 
@@ -52,39 +48,33 @@ async def async_setup_entry(
     )
 
 
-class RfPlayerLight(RfDeviceEntity, LightEntity):
+class RfPlayerLight(RfDeviceEntity[RfpLightConfig], LightEntity):
     """A representation of a RF light device."""
 
     _attr_color_mode = ColorMode.BRIGHTNESS
     _attr_supported_color_modes = {ColorMode.BRIGHTNESS}
     _attr_brightness: int = 0
     _attr_name = None
+    _group_events = True
 
     def __init__(
         self,
-        device: RfDeviceId,
+        device: DeviceContext,
         entity_description: LightEntityDescription,
         platform_config: RfpPlatformConfig,
-        event_data: RfPlayerEventData | None,
         verbose: bool,
     ) -> None:
         """Initialize the RfPlayer light."""
-        super().__init__(device_id=device, profile_name=platform_config.name, event_data=event_data, verbose=verbose)
+        super().__init__(device, platform_config.name, verbose)
         self.entity_description = entity_description
         assert isinstance(platform_config, RfpLightConfig)
         self._config = platform_config
-        self._event_data = event_data
 
-    async def async_added_to_hass(self) -> None:
+    def _restore_state(self, old_state: State) -> None:
         """Restore light device state (On/Off)."""
-        await super().async_added_to_hass()
-
-        if self._event_data is None:
-            old_state = await self.async_get_last_state()
-            if old_state is not None:
-                self._attr_is_on = old_state.state == STATE_ON
-                if brightness := old_state.attributes.get(ATTR_BRIGHTNESS):
-                    self._attr_brightness = int(brightness)
+        self._attr_is_on = old_state.state == STATE_ON
+        if brightness := old_state.attributes.get(ATTR_BRIGHTNESS):
+            self._attr_brightness = int(brightness)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the device on."""
@@ -116,21 +106,16 @@ class RfPlayerLight(RfDeviceEntity, LightEntity):
         """Apply command from RfPlayer."""
         super()._apply_event(event_data)
 
-        status = self._config.status.get_value(event_data)
-        command = status.lower() if status else None
-        if command in COMMAND_ON_LIST:
-            self._attr_is_on = True
-            self._attr_brightness = 255
-        elif command in COMMAND_OFF_LIST:
-            self._attr_is_on = False
-            self._attr_brightness = 0
-        else:
+        state = self._config.status.get_state(event_data)
+        if state is None:
             # Bright / Dim not supported cause we know neither the starting point not the increment value
-            _LOGGER.info("Unsupported light command %s", command)
+            _LOGGER.info("Unsupported light command %s", self._config.status.get_value(event_data))
             return False
 
+        self._attr_is_on = state
+        self._attr_brightness = 255 if state else 0
+
         return True
 
     def _group_event(self, event: RfDeviceEvent) -> bool:
-        value = self._config.status.get_value(event.data)
-        return value.lower() in COMMAND_GROUP_LIST if value else False
+        return self._config.status.is_group_command(event.data)
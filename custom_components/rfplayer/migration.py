@@ -3,10 +3,14 @@
 import logging
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICES
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from homeassistant.util import slugify
 
+from .const import CONF_REDIRECT_ADDRESS
+from .device_store import DeviceStore
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -55,3 +59,21 @@ async def async_migrate_version_1_2(hass: HomeAssistant, entry: ConfigEntry) ->
     hass.config_entries.async_update_entry(entry, version=1, minor_version=2)
 
     return True
+
+
+async def async_migrate_version_1_3(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Move the RF devices from the config entry data to the device store."""
+
+    _LOGGER.info("Migrating %s to version 1.3", entry.entry_id)
+    devices = entry.data.get(CONF_DEVICES, {})
+    store = DeviceStore(hass, entry.entry_id)
+    await store.async_load()
+    store.async_update_devices(devices)
+    # Save the devices before removing them from the config entry
+    await store.async_flush()
+    _LOGGER.info("Migrated %d devices for config entry %s", len(devices), entry.entry_id)
+
+    data = {key: value for key, value in entry.data.items() if key not in (CONF_DEVICES, CONF_REDIRECT_ADDRESS)}
+    hass.config_entries.async_update_entry(entry, data=data, version=1, minor_version=3)
+
+    return True
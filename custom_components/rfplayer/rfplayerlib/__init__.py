@@ -3,14 +3,16 @@
 import asyncio
 from collections.abc import Callable
 from dataclasses import dataclass
-from functools import partial
 import logging
 from typing import cast
 
 from serialx import SerialException, create_serial_connection
 
 from .device import RfDeviceEvent, RfDeviceEventAdapter
-from .protocol import RfPlayerEventData, RfplayerProtocol
+from .event_queue import EventQueue, OverflowPolicy
+from .protocol import REQUEST_TIMEOUT, RfPlayerEventData, RfPlayerException, RfplayerProtocol, RfPlayerRequest
+from .receive_filter import ReceiveFilter
+from .repeat import RepeatFilter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -83,10 +85,6 @@ COMMAND_PROTOCOLS = [
 RFPLAYER_BAUD_RATE = 115200
 
 
-class RfPlayerException(Exception):
-    """Generic RfPlayer exception."""
-
-
 @dataclass
 class RfPlayerClient:
     """Client to RfPlayer gateway."""
@@ -98,31 +96,33 @@ class RfPlayerClient:
     receiver_protocols: list[str]
     init_commands: list[str]
     verbose: bool
+    binary_format: bool = False
+    repeat_window: float = 0
+    overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    receive_filter: ReceiveFilter | None = None
     _protocol: RfplayerProtocol | None = None
     _adapter: RfDeviceEventAdapter | None = None
+    _repeat_filter: RepeatFilter | None = None
 
     async def connect(self) -> None:
         """Open connection with RfPlayer gateway."""
 
-        self._adapter = RfDeviceEventAdapter(device_event_callback=self.event_callback)
+        self._adapter = RfDeviceEventAdapter(
+            device_event_callback=self.event_callback,
+            device_filter=self.receive_filter.accepts if self.receive_filter else None,
+        )
 
         if self.port == SIMULATOR_PORT:
             _LOGGER.info("Connecting to RfPlayer simulator")
             return
 
-        protocol_factory = partial(
-            RfplayerProtocol,
-            loop=self.loop,
-            event_callback=self._adapter.raw_event_callback,
-            disconnect_callback=self._disconnect_callback_internal,
-            init_script=self._init_script(),
-            verbose=self.verbose,
-        )
+        if self.repeat_window > 0:
+            self._repeat_filter = RepeatFilter(self.loop, self.repeat_window, self._adapter.raw_event_callback)
 
         if self.port.startswith("tcp://"):
-            self._protocol = await self._make_tcp_protocol(protocol_factory)
+            self._protocol = await self._make_tcp_protocol(self._protocol_factory)
         else:
-            self._protocol = await self._make_serial_protocol(protocol_factory)
+            self._protocol = await self._make_serial_protocol(self._protocol_factory)
 
     def close(self) -> None:
         """Close connection if open."""
@@ -130,6 +130,8 @@ class RfPlayerClient:
         if self._protocol and self._protocol.transport:
             self._protocol.transport.close()
         self._protocol = None
+        if self._repeat_filter:
+            self._repeat_filter.clear()
 
     async def send_raw_command(self, command: str) -> None:
         """Send a raw command."""
@@ -151,6 +153,14 @@ class RfPlayerClient:
 
         return await self._protocol.send_raw_request(command)
 
+    def submit_raw_request(self, command: str, timeout: float = REQUEST_TIMEOUT) -> RfPlayerRequest:
+        """Send a raw request without waiting, the request gets the response and its latency."""
+
+        if not self._protocol or not self._protocol.transport:
+            raise RfPlayerException("Not connected")
+
+        return self._protocol.submit_raw_request(command, timeout)
+
     async def simulate_event(self, event_data: dict) -> None:
         """Send an event to the client callback."""
         if not self.connected:
@@ -171,6 +181,29 @@ class RfPlayerClient:
 
         return self._protocol
 
+    @property
+    def event_queue(self) -> EventQueue | None:
+        """Received events waiting to be dispatched, with their depth and overflow counters."""
+
+        return self._protocol.events if self._protocol else None
+
+    def _protocol_factory(self) -> RfplayerProtocol:
+        assert self._adapter
+        event_callback = self._adapter.raw_event_callback
+        if self._repeat_filter:
+            event_callback = self._repeat_filter.raw_event_callback
+        protocol = RfplayerProtocol(
+            loop=self.loop,
+            event_callback=event_callback,
+            disconnect_callback=self._disconnect_callback_internal,
+            init_script=self._init_script(),
+            verbose=self.verbose,
+        )
+        protocol.events.policy = self.overflow_policy
+        if self.receive_filter:
+            protocol.packet_filter = self._adapter.accept_packet
+        return protocol
+
     async def _make_serial_protocol(self, protocol_factory: Callable[[], RfplayerProtocol]) -> RfplayerProtocol:
         try:
             (_, protocol) = await create_serial_connection(self.loop, protocol_factory, self.port, RFPLAYER_BAUD_RATE)
@@ -201,6 +234,8 @@ class RfPlayerClient:
 
     def _init_script(self) -> list[str]:
         result = []
+        if self.binary_format:
+            result.append("FORMAT BINARY")
         if self.receiver_protocols:
             result.append(f"RECEIVER -* +{' +'.join(self.receiver_protocols)}")
         if self.init_commands:
@@ -0,0 +1,250 @@
+"""RfPlayer binary frame decoder.
+
+Binary frames are received after a `FORMAT BINARY` command. They are decoded into the same
+`frame.header` / `frame.infos` structure as JSON packets, with string values. Only the
+meaning fields read by the integration are filled in and binary frames carry no frequency.
+"""
+
+from collections.abc import Callable
+import logging
+import struct
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+REGULAR_FRAME_TYPE = 0
+_HEADER = struct.Struct("<BBBbbBBB")
+_INFOS = struct.Struct("<10H")
+REGULAR_FRAME_SIZE = _HEADER.size + _INFOS.size
+
+PROTOCOL_MEANINGS = {
+    1: "X10",
+    2: "VISONIC",
+    3: "BLYSS",
+    4: "CHACON",
+    5: "OREGON",
+    6: "DOMIA",
+    7: "OWL",
+    8: "X2D",
+    9: "RTS",
+    10: "KD101",
+    11: "PARROT",
+    13: "TIC",
+    14: "FS20",
+    15: "JAMMING",
+    16: "EDISIO",
+}
+
+_COMMAND_MEANINGS = {0: "OFF", 1: "ON", 2: "BRIGHT", 3: "DIM", 4: "ALL_OFF", 5: "ALL_ON"}
+_VISONIC_MEANINGS = {0: "Detector/Sensor", 1: "Remote control"}
+_RTS_MEANINGS = {0: "Shutter", 1: "Portal"}
+_X2D_THERMOSTAT_MEANINGS = {
+    0: "GENERIC",
+    1: "RADIO TYBOX",
+    2: "TYBOX BUS",
+    3: "PACK LABEL",
+    4: "DELTA 200",
+    5: "DRIVER RF",
+    6: "STARBOX F03",
+    7: "OTHER",
+    8: "REC BIDIR",
+}
+_X2D_ALARM_MEANINGS = {0: "Detector/Sensor", 1: "Remote control/Shutter"}
+_OREGON_MODELS = {
+    0x1A2D: "THGR122/228/238/268,THGN122/123/132",
+    0xCA2C: "THGR328",
+    0x0ACC: "RTGR328",
+    0xEA4C: "THC238/268,THWR288,THRN122,THN122/132,AW129/131",
+    0x1A3D: "THGR918/928,THGRN228,THGN50",
+    0x5A6D: "THGR918N",
+    0x1A89: "WGR800",
+    0xCA48: "THWR800",
+    0xFA28: "THGR810",
+    0x2A19: "PCR800",
+    0xDA78: "UVN800",
+}
+_OWL_MODELS = {0: "CM119/CM160", 1: "CM130", 2: "CM180", 3: "CM180i"}
+
+_InfosDecoder = Callable[[tuple[int, ...]], dict]
+
+
+def _signed(value: int) -> int:
+    return value - 0x10000 if value & 0x8000 else value
+
+
+def _long(lsb: int, msb: int) -> int:
+    return lsb | msb << 16
+
+
+def _measure(measure_type: str, value: str, unit: str) -> dict[str, str]:
+    return {"type": measure_type, "value": value, "unit": unit}
+
+
+def _id_infos(infos: tuple[int, ...], meanings: dict[int, str] | None = None) -> dict:
+    result = {"subType": str(infos[0]), "id": str(_long(infos[1], infos[2]))}
+    if meanings is not None and infos[0] in meanings:
+        result["subTypeMeaning"] = meanings[infos[0]]
+    return result
+
+
+def _qualified_id_infos(infos: tuple[int, ...], meanings: dict[int, str] | None = None) -> dict:
+    return {**_id_infos(infos, meanings), "qualifier": str(infos[3])}
+
+
+def _decode_x10(infos: tuple[int, ...]) -> dict:
+    return {
+        "subType": str(infos[0]),
+        "id": str(infos[1]),
+        "subTypeMeaning": _COMMAND_MEANINGS.get(infos[0], str(infos[0])),
+    }
+
+
+def _sensor_infos(infos: tuple[int, ...], models: dict[int, str], adr_shift: int, *measures: dict) -> dict:
+    result = {"subType": str(infos[0]), "id_PHY": f"0x{infos[1]:04X}"}
+    if infos[1] in models:
+        result["id_PHYMeaning"] = models[infos[1]]
+    adr_channel = infos[2]
+    result.update(
+        {
+            "adr_channel": str(adr_channel),
+            "adr": str(adr_channel >> adr_shift),
+            "channel": str(adr_channel & ((1 << adr_shift) - 1)),
+            "qualifier": str(infos[3]),
+            "lowBatt": str(infos[3] & 1),
+            "measures": list(measures),
+        }
+    )
+    return result
+
+
+def _decode_thermo_hygro(infos: tuple[int, ...]) -> dict:
+    return _sensor_infos(
+        infos,
+        _OREGON_MODELS,
+        8,
+        _measure("temperature", f"{_signed(infos[4]) / 10:+.1f}", "Celsius"),
+        _measure("hygrometry", str(infos[5]), "%"),
+    )
+
+
+def _decode_pressure(infos: tuple[int, ...]) -> dict:
+    return _sensor_infos(
+        infos,
+        _OREGON_MODELS,
+        8,
+        _measure("temperature", f"{_signed(infos[4]) / 10:+.1f}", "Celsius"),
+        _measure("hygrometry", str(infos[5]), "%"),
+        _measure("pressure", str(infos[6]), "hPa"),
+    )
+
+
+def _decode_wind(infos: tuple[int, ...]) -> dict:
+    return _sensor_infos(
+        infos,
+        _OREGON_MODELS,
+        8,
+        _measure("wind speed", f"{infos[4] / 10:.1f}", "m/s"),
+        _measure("direction", str(infos[5]), "degree"),
+    )
+
+
+def _decode_uv(infos: tuple[int, ...]) -> dict:
+    return _sensor_infos(infos, _OREGON_MODELS, 8, _measure("uv", f"{infos[4] / 10:.1f}", ""))
+
+
+def _decode_power(infos: tuple[int, ...]) -> dict:
+    return _sensor_infos(
+        infos,
+        _OWL_MODELS,
+        4,
+        _measure("energy", str(_long(infos[4], infos[5])), "Wh"),
+        _measure("power", str(infos[6]), "W"),
+        _measure("P1", str(infos[7]), "W"),
+        _measure("P2", str(infos[8]), "W"),
+        _measure("P3", str(infos[9]), "W"),
+    )
+
+
+def _decode_rain(infos: tuple[int, ...]) -> dict:
+    return _sensor_infos(
+        infos,
+        _OREGON_MODELS,
+        8,
+        _measure("total rain", f"{_long(infos[4], infos[5]) / 10:.1f}", "mm"),
+        _measure("current rain", f"{infos[6] / 100:.2f}", "mm/h"),
+    )
+
+
+def _decode_x2d_thermostat(infos: tuple[int, ...]) -> dict:
+    return {
+        **_qualified_id_infos(infos, _X2D_THERMOSTAT_MEANINGS),
+        "area": str(infos[1] & 0x0F),
+        "function": str(infos[4]),
+        "state": str(infos[5]),
+        "d0": str(infos[6]),
+        "d1": str(infos[7]),
+        "d2": str(infos[8]),
+        "d3": str(infos[9]),
+    }
+
+
+def _decode_edisio(infos: tuple[int, ...]) -> dict:
+    # The Edisio command and model tables are not part of the API documentation, raw codes are used
+    info = infos[4]
+    return {
+        **_qualified_id_infos(infos),
+        "subTypeMeaning": str(infos[0]),
+        "info": str(info),
+        "infoMeaning": f"{info & 0xFF}, {(info >> 8) / 10:.1f}V",
+        "add0": str(infos[5]),
+        "add1": str(infos[6]),
+    }
+
+
+_INFOS_DECODERS: dict[int, _InfosDecoder] = {
+    0: _decode_x10,
+    1: lambda infos: _id_infos(infos, _COMMAND_MEANINGS),
+    2: lambda infos: _qualified_id_infos(infos, _VISONIC_MEANINGS),
+    3: lambda infos: _qualified_id_infos(infos, _RTS_MEANINGS),
+    4: _decode_thermo_hygro,
+    5: _decode_pressure,
+    6: _decode_wind,
+    7: _decode_uv,
+    8: _decode_power,
+    9: _decode_rain,
+    10: _decode_x2d_thermostat,
+    11: lambda infos: _qualified_id_infos(infos, _X2D_ALARM_MEANINGS),
+    13: _qualified_id_infos,
+    14: _qualified_id_infos,
+    15: _decode_edisio,
+}
+
+
+def decode_binary_frame(data: bytes) -> dict[str, Any] | None:
+    """Decode the payload of a binary frame container.
+
+    Return None for frames other than the ones received from the regular decoder.
+    """
+
+    if len(data) < REGULAR_FRAME_SIZE or data[0] != REGULAR_FRAME_TYPE:
+        _LOGGER.debug("Unsupported binary frame: %s", data.hex())
+        return None
+    frame_type, cluster, data_flag, rf_level, floor_noise, rf_quality, protocol, info_type = _HEADER.unpack_from(data)
+    infos = _INFOS.unpack_from(data, _HEADER.size)
+    decoder = _INFOS_DECODERS.get(info_type)
+    return {
+        "frame": {
+            "header": {
+                "frameType": str(frame_type),
+                "cluster": str(cluster),
+                "dataFlag": str(data_flag),
+                "rfLevel": str(rf_level),
+                "floorNoise": str(floor_noise),
+                "rfQuality": str(rf_quality),
+                "protocol": str(protocol),
+                "protocolMeaning": PROTOCOL_MEANINGS.get(protocol, str(protocol)),
+                "infoType": str(info_type),
+            },
+            "infos": decoder(infos) if decoder else {"subType": str(infos[0])},
+        }
+    }
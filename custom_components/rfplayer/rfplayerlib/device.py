@@ -1,75 +1,111 @@
 """RfPlayer device info extraction."""
 
+from __future__ import annotations
+
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 import logging
 import re
-from typing import Any
+from typing import Any, Self
 
-from .protocol import RfPlayerEventData
+from .protocol import PacketSummary, RfPlayerEventData, int_or_none
 
 _LOGGER = logging.getLogger(__name__)
 
 UNKNOWN_INFO = "unknown"
+DEVICE_ID_CACHE_SIZE = 4096
+"""Maximum number of interned device ids."""
 
 
-@dataclass
 class RfDeviceId:
-    """Identifiers of a RF device or the RfPlayer gateway itself."""
+    """Identifiers of a RF device or the RfPlayer gateway itself.
+
+    Device ids are immutable and interned: creating the id of a recently seen device returns
+    the same object, with its derived identifiers computed once.
+    """
 
     X10_PATTERN = re.compile("([A-P])(1[0-6]|[1-9])")
     HEX_PATTERN = re.compile("X([0-9A-F]+)")
-    DEC_PATTERN = re.compile("[0-9]+")
+
+    __slots__ = ("_hash", "address", "group_code", "id_string", "integer_address", "model", "protocol", "unit_code")
 
     protocol: str
+    address: str
+    """The device address."""
     model: str | None
-    _address: str
-    _integer_address: int
+    integer_address: int
+    """Integer device address."""
+    id_string: str
+    """Unique device id for the device."""
+    group_code: str | None
+    """Group code extracted from address for protocols supporting group commands."""
+    unit_code: str | None
+    """Unit code extracted from address for protocols supporting group commands."""
+    _hash: int
+
+    # Interned ids are created by _intern_device_id, always of this class
+    def __new__(cls, protocol: str, address: str, *, model: str | None = None) -> RfDeviceId:  # noqa: PYI034
+        """Return the RF device id, raise ValueError if the address is invalid."""
+
+        return _intern_device_id(protocol, address, model)
+
+    @classmethod
+    def _create(cls, protocol: str, address: str, model: str | None) -> Self:
+        integer_address = cls._address_to_integer(address)
+        self = object.__new__(cls)
+        init = object.__setattr__
+        init(self, "protocol", protocol)
+        init(self, "address", address)
+        init(self, "model", model)
+        init(self, "integer_address", integer_address)
+        init(self, "id_string", f"{protocol}-{integer_address}")
+        # Assume that everything but the last 2 bytes is a housecode / pairing id for all protocols
+        # and that any group command applies to the whole housecode
+        init(self, "group_code", str(integer_address & 0xFFFFFF00))
+        # RfPlayer ID for commands must be 0-255
+        init(self, "unit_code", str(integer_address & 0x000000FF))
+        init(self, "_hash", hash((protocol, address, model)))
+        return self
 
-    def __init__(self, protocol: str, address: str, *, model: str | None = None):
-        """Create a new RF device id."""
+    def with_address(self, address: str) -> RfDeviceId:
+        """Return the id of the same device at another address."""
 
-        self.protocol = protocol
-        self.address = address
-        self.model = model
+        return _intern_device_id(self.protocol, address, self.model)
 
-    @property
-    def address(self) -> str:
-        """The device address."""
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Prevent changes, device ids are immutable."""
 
-        return self._address
+        raise AttributeError(f"{type(self).__name__} is immutable")
 
-    @address.setter
-    def address(self, value: str) -> None:
-        self._address = value
-        self._integer_address = self._address_to_integer(value)
+    def __delattr__(self, name: str) -> None:
+        """Prevent changes, device ids are immutable."""
 
-    @property
-    def integer_address(self) -> int:
-        """Read-only integer device address."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
 
-        return self._integer_address
+    def __eq__(self, other: object) -> bool:
+        """Compare protocol, address and model."""
 
-    @property
-    def id_string(self) -> str:
-        """Build a unique device id for the device."""
+        if self is other:
+            return True
+        if not isinstance(other, RfDeviceId):
+            return NotImplemented
+        return (self.protocol, self.address, self.model) == (other.protocol, other.address, other.model)
 
-        return f"{self.protocol}-{self.integer_address}"
+    def __hash__(self) -> int:
+        """Hash protocol, address and model."""
 
-    @property
-    def group_code(self) -> str | None:
-        """Group code extracted from address for protocols supporting group commands."""
+        return self._hash
 
-        # Assume that everything but the last 2 bytes is a housecode / pairing id for all protocols
-        # and that any group command applies to the whole housecode
-        return str(self.integer_address & 0xFFFFFF00)
+    def __repr__(self) -> str:
+        """Return the constructor representation."""
 
-    @property
-    def unit_code(self) -> str | None:
-        """Unit code extracted from address for protocols supporting group commands."""
+        return f"RfDeviceId(protocol={self.protocol!r}, address={self.address!r}, model={self.model!r})"
 
-        # RfPlayer ID for commands must be 0-255
-        return str(self.integer_address & 0x000000FF)
+    def __reduce__(self) -> tuple:
+        """Copy and pickle through the intern cache."""
+
+        return (_intern_device_id, (self.protocol, self.address, self.model))
 
     @staticmethod
     def is_valid_address(address: str) -> bool:
@@ -84,10 +120,9 @@ class RfDeviceId:
 
     @staticmethod
     def _address_to_integer(address: str) -> int:
+        if address.isascii() and address.isdigit():
+            return int(address)
         upper_address = address.upper()
-        m = RfDeviceId.DEC_PATTERN.fullmatch(upper_address)
-        if m:
-            return int(upper_address)
         m = RfDeviceId.X10_PATTERN.fullmatch(upper_address)
         if m:
             return ((ord(m.group(1)) - ord("A")) * 16 + int(m.group(2))) - 1
@@ -97,12 +132,69 @@ class RfDeviceId:
         raise ValueError("Invalid address")
 
 
+@lru_cache(maxsize=DEVICE_ID_CACHE_SIZE)
+def _intern_device_id(protocol: str, address: str, model: str | None) -> RfDeviceId:
+    return RfDeviceId._create(protocol, address, model)  # noqa: SLF001
+
+
+@dataclass(frozen=True, slots=True)
+class FrameHeader:
+    """Typed view of the fields of a received frame used to identify and match devices."""
+
+    protocol: str
+    """Protocol meaning, e.g. OREGON."""
+    info_type: str
+    sub_type: str | None = None
+    id_phy: str | None = None
+    rf_level: int | None = None
+    """Received signal level in dBm."""
+    floor_noise: int | None = None
+    """Floor noise in dBm."""
+    frequency: int | None = None
+    """Frequency in kHz, None for binary frames."""
+
+    @classmethod
+    def from_frame(cls, frame: dict[str, Any]) -> Self:
+        """Read the header of a frame, raise KeyError if it has no protocol."""
+
+        header = frame["header"]
+        infos = frame.get("infos") or {}
+        return cls(
+            header["protocolMeaning"],
+            header.get("infoType", ""),
+            infos.get("subType"),
+            infos.get("id_PHY"),
+            int_or_none(header.get("rfLevel")),
+            int_or_none(header.get("floorNoise")),
+            int_or_none(header.get("frequency")),
+        )
+
+    @classmethod
+    def from_event_data(cls, event_data: RfPlayerEventData) -> Self | None:
+        """Read the header of a frame event, None for other events."""
+
+        frame = event_data.get("frame")
+        if not isinstance(frame, dict) or "protocolMeaning" not in frame.get("header", {}):
+            return None
+        return cls.from_frame(frame)
+
+
 @dataclass
 class RfDeviceEvent:
-    """Device-oriented event after processing a raw RfPlayer event."""
+    """Device-oriented event after processing a raw RfPlayer event.
+
+    The raw event data is kept for JSONPath extraction and persistence.
+    """
 
     device: RfDeviceId
     data: RfPlayerEventData
+    header: FrameHeader | None = field(default=None, compare=False)
+    """Frame header, read from data if not provided."""
+
+    def __post_init__(self) -> None:
+        """Read the frame header once."""
+        if self.header is None:
+            self.header = FrameHeader.from_event_data(self.data)
 
 
 @dataclass
@@ -110,12 +202,27 @@ class RfDeviceEventAdapter:
     """Extract RF device information from a raw RfPlayer event."""
 
     device_event_callback: Callable[[RfDeviceEvent], None]
+    device_filter: Callable[[RfDeviceId, int | None], bool] | None = None
+    """Tell if the events of a device received with a RF level are used, others are dropped before being decoded."""
+
+    def accept_packet(self, summary: PacketSummary) -> bool:
+        """Tell if a packet must be decoded, from the fields read before decoding it."""
+
+        if self.device_filter is None or summary.address is None:
+            return True
+        try:
+            device = RfDeviceId(protocol=summary.protocol, address=summary.address)
+        except ValueError:
+            return True
+        return self.device_filter(device, summary.rf_level)
 
     def raw_event_callback(self, event_data: RfPlayerEventData):
         """Convert raw RfPlayer event to RF Device event."""
 
-        device = self._parse_json_device(event_data)
-        self.device_event_callback(RfDeviceEvent(device=device, data=event_data))
+        frame = event_data["frame"]
+        header = FrameHeader.from_frame(frame)
+        device = self._parse_json_device(header, frame["infos"])
+        self.device_event_callback(RfDeviceEvent(device=device, data=event_data, header=header))
 
     def _convert_raw_model(self, raw_model: str) -> str:
         if raw_model.lower() in ["on", "off"]:
@@ -135,12 +242,9 @@ class RfDeviceEventAdapter:
                 return infos[key]
         return UNKNOWN_INFO
 
-    def _parse_json_device(self, json_packet: dict[str, Any]) -> RfDeviceId:
-        header = json_packet["frame"]["header"]
-        infos = json_packet["frame"]["infos"]
-        protocol = header["protocolMeaning"]
+    def _parse_json_device(self, header: FrameHeader, infos: dict[str, Any]) -> RfDeviceId:
         return RfDeviceId(
-            protocol=protocol,
+            protocol=header.protocol,
             address=self._get_address(infos),
             model=self._get_model(infos),
         )
@@ -0,0 +1,85 @@
+"""Bounded queue of received RfPlayer events."""
+
+from collections import deque
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from enum import StrEnum
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_QUEUE_SIZE = 256
+"""Default maximum number of received events waiting to be dispatched."""
+
+
+class OverflowPolicy(StrEnum):
+    """Event dropped when an event is received while the queue is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    """Replace the queued event of the same device, or drop the oldest if there is none."""
+
+
+def _device_key(event_data: dict[str, Any]) -> Hashable:
+    # Same address lookup as RfDeviceEventAdapter
+    frame = event_data.get("frame") or {}
+    infos = frame.get("infos") or {}
+    address = next((infos[key] for key in ("id", "id_channel", "adr_channel") if key in infos), None)
+    return (frame.get("header", {}).get("protocolMeaning"), address)
+
+
+@dataclass
+class EventQueue:
+    """Received events waiting to be dispatched, with overflow counters."""
+
+    maxlen: int = EVENT_QUEUE_SIZE
+    policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    dropped: int = 0
+    """Number of events dropped because the queue was full."""
+    coalesced: int = 0
+    """Number of events replaced by a newer event of the same device because the queue was full."""
+    _events: deque[dict[str, Any]] = field(default_factory=deque)
+    _overflowing: bool = False
+
+    def __len__(self) -> int:
+        """Return the queue depth."""
+        return len(self._events)
+
+    @property
+    def full(self) -> bool:
+        """True if the next event triggers the overflow policy."""
+        return len(self._events) >= self.maxlen
+
+    def put(self, event_data: dict[str, Any]) -> None:
+        """Queue an event, applying the overflow policy if the queue is full."""
+        events = self._events
+        if len(events) < self.maxlen:
+            events.append(event_data)
+            return
+        if not self._overflowing:
+            _LOGGER.warning("Event queue full (%d events), applying %s policy", len(events), self.policy)
+            self._overflowing = True
+        if self.policy == OverflowPolicy.COALESCE:
+            key = _device_key(event_data)
+            for i, queued in enumerate(events):
+                if _device_key(queued) == key:
+                    events[i] = event_data
+                    self.coalesced += 1
+                    return
+        events.popleft()
+        events.append(event_data)
+        self.dropped += 1
+
+    def clear(self) -> None:
+        """Drop all the queued events."""
+        self._events.clear()
+        self._overflowing = False
+
+    def get(self) -> dict[str, Any]:
+        """Remove and return the oldest event."""
+        event_data = self._events.popleft()
+        if self._overflowing and not self._events:
+            _LOGGER.info("Event queue drained, %d events dropped, %d coalesced", self.dropped, self.coalesced)
+            self._overflowing = False
+        return event_data
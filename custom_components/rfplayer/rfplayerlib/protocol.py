@@ -1,28 +1,224 @@
 """Async RfPlayer low-level protocol."""
 
 import asyncio
+from collections import deque
 from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import cache
 import json
 import logging
+import re
 from typing import Any, cast
 
+from .binary import decode_binary_frame
+from .event_queue import EventQueue
+
 _LOGGER = logging.getLogger(__name__)
 
 END_OF_LINE = "\n\r"
 PACKET_HEADER_LEN = 5
+PACKET_MARKER = b"ZIA"
+BINARY_HEADER_LEN = 5
+# Header of a binary frame container, at the start of a line or after the previous container
+_BINARY_HEADER = re.compile(rb"[\0 \t\r]*(ZI[\x00-\x3f])")
+"""Binary frame container header, ASCII containers use printable source qualifiers."""
+MAX_BUFFER_SIZE = 65536
+"""Maximum size of a partial line before resynchronizing on the next packet header."""
 MINIMUM_SCRIPT = ["FORMAT JSON"]
+REQUEST_TIMEOUT = 60
+"""Default delay in seconds to wait for a request response."""
+LATE_RESPONSE_DELAY = 10
+"""Delay in seconds after its deadline during which an abandoned request still consumes its late response."""
+ERROR_REPLY_DELAY = 0.1
+"""Delay in seconds to wait for the error lines following an empty request response."""
+EVENT_SLICE_SIZE = 32
+"""Maximum number of events dispatched before yielding to the event loop."""
 
 
 RfPlayerEventData = dict[str, Any]
 """RfPlayer JSON packet event data."""
 
 
-def _valid_packet(line: str):
-    return len(line) >= PACKET_HEADER_LEN
+@dataclass(frozen=True, slots=True)
+class JsonDecoder:
+    """JSON decoding backend parsing packet bodies straight from the received bytes."""
+
+    name: str
+    loads: Callable[[bytes], Any]
+    errors: tuple[type[Exception], ...]
+    """Exceptions raised on invalid JSON or invalid UTF-8 data."""
+
+
+@dataclass(frozen=True, slots=True)
+class PacketSummary:
+    """Fields identifying the device of a packet, read before decoding the whole packet."""
+
+    protocol: str
+    info_type: str
+    address: str | None
+    rf_level: int | None = None
+
+
+def int_or_none(value: str | None) -> int | None:
+    """Convert a numeric field of a frame, None if it is missing or invalid."""
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+_ADDRESS_KEYS = (b'"id"', b'"id_channel"', b'"adr_channel"')
+"""Infos keys holding the device address, by order of precedence."""
+
+
+def _peek_string(body: bytes, key: bytes, pos: int = 0) -> tuple[str | None, int]:
+    """Return the string value of the next occurrence of a JSON key and its end position.
+
+    Only a string value directly following the key is read, without parsing the body.
+    """
+    pos = body.find(key, pos)
+    if pos < 0:
+        return None, 0
+    pos += len(key)
+    start = body.find(b'"', pos)
+    if start < 0 or body[pos:start].strip() != b":":
+        return None, 0
+    end = body.find(b'"', start + 1)
+    if end < 0 or body[end - 1] == 0x5C:  # escaped quote
+        return None, 0
+    return body[start + 1 : end].decode(errors="replace"), end
+
+
+def peek_json_packet(body: bytes) -> PacketSummary | None:
+    """Read the protocol, info type and device address of a JSON frame packet.
+
+    Return None if they can't be read without parsing the packet.
+    """
+    rf_level, pos = _peek_string(body, b'"rfLevel"')
+    protocol, pos = _peek_string(body, b'"protocolMeaning"', pos)
+    if protocol is None:
+        return None
+    info_type, pos = _peek_string(body, b'"infoType"', pos)
+    if info_type is None:
+        return None
+    infos_pos = body.find(b'"infos"', pos)
+    if infos_pos < 0:
+        return None
+    address = None
+    for key in _ADDRESS_KEYS:
+        if (address := _peek_string(body, key, infos_pos)[0]) is not None:
+            break
+    return PacketSummary(protocol, info_type, address, int_or_none(rf_level))
+
+
+def summarize_event(event_data: RfPlayerEventData) -> PacketSummary | None:
+    """Return the summary of a decoded frame packet."""
+    frame = event_data.get("frame")
+    if not isinstance(frame, dict) or "header" not in frame or "infos" not in frame:
+        return None
+    header = frame["header"]
+    infos = frame["infos"]
+    address = next((infos[key] for key in ("id", "id_channel", "adr_channel") if key in infos), None)
+    return PacketSummary(
+        header.get("protocolMeaning", ""), header.get("infoType", ""), address, int_or_none(header.get("rfLevel"))
+    )
+
+
+def _orjson_decoder() -> JsonDecoder:
+    import orjson  # noqa: PLC0415
+
+    return JsonDecoder("orjson", orjson.loads, (orjson.JSONDecodeError,))
+
+
+def _msgspec_decoder() -> JsonDecoder:
+    import msgspec  # noqa: PLC0415
+
+    return JsonDecoder("msgspec", msgspec.json.Decoder().decode, (msgspec.DecodeError, UnicodeDecodeError))
+
+
+def _stdlib_loads(data: bytes) -> Any:
+    # json.loads is faster on str than on bytes because of its encoding detection
+    return json.loads(data.decode())
+
+
+def _stdlib_decoder() -> JsonDecoder:
+    return JsonDecoder("json", _stdlib_loads, (json.JSONDecodeError, UnicodeDecodeError))
+
+
+JSON_DECODERS: dict[str, Callable[[], JsonDecoder]] = {
+    "orjson": _orjson_decoder,
+    "msgspec": _msgspec_decoder,
+    "json": _stdlib_decoder,
+}
+"""Supported JSON decoders by order of preference."""
+
+
+@cache
+def get_json_decoder(name: str | None = None) -> JsonDecoder:
+    """Return the named JSON decoder or the fastest one installed.
+
+    Raises ImportError if the named decoder is not installed.
+    """
+    if name is not None:
+        return JSON_DECODERS[name]()
+    for factory in JSON_DECODERS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return _stdlib_decoder()
+
+
+class RfPlayerException(Exception):
+    """Generic RfPlayer exception."""
+
+
+@dataclass(slots=True)
+class RfPlayerRequest:
+    """A request sent to the RfPlayer and waiting for its ZIA-- response."""
+
+    command: str
+    future: asyncio.Future[str]
+    sent_at: float
+    deadline: float
+    received_at: float | None = field(default=None)
+
+    @property
+    def latency(self) -> float | None:
+        """Delay in seconds between the request and its response, if received."""
+        return None if self.received_at is None else self.received_at - self.sent_at
+
+    @property
+    def abandoned(self) -> bool:
+        """True if the caller stopped waiting for the response."""
+        return self.future.done() and self.received_at is None
+
+
+def _binary_format_command(command: str) -> bool | None:
+    """Tell if a FORMAT command selects binary frames, None for the other commands."""
+    words = command.upper().split()
+    if words[:1] != ["FORMAT"] or len(words) < 2:
+        return None
+    return words[-1] in ("BIN", "BINARY")
+
+
+_COMMAND_ERRORS = ("error request number", "Syntax error:")
+_RAW_COMMAND_ERRORS = tuple(error.encode() for error in _COMMAND_ERRORS)
 
 
 def _command_error(line: str):
-    return line.startswith(("error request number", "Syntax error:"))
+    return line.startswith(_COMMAND_ERRORS)
+
+
+def _resync_packet(packet: bytes) -> bytes:
+    """Drop garbage data preceding a packet header."""
+    if packet.startswith((b"error request number", b"Syntax error:")):
+        return packet
+    start = packet.find(PACKET_MARKER)
+    if start > 0:
+        _LOGGER.warning("dropping invalid data: %s", packet[:start])
+        return packet[start:]
+    return packet
 
 
 class RfplayerProtocol(asyncio.Protocol):
@@ -47,10 +243,21 @@ class RfplayerProtocol(asyncio.Protocol):
         self.init_script = complete_init_script
         self._init_tasks: set[asyncio.Task] = set()
         self.verbose = verbose
-        self.buffer = ""
-        self.command_lock = asyncio.Lock()
-        self.command_event = asyncio.Event()
-        self.response_message = ""
+        self.json_decoder = get_json_decoder()
+        self.buffer = bytearray()
+        self._scan_pos = 0
+        self.binary_frames = False
+        self._pending_requests: deque[RfPlayerRequest] = deque()
+        self.events = EventQueue()
+        self.packet_filter: Callable[[PacketSummary], bool] | None = None
+        """Tell if a packet is decoded and dispatched, from its summary."""
+        self.filtered_packets = 0
+        self._drain_handle: asyncio.Handle | None = None
+        self._reading_paused = False
+        self._parse_pending = False
+        self._reply: RfPlayerRequest | None = None
+        """Request whose reply may continue with error lines."""
+        self._reply_handle: asyncio.TimerHandle | None = None
 
     def connection_made(self, transport: asyncio.BaseTransport) -> None:
         """Just logging for now."""
@@ -62,77 +269,345 @@ class RfplayerProtocol(asyncio.Protocol):
 
     def data_received(self, data: bytes) -> None:
         """Add incoming data to buffer."""
-        try:
-            decoded_data = data.decode()
-        except UnicodeDecodeError:
-            invalid_data = data.decode(errors="replace")
-            _LOGGER.warning("Failed to decode received data: %s", invalid_data)
-        else:
-            if self.verbose:
-                _LOGGER.debug("data received: %s", decoded_data)
-            self.buffer += decoded_data
+        if self.verbose:
+            _LOGGER.debug("data received: %s", data)
+        self.buffer += data
+        if self._parse_pending:
+            if len(self.buffer) <= MAX_BUFFER_SIZE:
+                # Parsed once the queued events are dispatched
+                return
+            # Data is still delivered while reading is paused: queue the buffered packets with
+            # the overflow policy instead of growing the buffer
+            self._parse_buffer(overflow=True)
+            return
+        if self.binary_frames or b"\n" in data or len(self.buffer) > MAX_BUFFER_SIZE:
             self.handle_lines()
+        else:
+            self._scan_pos = len(self.buffer)
 
     def handle_lines(self) -> None:
-        """Assemble incoming data into per-line packets."""
-        while "\n" in self.buffer:
-            line, self.buffer = self.buffer.split("\n", 1)
-            line = line.strip("\0 \t\r")
-            if _valid_packet(line):
-                _LOGGER.debug("packet received: %s", line)
-                self.handle_raw_packet(line)
-            elif line:
-                _LOGGER.warning("dropping invalid data: %s", line)
-
-    def handle_raw_packet(self, raw_packet: str) -> None:
-        """Handle one raw incoming packet."""
-        header = raw_packet[0:5]
-        body = raw_packet[5:]
-        if header == "ZIA--":
-            self.response_message = body
-            self.command_event.set()
-        elif header == "ZIA33":
+        """Assemble incoming data into per-line packets.
+
+        Only the newly received bytes are scanned for end of lines and the consumed lines
+        are removed at once from the buffer.
+        """
+        if self.binary_frames:
+            self.handle_containers()
+            return
+        self._parse_lines()
+        self.drain_events()
+
+    def handle_containers(self) -> None:
+        """Assemble incoming data into ASCII lines and binary frames.
+
+        Binary frame containers are delimited by their length instead of an end of line
+        and may contain end of line bytes, so the buffer is walked container by container.
+        """
+        self._parse_containers()
+        self.drain_events()
+
+    def _parse_buffer(self, overflow: bool = False) -> None:
+        if self.binary_frames:
+            self._parse_containers(overflow)
+        else:
+            self._parse_lines(overflow)
+
+    def _parse_lines(self, overflow: bool = False) -> None:
+        # Parsing stops while the event queue is full, the remaining lines are kept in the buffer
+        # unless the overflow policy applies
+        buffer = self.buffer
+        events = self.events
+        end = buffer.find(b"\n", self._scan_pos)
+        start = 0
+        with memoryview(buffer) as view:
+            while end >= 0 and (overflow or not events.full):
+                self.handle_line(bytes(view[start:end]))
+                start = end + 1
+                end = buffer.find(b"\n", start)
+        del buffer[:start]
+        self._end_parsing(pending=end >= 0)
+
+    def _parse_containers(self, overflow: bool = False) -> None:
+        buffer = self.buffer
+        events = self.events
+        size = len(buffer)
+        start = 0
+        pending = False
+        with memoryview(buffer) as view:
+            while start < size:
+                if events.full and not overflow:
+                    pending = True
+                    break
+                if m := _BINARY_HEADER.match(buffer, start):
+                    # Blank bytes left after the previous line or container are skipped
+                    header_pos = start = m.start(1)
+                    payload_pos = header_pos + BINARY_HEADER_LEN
+                    if payload_pos > size:
+                        break
+                    payload_end = payload_pos + (buffer[header_pos + 3] | buffer[header_pos + 4] << 8)
+                    if payload_end > size:
+                        break
+                    self.handle_binary_frame(bytes(view[payload_pos:payload_end]))
+                    start = payload_end
+                elif (end := buffer.find(b"\n", start)) >= 0:
+                    self.handle_line(bytes(view[start:end]))
+                    start = end + 1
+                else:
+                    break
+        del buffer[:start]
+        self._end_parsing(pending)
+
+    def _end_parsing(self, pending: bool) -> None:
+        self._parse_pending = pending
+        if pending:
+            self._scan_pos = 0
+        else:
+            self._check_overflow()
+
+    def _check_overflow(self) -> None:
+        buffer = self.buffer
+        if len(buffer) > MAX_BUFFER_SIZE:
+            # No end of line in sight, keep only the data after the last packet header
+            header_pos = max(buffer.rfind(PACKET_MARKER), 0) or len(buffer)
+            _LOGGER.warning("dropping %d bytes of invalid data", header_pos)
+            del buffer[:header_pos]
+        self._scan_pos = len(buffer)
+
+    def handle_binary_frame(self, payload: bytes) -> None:
+        """Decode and handle the payload of a binary frame container."""
+        if self.verbose:
+            _LOGGER.debug("binary frame received: %s", payload.hex())
+        if (event_data := decode_binary_frame(payload)) is None:
+            return
+        if self.packet_filter and not self._accepts(summarize_event(event_data)):
+            return
+        self.queue_event(event_data)
+
+    def handle_line(self, raw_line: bytes) -> None:
+        """Handle one complete line."""
+        packet = raw_line.strip(b"\0 \t\r")
+        if not packet.startswith(PACKET_MARKER):
+            packet = _resync_packet(packet)
+        if len(packet) >= PACKET_HEADER_LEN:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("packet received: %s", packet.decode(errors="replace"))
+            self.handle_raw_packet(packet)
+        elif packet:
+            _LOGGER.warning("dropping invalid data: %s", packet.decode(errors="replace"))
+
+    def handle_raw_packet(self, raw_packet: bytes) -> None:
+        """Handle one raw incoming packet.
+
+        JSON packets are parsed from the raw bytes, other packets are decoded to text first.
+        JSON packets rejected by the packet filter from their summary are not parsed at all.
+        """
+        header = raw_packet[:PACKET_HEADER_LEN]
+        if self._reply is not None and header != b"ZIA--" and not raw_packet.startswith(_RAW_COMMAND_ERRORS):
+            # The reply of the request is complete
+            self._end_reply()
+        if header == b"ZIA33":
+            body = raw_packet[PACKET_HEADER_LEN:]
+            summary = peek_json_packet(body) if self.packet_filter else None
+            if summary and not self._accepts(summary):
+                return
             try:
-                self.event_callback(cast(RfPlayerEventData, json.loads(body)))
-            except json.JSONDecodeError as e:
+                event_data = self.json_decoder.loads(body)
+            except self.json_decoder.errors as e:
                 _LOGGER.warning("Invalid JSON packet: %s", e)
-        elif header in ["ZIA00", "ZIA11", "ZIA22", "ZIA44", "ZIA66"]:
-            _LOGGER.warning("unsupported packet format: %s", header)
+                return
+            if self.packet_filter and not summary and not self._accepts(summarize_event(event_data)):
+                return
+            self.queue_event(cast(RfPlayerEventData, event_data))
+            return
+        try:
+            packet = raw_packet.decode()
+        except UnicodeDecodeError:
+            _LOGGER.warning("Failed to decode received data: %s", raw_packet.decode(errors="replace"))
+            return
+        body = packet[PACKET_HEADER_LEN:]
+        if header == b"ZIA--":
+            self.handle_response(body)
+        elif header in (b"ZIA00", b"ZIA11", b"ZIA22", b"ZIA44", b"ZIA66"):
+            _LOGGER.warning("unsupported packet format: %s", packet[:PACKET_HEADER_LEN])
             _LOGGER.debug("packet body: %s", body)
-        elif _command_error(raw_packet):
-            _LOGGER.warning("Command error: %s", raw_packet)
+        elif _command_error(packet):
+            self.handle_command_error(packet)
         else:
-            _LOGGER.warning("dropping invalid packet: %s", raw_packet)
+            _LOGGER.warning("dropping invalid packet: %s", packet)
+
+    def _accepts(self, summary: PacketSummary | None) -> bool:
+        if summary is None or self.packet_filter is None or self.packet_filter(summary):
+            return True
+        self.filtered_packets += 1
+        return False
+
+    def queue_event(self, event_data: RfPlayerEventData) -> None:
+        """Queue a received event and stop reading while the queue is full."""
+        self.events.put(event_data)
+        if self.events.full and not self._reading_paused and isinstance(self.transport, asyncio.ReadTransport):
+            _LOGGER.debug("Pause reading with %d queued events", len(self.events))
+            self.transport.pause_reading()
+            self._reading_paused = True
+
+    def drain_events(self) -> None:
+        """Dispatch a slice of the queued events.
+
+        A burst of received events is dispatched in slices, yielding to the event loop in
+        between, and reading resumes once the queue is half empty.
+        """
+        if self._drain_handle is not None:
+            return
+        events = self.events
+        for _ in range(min(len(events), EVENT_SLICE_SIZE)):
+            self.event_callback(events.get())
+        if self._parse_pending:
+            # Queue the packets left in the buffer when the queue was full
+            self._parse_buffer()
+        if self._reading_paused and not self._parse_pending and len(events) <= events.maxlen // 2:
+            _LOGGER.debug("Resume reading with %d queued events", len(events))
+            self._reading_paused = False
+            if isinstance(self.transport, asyncio.ReadTransport):
+                self.transport.resume_reading()
+        if events:
+            self._drain_handle = self.loop.call_soon(self._drain_next_slice)
+
+    def _drain_next_slice(self) -> None:
+        self._drain_handle = None
+        self.drain_events()
+
+    def handle_response(self, response: str) -> None:
+        """Resolve the oldest pending request with a response.
+
+        The RfPlayer answers requests in the order they were sent. Requests abandoned by
+        their caller stay queued for a while so that their late response is not delivered
+        to the next request. An invalid request gets an empty response followed by error
+        lines, so empty responses are resolved once no error line follows.
+        """
+        self._end_reply()
+        request = self._pop_request()
+        if request is None:
+            _LOGGER.warning("Unexpected response: %s", response)
+            return
+        if not response:
+            self._start_reply(request)
+        elif request.future.done():
+            _LOGGER.debug("Late response to %s after %.3fs: %s", request.command, request.latency, response)
+        else:
+            _LOGGER.debug("Response to %s received in %.3fs", request.command, request.latency)
+            request.future.set_result(response)
+
+    def handle_command_error(self, error: str) -> None:
+        """Fail the request answered by an error line.
+
+        Error lines belong to the request whose empty response was just received. The errors
+        of commands sent without request are only logged.
+        """
+        _LOGGER.warning("Command error: %s", error)
+        if (request := self._reply) is not None and not request.future.done():
+            request.future.set_exception(RfPlayerException(f"{request.command}: {error}"))
 
-    async def _do_send_raw_command(self, command: str) -> None:
+    def _start_reply(self, request: RfPlayerRequest) -> None:
+        self._reply = request
+        self._reply_handle = self.loop.call_later(ERROR_REPLY_DELAY, self._end_reply)
+
+    def _end_reply(self) -> None:
+        """Resolve the request whose empty response was not followed by error lines."""
+        if (request := self._reply) is None:
+            return
+        self._reply = None
+        if self._reply_handle is not None:
+            self._reply_handle.cancel()
+            self._reply_handle = None
+        if not request.future.done():
+            _LOGGER.debug("Response to %s received in %.3fs", request.command, request.latency)
+            request.future.set_result("")
+
+    def _pop_request(self) -> RfPlayerRequest | None:
+        """Remove the oldest pending request when its response is received."""
+        now = self.loop.time()
+        self._purge_requests(now)
+        if not self._pending_requests:
+            return None
+        request = self._pending_requests.popleft()
+        request.received_at = now
+        return request
+
+    def _purge_requests(self, now: float) -> None:
+        """Forget abandoned requests whose response is not expected anymore."""
+        pending = self._pending_requests
+        while pending and pending[0].abandoned and now > pending[0].deadline + LATE_RESPONSE_DELAY:
+            request = pending.popleft()
+            _LOGGER.debug("No response to %s", request.command)
+
+    def _write_command(self, command: str) -> bool:
         """Encode and put packet string onto write buffer."""
-        self.response_message = ""
-        self.command_event.clear()
         data = bytes(f"ZIA++{command}{END_OF_LINE}", "utf-8")
         _LOGGER.debug("sending raw packet: %s", repr(data))
         if self.transport:
             self.transport.write(data)
-        else:
-            _LOGGER.warning("Command not sent: not connected")
+            if (binary_frames := _binary_format_command(command)) is not None:
+                self.binary_frames = binary_frames
+            return True
+        _LOGGER.warning("Command not sent: not connected")
+        return False
 
     async def send_raw_command(self, command: str) -> None:
-        """Send a command but expect no response."""
-        async with self.command_lock:
-            await self._do_send_raw_command(command)
-            # A command has no ack packet.
-            # RfPlayer only sends an error packet if the command is invalid.
-            # We could have waited before returning to try to catch the error packet.
-            # But the required delay to make sure we always receive
-            # the errors is too long to be usable (~5s)
-
-    async def send_raw_request(self, request: str) -> str:
+        """Send a command but expect no response.
+
+        Commands are written immediately, even if requests are waiting for their response.
+        """
+        self._write_command(command)
+        # A command has no ack packet.
+        # RfPlayer only sends an error packet if the command is invalid.
+        # We could have waited before returning to try to catch the error packet.
+        # But the required delay to make sure we always receive
+        # the errors is too long to be usable (~5s)
+
+    def submit_raw_request(self, request: str, timeout: float = REQUEST_TIMEOUT) -> RfPlayerRequest:
+        """Send a request and return it without waiting for the response.
+
+        The request future gets the response or is cancelled by the caller when it stops waiting.
+        """
+        now = self.loop.time()
+        self._purge_requests(now)
+        pending = RfPlayerRequest(
+            command=request, future=self.loop.create_future(), sent_at=now, deadline=now + timeout
+        )
+        # Queue the request first as the response may be received while writing
+        self._pending_requests.append(pending)
+        if not self._write_command(request):
+            self._pending_requests.remove(pending)
+            pending.future.set_exception(RfPlayerException("Not connected"))
+        return pending
+
+    async def send_raw_request(self, request: str, timeout: float = REQUEST_TIMEOUT) -> str:
         """Send a request and wait for a response."""
-        async with self.command_lock:
-            await self._do_send_raw_command(command=request)
-            async with asyncio.timeout(60):
-                await self.command_event.wait()
-                return self.response_message[:]
+        pending = self.submit_raw_request(request, timeout)
+        return await asyncio.wait_for(pending.future, timeout)
+
+    @property
+    def pending_requests(self) -> int:
+        """Number of requests waiting for a response, including abandoned ones."""
+        return len(self._pending_requests)
 
     def connection_lost(self, exc: Exception | None) -> None:
-        """Forward to disconnect callback."""
+        """Fail pending requests, drop the received events and forward to disconnect callback."""
+        if self._drain_handle is not None:
+            self._drain_handle.cancel()
+            self._drain_handle = None
+        self.events.clear()
+        self.buffer.clear()
+        self._parse_pending = False
+        # The frame format is set again by the init commands of the next connection
+        self.binary_frames = False
+        if self._reply_handle is not None:
+            self._reply_handle.cancel()
+            self._reply_handle = None
+        if self._reply is not None:
+            self._pending_requests.appendleft(self._reply)
+            self._reply = None
+        while self._pending_requests:
+            request = self._pending_requests.popleft()
+            if not request.future.done():
+                request.future.set_exception(RfPlayerException("Connection lost"))
         self.disconnect_callback(exc)
@@ -0,0 +1,134 @@
+"""RfPlayer receive filter evaluated before received packets are decoded."""
+
+from bisect import bisect_right
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Self
+
+from .device import RfDeviceId
+
+RULES_SEPARATOR = ","
+ALL_ADDRESSES = "*"
+
+
+def _parse_range(rule: str) -> tuple[str, int, int]:
+    """Return the protocol and address bounds of a range rule, the high bound is -1 for all addresses."""
+    protocol, _, addresses = rule.partition(":")
+    protocol = protocol.strip().upper()
+    if addresses.strip() == ALL_ADDRESSES:
+        return protocol, 0, -1
+    low_address, sep, high_address = addresses.partition("-")
+    if not sep:
+        raise ValueError(f"Invalid device rule {rule}")
+    low = RfDeviceId(protocol=protocol, address=low_address.strip()).integer_address
+    high = RfDeviceId(protocol=protocol, address=high_address.strip()).integer_address
+    if high < low:
+        raise ValueError(f"Invalid device rule {rule}")
+    return protocol, low, high
+
+
+def _merge_ranges(ranges: list[tuple[int, int]]) -> tuple[list[int], list[int]]:
+    """Merge overlapping ranges into sorted lists of starts and ends."""
+    starts: list[int] = []
+    ends: list[int] = []
+    for low, high in sorted(ranges):
+        if high < 0:
+            return [0], [-1]
+        if ends and low <= ends[-1] + 1:
+            ends[-1] = max(ends[-1], high)
+        else:
+            starts.append(low)
+            ends.append(high)
+    return starts, ends
+
+
+@dataclass(frozen=True)
+class DeviceRules:
+    """Set of devices compiled from rules.
+
+    A rule is either a device id string (`PROTOCOL-ADDRESS`), an address range of a protocol
+    (`PROTOCOL:LOW-HIGH`, bounds included) or all the addresses of a protocol (`PROTOCOL:*`).
+    Addresses use any format accepted by RfDeviceId. Id strings are kept in a hash set and
+    the ranges of each protocol are merged into sorted bounds looked up by bisection.
+    """
+
+    id_strings: frozenset[str] = frozenset()
+    range_starts: dict[str, list[int]] = field(default_factory=dict)
+    range_ends: dict[str, list[int]] = field(default_factory=dict)
+
+    @classmethod
+    def compile(cls, rules: Iterable[str]) -> Self:
+        """Compile rules, raise ValueError on an invalid rule."""
+
+        id_strings: set[str] = set()
+        ranges: dict[str, list[tuple[int, int]]] = {}
+        for raw_rule in rules:
+            rule = raw_rule.strip()
+            if not rule:
+                continue
+            if ":" in rule:
+                protocol, low, high = _parse_range(rule)
+                ranges.setdefault(protocol, []).append((low, high))
+            else:
+                protocol, sep, address = rule.rpartition("-")
+                if not sep or not protocol:
+                    raise ValueError(f"Invalid device rule {rule}")
+                id_strings.add(RfDeviceId(protocol=protocol.upper(), address=address).id_string)
+
+        range_starts: dict[str, list[int]] = {}
+        range_ends: dict[str, list[int]] = {}
+        for protocol, protocol_ranges in ranges.items():
+            range_starts[protocol], range_ends[protocol] = _merge_ranges(protocol_ranges)
+        return cls(frozenset(id_strings), range_starts, range_ends)
+
+    @classmethod
+    def parse(cls, rules: str | None) -> Self:
+        """Compile a comma-separated list of rules, raise ValueError on an invalid rule."""
+
+        return cls.compile((rules or "").split(RULES_SEPARATOR))
+
+    def __bool__(self) -> bool:
+        """Return True if there is at least one rule."""
+        return bool(self.id_strings or self.range_starts)
+
+    def __contains__(self, device: RfDeviceId) -> bool:
+        """Tell if a device matches a rule."""
+        if device.id_string in self.id_strings:
+            return True
+        starts = self.range_starts.get(device.protocol)
+        if not starts:
+            return False
+        i = bisect_right(starts, device.integer_address) - 1
+        if i < 0:
+            return False
+        end = self.range_ends[device.protocol][i]
+        return end < 0 or device.integer_address <= end
+
+
+@dataclass
+class ReceiveFilter:
+    """Decide which devices received packets are decoded and dispatched.
+
+    Denied devices are always rejected. Known devices are accepted, other devices only
+    if discovery is enabled, they are allowed (when there are allow rules) and received
+    with a RF level of at least min_rf_level.
+    """
+
+    allow: DeviceRules = field(default_factory=DeviceRules)
+    deny: DeviceRules = field(default_factory=DeviceRules)
+    min_rf_level: int | None = None
+    """Minimum RF level in dBm of the packets of discovered devices."""
+    discovery: bool = True
+    known_device: Callable[[RfDeviceId], bool] | None = None
+    """Tell if a device is used, e.g. configured or with entities."""
+
+    def accepts(self, device: RfDeviceId, rf_level: int | None = None) -> bool:
+        """Tell if a packet of a device received with a RF level is decoded."""
+
+        if self.deny and device in self.deny:
+            return False
+        if self.known_device is not None and self.known_device(device):
+            return True
+        if not self.discovery or (self.allow and device not in self.allow):
+            return False
+        return self.min_rf_level is None or rf_level is None or rf_level >= self.min_rf_level
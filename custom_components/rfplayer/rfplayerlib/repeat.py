@@ -0,0 +1,85 @@
+"""RfPlayer repeated frame suppression."""
+
+import asyncio
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+import logging
+
+from .protocol import RfPlayerEventData
+
+_LOGGER = logging.getLogger(__name__)
+
+REPEATS_HEADER = "repeats"
+"""Header added to collapsed frames with the number of copies received."""
+
+
+def _rf_level(header: dict) -> int:
+    try:
+        return int(header.get("rfLevel", ""))
+    except ValueError:
+        return -1000
+
+
+@dataclass(slots=True)
+class _RepeatedFrame:
+    event_data: RfPlayerEventData
+    rf_level: int
+    count: int
+    handle: asyncio.TimerHandle | None = None
+
+
+@dataclass
+class RepeatFilter:
+    """Collapse the copies of a RF frame received within a time window into a single event.
+
+    RF devices send each message several times. Copies are identified by protocol, info type
+    and infos (which hold the device address), RF levels are ignored. The first copy opens the
+    window and, when it closes, the copy with the best RF level is sent with the number of
+    copies in its `repeats` header.
+    """
+
+    loop: asyncio.AbstractEventLoop
+    window: float
+    event_callback: Callable[[RfPlayerEventData], None]
+    _pending: dict[Hashable, _RepeatedFrame] = field(default_factory=dict)
+
+    def raw_event_callback(self, event_data: RfPlayerEventData) -> None:
+        """Hold a raw RfPlayer event until its repeat window is closed."""
+
+        frame = event_data.get("frame")
+        if not isinstance(frame, dict) or "header" not in frame:
+            self.event_callback(event_data)
+            return
+
+        header = frame["header"]
+        key = (header.get("protocolMeaning"), header.get("infoType"), repr(frame.get("infos")))
+        rf_level = _rf_level(header)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _RepeatedFrame(event_data, rf_level, 1)
+            pending.handle = self.loop.call_later(self.window, self._flush_frame, key)
+            return
+
+        pending.count += 1
+        if rf_level > pending.rf_level:
+            pending.event_data = event_data
+            pending.rf_level = rf_level
+
+    def clear(self) -> None:
+        """Drop the held events, e.g. when the connection is closed."""
+
+        for pending in self._pending.values():
+            if pending.handle:
+                pending.handle.cancel()
+        self._pending.clear()
+
+    def _flush_frame(self, key: Hashable) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        if pending.handle:
+            pending.handle.cancel()
+        if pending.count > 1:
+            _LOGGER.debug("Collapsed %d copies of %s", pending.count, key)
+        pending.event_data["frame"]["header"][REPEATS_HEADER] = str(pending.count)
+        self.event_callback(pending.event_data)
@@ -2,9 +2,9 @@
 
 import logging
 
+from custom_components.rfplayer.device_context import DeviceContext
 from custom_components.rfplayer.device_profiles import AnyRfpPlatformConfig, RfpPlatformConfig, RfpSensorConfig
 from custom_components.rfplayer.entity import RfDeviceEntity, async_setup_platform_entry
-from custom_components.rfplayer.rfplayerlib.device import RfDeviceId
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorEntityDescription, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
@@ -28,13 +28,9 @@ def _get_entity_description(
     )
 
 
-def _builder(
-    device: RfDeviceId, platform_config: list[AnyRfpPlatformConfig], event_data: RfPlayerEventData | None, verbose: bool
-) -> list[Entity]:
+def _builder(device: DeviceContext, platform_config: list[AnyRfpPlatformConfig], verbose: bool) -> list[Entity]:
     return [
-        RfPlayerSensor(
-            device, _get_entity_description(config, event_data), config, event_data=event_data, verbose=verbose
-        )
+        RfPlayerSensor(device, _get_entity_description(config, device.event_data), config, verbose=verbose)
         for config in platform_config
     ]
 
@@ -55,7 +51,7 @@ async def async_setup_entry(
     )
 
 
-class RfPlayerSensor(RfDeviceEntity, SensorEntity):
+class RfPlayerSensor(RfDeviceEntity[RfpSensorConfig], SensorEntity):
     """A representation of a RfPlayer binary sensor.
 
     Since all repeated events have meaning, these types of sensors
@@ -67,32 +63,30 @@ class RfPlayerSensor(RfDeviceEntity, SensorEntity):
 
     def __init__(
         self,
-        device: RfDeviceId,
+        device: DeviceContext,
         entity_description: SensorEntityDescription,
         platform_config: RfpPlatformConfig,
-        event_data: RfPlayerEventData | None,
         verbose: bool,
     ) -> None:
         """Initialize the RfPlayer sensor."""
-        super().__init__(device_id=device, profile_name=platform_config.name, event_data=event_data, verbose=verbose)
+        super().__init__(device, platform_config.name, verbose)
         self.entity_description = entity_description
         assert isinstance(platform_config, RfpSensorConfig)
         self._config = platform_config
-        self._event_data = event_data
 
     def _apply_event(self, event_data: RfPlayerEventData) -> bool:
         """Apply command from RfPlayer."""
         super()._apply_event(event_data)
 
-        str_value = self._config.state.get_value(event_data)
-        if not str_value:
+        value = self._config.state.get_native_value(event_data)
+        if value is None or value == "":
             _LOGGER.info("Missing sensor value")
             return False
 
         try:
-            self._attr_native_value = float(str_value)
+            self._attr_native_value = value if isinstance(value, float) else float(value)
         except ValueError:
-            _LOGGER.info("Ignoring non numeric value %s", str_value)
+            _LOGGER.info("Ignoring non numeric value %s", value)
             return False
 
         return True
@@ -3,10 +3,10 @@
 import logging
 from typing import Any
 
-from custom_components.rfplayer.const import COMMAND_GROUP_LIST, COMMAND_OFF_LIST, COMMAND_ON_LIST
+from custom_components.rfplayer.device_context import DeviceContext
 from custom_components.rfplayer.device_profiles import AnyRfpPlatformConfig, RfpPlatformConfig, RfpSwitchConfig
 from custom_components.rfplayer.entity import RfDeviceEntity, async_setup_platform_entry
-from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.config_entries import ConfigEntry
@@ -25,13 +25,9 @@ def _get_entity_description(
     return SwitchEntityDescription(key=config.name)
 
 
-def _builder(
-    device: RfDeviceId, platform_config: list[AnyRfpPlatformConfig], event_data: RfPlayerEventData | None, verbose: bool
-) -> list[Entity]:
+def _builder(device: DeviceContext, platform_config: list[AnyRfpPlatformConfig], verbose: bool) -> list[Entity]:
     return [
-        RfPlayerSwitch(
-            device, _get_entity_description(config, event_data), config, event_data=event_data, verbose=verbose
-        )
+        RfPlayerSwitch(device, _get_entity_description(config, device.event_data), config, verbose=verbose)
         for config in platform_config
     ]
 
@@ -52,21 +48,21 @@ async def async_setup_entry(
     )
 
 
-class RfPlayerSwitch(RfDeviceEntity, SwitchEntity):
+class RfPlayerSwitch(RfDeviceEntity[RfpSwitchConfig], SwitchEntity):
     """A representation of a RF switch device."""
 
     _attr_name = None
+    _group_events = True
 
     def __init__(
         self,
-        device: RfDeviceId,
+        device: DeviceContext,
         entity_description: SwitchEntityDescription,
         platform_config: RfpPlatformConfig,
-        event_data: RfPlayerEventData | None,
         verbose: bool,
     ) -> None:
         """Initialize the RfPlayer switch."""
-        super().__init__(device_id=device, profile_name=platform_config.name, event_data=event_data, verbose=verbose)
+        super().__init__(device, platform_config.name, verbose)
         self.entity_description = entity_description
         assert isinstance(platform_config, RfpSwitchConfig)
         self._config = platform_config
@@ -89,18 +85,14 @@ class RfPlayerSwitch(RfDeviceEntity, SwitchEntity):
         """Apply command from RfPlayer."""
         super()._apply_event(event_data)
 
-        status = self._config.status.get_value(event_data)
-        command = status.lower() if status else None
-        if command in COMMAND_ON_LIST:
-            self._attr_is_on = True
-        elif command in COMMAND_OFF_LIST:
-            self._attr_is_on = False
-        else:
-            _LOGGER.info("Unsupported switch command %s", command)
+        state = self._config.status.get_state(event_data)
+        if state is None:
+            _LOGGER.info("Unsupported switch command %s", self._config.status.get_value(event_data))
             return False
 
+        self._attr_is_on = state
+
         return True
 
     def _group_event(self, event: RfDeviceEvent) -> bool:
-        value = self._config.status.get_value(event.data)
-        return value.lower() in COMMAND_GROUP_LIST if value else False
+        return self._config.status.is_group_command(event.data)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Compare JSON and binary received frames: bytes on the wire and decode time.
+
+Each captured test frame is re-encoded as the binary frame the RfPlayer would
+send after FORMAT BINARY, then both forms are parsed by the protocol decoders.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_binary_frames.py [rounds]
+"""
+
+import json
+import struct
+import sys
+import timeit
+
+from frames import load_events
+
+from custom_components.rfplayer.rfplayerlib import RFPLAYER_BAUD_RATE
+from custom_components.rfplayer.rfplayerlib.binary import PROTOCOL_MEANINGS, decode_binary_frame
+from custom_components.rfplayer.rfplayerlib.protocol import JSON_DECODERS, get_json_decoder
+
+PROTOCOL_VALUES = {meaning: value for value, meaning in PROTOCOL_MEANINGS.items()}
+
+
+def _measures(infos: dict) -> dict[str, float]:
+    return {m["type"]: float(m["value"]) for m in infos.get("measures", [])}
+
+
+def _id(infos: dict) -> tuple[int, int]:
+    value = int(infos["id"])
+    return value & 0xFFFF, value >> 16
+
+
+def _sensor_words(info_type: int, measures: dict[str, float]) -> tuple[int, ...]:
+    if info_type == 4:
+        return int(measures["temperature"] * 10) & 0xFFFF, int(measures["hygrometry"])
+    if info_type == 5:
+        temperature = int(measures["temperature"] * 10) & 0xFFFF
+        return temperature, int(measures["hygrometry"]), int(measures["pressure"])
+    if info_type == 6:
+        return int(measures["wind speed"] * 10), int(measures["direction"])
+    if info_type == 8:
+        energy = int(measures["energy"])
+        return energy & 0xFFFF, energy >> 16, *(int(measures[k]) for k in ("power", "P1", "P2", "P3"))
+    total = int(measures["total rain"] * 10)
+    return total & 0xFFFF, total >> 16, int(measures["current rain"] * 100)
+
+
+def encode_infos(info_type: int, infos: dict) -> tuple[int, ...]:
+    """Build the binary infos words of a JSON frame."""
+    sub_type = int(infos["subType"])
+    if info_type in (4, 5, 6, 8, 9):
+        head = (sub_type, int(infos["id_PHY"], 16), int(infos["adr_channel"]), int(infos["qualifier"]))
+        return (*head, *_sensor_words(info_type, _measures(infos)))
+    head = (sub_type, *_id(infos), int(infos.get("qualifier", 0)))
+    if info_type == 10:
+        return (*head, int(infos["function"]), int(infos["state"]), *(int(infos[f"d{i}"]) for i in range(4)))
+    if info_type == 15:
+        return (*head, int(infos["info"]), int(infos["add0"]), int(infos["add1"]))
+    return head
+
+
+def encode_frame(event: dict) -> bytes:
+    """Build the binary frame container of a JSON frame."""
+    header = event["frame"]["header"]
+    info_type = int(header["infoType"])
+    infos = encode_infos(info_type, event["frame"]["infos"])
+    payload = struct.pack(
+        "<BBBbbBBB10H",
+        0,
+        0,
+        int(header["dataFlag"]),
+        int(header["rfLevel"]),
+        int(header["floorNoise"]),
+        int(header["rfQuality"]),
+        PROTOCOL_VALUES[header["protocolMeaning"]],
+        info_type,
+        *infos,
+        *[0] * (10 - len(infos)),
+    )
+    return b"ZI\x01" + struct.pack("<H", len(payload)) + payload
+
+
+def main():
+    """Run the benchmark."""
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    events = load_events()
+    json_packets = [f"ZIA33{json.dumps(event)}\n\r".encode() for event in events]
+    binary_packets = [encode_frame(event) for event in events]
+
+    json_size = sum(len(p) for p in json_packets)
+    binary_size = sum(len(p) for p in binary_packets)
+    print(f"{len(events)} frames")  # noqa: T201
+    print(f"bytes/frame  json: {json_size / len(events):7.1f}  binary: {binary_size / len(events):7.1f}")  # noqa: T201
+    # 10 bits per byte on the 8N1 serial link
+    print(  # noqa: T201
+        f"ms/frame at {RFPLAYER_BAUD_RATE} bauds  json: {json_size * 10e3 / RFPLAYER_BAUD_RATE / len(events):5.1f}"
+        f"  binary: {binary_size * 10e3 / RFPLAYER_BAUD_RATE / len(events):5.1f}"
+    )
+
+    json_bodies = [p[5:-2] for p in json_packets]
+    binary_payloads = [p[5:] for p in binary_packets]
+    candidates = []
+    for name in JSON_DECODERS:
+        try:
+            loads = get_json_decoder(name).loads
+        except ImportError:
+            continue
+        candidates.append((f"json/{name}", lambda loads=loads: [loads(body) for body in json_bodies]))
+    candidates.append(("binary", lambda: [decode_binary_frame(payload) for payload in binary_payloads]))
+
+    for name, decode in candidates:
+        elapsed = timeit.timeit(decode, number=rounds)
+        print(f"{name:14s}: {elapsed / rounds / len(events) * 1e6:6.2f} us/frame")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Compare per-entity value extraction with profile evaluation plans.
+
+Every captured test frame is matched to its device profile, then the values of
+all the entities of the profile are read, either each from its own plan, or
+from the evaluation plan shared by the entities of the profile. Frames of
+profiles whose entities share fields (e.g. bit fields of a Visonic detector)
+are reported separately.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_evaluation_plan.py [rounds]
+"""
+
+import sys
+import timeit
+
+from frames import load_events
+
+from custom_components.rfplayer.device_profiles import JsonValueConfig, _get_profile_registry
+
+Frames = list[tuple[dict, list[JsonValueConfig]]]
+
+
+def _read_values(frames: Frames) -> None:
+    for event, configs in frames:
+        # Fresh frame objects, as received
+        event_data = dict(event)
+        for config in configs:
+            config.get_value(event_data)
+
+
+def main():
+    """Run the benchmark."""
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    registry = _get_profile_registry(verbose=False)
+    groups: dict[str, Frames] = {"all frames": [], "shared fields": []}
+    for event in load_events():
+        profile = registry.get_profile(registry.get_profile_name_from_event(event))
+        if profile is None:
+            continue
+        configs = list(profile.platforms.value_configs())
+        groups["all frames"].append((event, configs))
+        if profile.plan.path_count < len(configs):
+            groups["shared fields"].append((event, configs))
+
+    for name, frames in groups.items():
+        values = sum(len(configs) for _, configs in frames)
+        # Standalone copies of the configurations are bound to their own plan
+        per_entity = [
+            (event, [JsonValueConfig(**config.model_dump()) for config in configs]) for event, configs in frames
+        ]
+        per_entity_time = timeit.timeit(lambda frames=per_entity: _read_values(frames), number=rounds)
+        shared_time = timeit.timeit(lambda frames=frames: _read_values(frames), number=rounds)
+        print(f"{name}: {len(frames)} frames, {values} entity values")  # noqa: T201
+        print(f"  per entity: {per_entity_time * 1e6 / rounds / len(frames):8.2f} us/frame")  # noqa: T201
+        print(f"  shared:     {shared_time * 1e6 / rounds / len(frames):8.2f} us/frame")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
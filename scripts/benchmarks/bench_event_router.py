@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Measure per-frame dispatch cost to RfPlayer entities.
+
+Compares a broadcast to every entity, where each entity checks whether the
+event applies to it, with the gateway routing table.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_event_router.py [frames]
+"""
+
+import sys
+import timeit
+
+from custom_components.rfplayer.event_router import EventRouter
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
+
+ENTITY_COUNTS = [50, 500, 5000]
+ENTITIES_PER_DEVICE = 5
+
+
+def bench(entity_count: int, frames: int) -> tuple[float, float]:
+    """Return broadcast and routing time per frame in seconds."""
+
+    devices = [RfDeviceId(protocol="OREGON", address=str(i)) for i in range(entity_count // ENTITIES_PER_DEVICE)]
+    events = [RfDeviceEvent(device=device, data={}) for device in devices]
+    router = EventRouter()
+    broadcast = []
+    for device in devices:
+        for _ in range(ENTITIES_PER_DEVICE):
+
+            def handle(event: RfDeviceEvent, device: RfDeviceId = device) -> None:
+                if event.device.id_string != device.id_string:
+                    return
+
+            router.async_register(device, handle)
+            broadcast.append(handle)
+
+    def run_broadcast():
+        for i in range(frames):
+            event = events[i % len(events)]
+            for handler in broadcast:
+                handler(event)
+
+    def run_router():
+        for i in range(frames):
+            router.async_route(events[i % len(events)])
+
+    return timeit.timeit(run_broadcast, number=1) / frames, timeit.timeit(run_router, number=1) / frames
+
+
+def main():
+    """Run the benchmark."""
+
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    for entity_count in ENTITY_COUNTS:
+        broadcast_time, router_time = bench(entity_count, frames)
+        print(  # noqa: T201
+            f"{entity_count:5d} entities: broadcast {broadcast_time * 1e6:9.2f} us/frame, "
+            f"router {router_time * 1e6:6.2f} us/frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Compare the JSON decoders available to parse ZIA33 packet bodies.
+
+The corpus is made of the captured test frames grouped by protocol. Protocols
+of DEVICE_PROTOCOLS without a captured frame get a synthetic frame built from
+a captured CHACON frame, they are flagged with a star. The json column is the
+stdlib fallback, which is what the protocol used before.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_json_decoder.py [rounds]
+"""
+
+import copy
+from itertools import groupby
+import json
+import sys
+import timeit
+
+from frames import load_events
+
+from custom_components.rfplayer.rfplayerlib import DEVICE_PROTOCOLS
+from custom_components.rfplayer.rfplayerlib.protocol import JSON_DECODERS, JsonDecoder, get_json_decoder
+
+
+def _protocol(event: dict) -> str:
+    return event["frame"]["header"]["protocolMeaning"]
+
+
+def make_corpus() -> dict[str, list[bytes]]:
+    """Return the JSON packet bodies by protocol name."""
+    events = sorted(load_events(), key=_protocol)
+    corpus = {name: [json.dumps(e).encode() for e in group] for name, group in groupby(events, key=_protocol)}
+    template = next(e for e in events if _protocol(e) == "CHACON")
+    for name in DEVICE_PROTOCOLS:
+        if name not in corpus:
+            event = copy.deepcopy(template)
+            event["frame"]["header"]["protocolMeaning"] = name
+            corpus[f"{name}*"] = [json.dumps(event).encode()]
+    return corpus
+
+
+def available_decoders() -> list[JsonDecoder]:
+    """Return the installed decoders."""
+    decoders = []
+    for name in JSON_DECODERS:
+        try:
+            decoders.append(get_json_decoder(name))
+        except ImportError:
+            print(f"{name} is not installed")  # noqa: T201
+    return decoders
+
+
+def main():
+    """Run the benchmark."""
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    corpus = make_corpus()
+    decoders = available_decoders()
+
+    candidates = [(d.name, d.loads) for d in decoders]
+    print(f"{'protocol':12s}" + "".join(f"{name:>10s}" for name, _ in candidates) + "  (us/frame)")  # noqa: T201
+    totals = dict.fromkeys([name for name, _ in candidates], 0.0)
+    frames = 0
+    for protocol, bodies in sorted(corpus.items()):
+        expected = [json.loads(body) for body in bodies]
+        row = f"{protocol:12s}"
+        for name, loads in candidates:
+            assert [loads(body) for body in bodies] == expected, name
+            elapsed = timeit.timeit(lambda loads=loads, bodies=bodies: [loads(b) for b in bodies], number=rounds)
+            totals[name] += elapsed
+            row += f"{elapsed / rounds / len(bodies) * 1e6:10.2f}"
+        frames += len(bodies) * rounds
+        print(row)  # noqa: T201
+    print(f"{'all':12s}" + "".join(f"{totals[name] / frames * 1e6:10.2f}" for name, _ in candidates))  # noqa: T201
+    print(f"default decoder: {get_json_decoder().name}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
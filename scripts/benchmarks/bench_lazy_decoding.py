@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Measure the cost of received packets of devices that are not configured.
+
+The captured frames are fed to a protocol connected to a device adapter, as
+the client does. Without filter, every packet is parsed and converted to a
+device event. With a filter rejecting every device, packets are dropped from
+the protocol, device and address read before parsing.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_lazy_decoding.py [rounds]
+"""
+
+import asyncio
+import sys
+import timeit
+from unittest.mock import Mock
+
+from frames import load_packets
+
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceEventAdapter
+from custom_components.rfplayer.rfplayerlib.protocol import RfplayerProtocol
+
+
+def make_protocol(adapter: RfDeviceEventAdapter, *, filtered: bool) -> RfplayerProtocol:
+    """Create a protocol delivering its events to the adapter."""
+    protocol = RfplayerProtocol(
+        loop=asyncio.new_event_loop(),
+        event_callback=adapter.raw_event_callback,
+        disconnect_callback=Mock(),
+        init_script=None,
+        verbose=False,
+    )
+    if filtered:
+        protocol.packet_filter = adapter.accept_packet
+    return protocol
+
+
+def main():
+    """Run the benchmark."""
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    packets = load_packets()
+    for name, filtered in (("decoded", False), ("filtered", True)):
+        events = []
+        adapter = RfDeviceEventAdapter(events.append, device_filter=lambda *_: False)
+        protocol = make_protocol(adapter, filtered=filtered)
+        elapsed = timeit.timeit(lambda protocol=protocol: [protocol.data_received(p) for p in packets], number=rounds)
+        print(f"{name:9s}: {elapsed / rounds / len(packets) * 1e6:6.2f} us/packet, {len(events)} events")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Measure the preparation of the configured devices when the six platforms are set up.
+
+A device table is built from the captured test frames, with one device per frame and
+address. Each platform used to parse the whole table: device id, stored event and
+profile of each device, and device registry info of each entity. The device contexts
+are now prepared once by the gateway and shared by the platforms.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_platform_setup.py [devices] [rounds]
+"""
+
+import json
+import sys
+import timeit
+
+from frames import load_events
+
+from custom_components.rfplayer.device_context import build_device_context
+from custom_components.rfplayer.device_profiles import UNDEFINED_PROFILE, _get_profile_registry
+from custom_components.rfplayer.helpers import (
+    build_device_id_from_device_info,
+    build_event_data_from_device_info,
+    get_identifiers_from_device_id,
+)
+from homeassistant.const import Platform
+from homeassistant.helpers.device_registry import DeviceInfo
+
+PLATFORMS = [
+    Platform.BINARY_SENSOR,
+    Platform.CLIMATE,
+    Platform.COVER,
+    Platform.LIGHT,
+    Platform.SENSOR,
+    Platform.SWITCH,
+]
+
+
+def _device_table(registry, size: int) -> dict[str, dict[str, str]]:
+    events = [event for event in load_events() if registry.get_profile_name_from_event(event) != UNDEFINED_PROFILE]
+    devices = {}
+    for index in range(size):
+        event = events[index % len(events)]
+        protocol = event["frame"]["header"]["protocolMeaning"]
+        devices[f"{protocol}-{index}"] = {
+            "protocol": protocol,
+            "address": str(index),
+            "model": "",
+            "redirect_address": "",
+            "profile_name": registry.get_profile_name_from_event(event),
+            "event_data": json.dumps(event),
+        }
+    return devices
+
+
+def _per_platform(registry, devices: dict[str, dict[str, str]]) -> int:
+    entities = 0
+    for platform in PLATFORMS:
+        for device_info in devices.values():
+            platform_configs = registry.get_platform_config(device_info["profile_name"], platform)
+            if not platform_configs:
+                continue
+            device_id = build_device_id_from_device_info(device_info)
+            build_event_data_from_device_info(device_info)
+            for _config in platform_configs:
+                DeviceInfo(
+                    identifiers=get_identifiers_from_device_id(device_id),
+                    manufacturer=device_id.protocol,
+                    model=device_id.model,
+                    name=f"{device_id.protocol} {device_id.address}",
+                )
+                entities += 1
+    return entities
+
+
+def _shared(registry, devices: dict[str, dict[str, str]]) -> int:
+    entities = 0
+    device_contexts = [build_device_context(registry, device_info) for device_info in devices.values()]
+    for platform in PLATFORMS:
+        for device in device_contexts:
+            for _config in device.get_platform_configs(platform):
+                _ = device.registry_info
+                entities += 1
+    return entities
+
+
+def main():
+    """Run the benchmark."""
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    registry = _get_profile_registry(verbose=False)
+    devices = _device_table(registry, size)
+    print(f"{len(devices)} devices, {_shared(registry, devices)} entities")  # noqa: T201
+    for name, prepare in (("per platform", _per_platform), ("shared", _shared)):
+        duration = min(timeit.repeat(lambda prepare=prepare: prepare(registry, devices), number=1, repeat=rounds))
+        print(f"  {name:12}: {duration * 1000:8.2f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Measure RfplayerProtocol line framing throughput.
+
+Captured frames are fed to the protocol in random chunk sizes, as a serial
+port or TCP socket would deliver them. Packet handling is replaced by a
+counter so that only framing is measured. The previous str based framer is
+included for comparison.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_protocol_framer.py [megabytes] [max_chunk_size]
+"""
+
+import random
+import sys
+import time
+from unittest.mock import Mock, patch
+
+from frames import load_packets
+
+from custom_components.rfplayer.rfplayerlib.protocol import _LOGGER, PACKET_HEADER_LEN, RfplayerProtocol
+
+ROUNDS = 3
+
+
+class LegacyStrFramer:
+    """Previous implementation: decode each chunk and split a str buffer."""
+
+    def __init__(self) -> None:
+        """Initialize the framer."""
+        self.buffer = ""
+        self.count = 0
+
+    def data_received(self, data: bytes) -> None:
+        """Add incoming data to buffer."""
+        self.buffer += data.decode()
+        while "\n" in self.buffer:
+            line, self.buffer = self.buffer.split("\n", 1)
+            line = line.strip("\0 \t\r")
+            if len(line) >= PACKET_HEADER_LEN:
+                _LOGGER.debug("packet received: %s", line)
+                self.count += 1
+
+
+def make_chunks(megabytes: float, max_chunk_size: int) -> tuple[list[bytes], int]:
+    """Build a random stream of chunks and return it with the number of frames."""
+    packets = load_packets()
+    rnd = random.Random(42)
+    stream = bytearray()
+    frames = 0
+    while len(stream) < megabytes * 1e6:
+        stream += rnd.choice(packets)
+        frames += 1
+    chunks = []
+    pos = 0
+    while pos < len(stream):
+        size = rnd.randint(1, max_chunk_size)
+        chunks.append(bytes(stream[pos : pos + size]))
+        pos += size
+    return chunks, frames
+
+
+def run(name: str, data_received, chunks: list[bytes], frames: int) -> None:
+    """Feed all chunks and print the best throughput of a few rounds."""
+    size = sum(len(c) for c in chunks)
+    elapsed = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for chunk in chunks:
+            data_received(chunk)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"{name:8s}: {size / elapsed / 1e6:7.2f} MB/s {frames / elapsed:10.0f} frames/s")  # noqa: T201
+
+
+def main():
+    """Run the benchmark."""
+
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    max_chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+    chunks, frames = make_chunks(megabytes, max_chunk_size)
+
+    protocol = RfplayerProtocol(
+        loop=Mock(), event_callback=Mock(), disconnect_callback=Mock(), init_script=None, verbose=False
+    )
+    count = 0
+
+    def handle_raw_packet(raw_packet: bytes) -> None:
+        nonlocal count
+        count += 1
+
+    legacy = LegacyStrFramer()
+
+    print(f"{frames} frames, chunks of 1-{max_chunk_size} bytes")  # noqa: T201
+    run("legacy", legacy.data_received, chunks, frames)
+    with patch.object(protocol, "handle_raw_packet", handle_raw_packet):
+        run("bytes", protocol.data_received, chunks, frames)
+    assert count == legacy.count == frames * ROUNDS
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Measure the recorder database growth caused by the event payload attribute.
+
+The captured test frames are replayed as the traffic of a RfPlayer gateway, with the
+RF level and floor noise of each frame changing as they do over the air. The state of
+each entity of the matched device profile is written to a SQLite database laid out
+like the recorder tables: one row per state change, and one row per distinct set of
+recorded attributes, shared by the states having the same attributes.
+
+The event payload is recorded in full (before compaction), compact, or not at all.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_recorder_size.py [rounds]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+
+from frames import load_events
+
+from custom_components.rfplayer.device_profiles import _get_profile_registry
+from homeassistant.helpers.json import json_bytes
+
+SCHEMA = """
+CREATE TABLE state_attributes (attributes_id INTEGER PRIMARY KEY, hash INTEGER, shared_attrs TEXT);
+CREATE INDEX ix_state_attributes_hash ON state_attributes (hash);
+CREATE TABLE states (state_id INTEGER PRIMARY KEY, entity_id TEXT, state TEXT, attributes_id INTEGER);
+"""
+
+
+def _traffic(rounds: int) -> list[dict]:
+    events = []
+    for round_index in range(rounds):
+        for event in load_events():
+            header = dict(event["frame"]["header"])
+            header["rfLevel"] = str(-40 - round_index % 50)
+            header["floorNoise"] = str(-100 + round_index % 7)
+            events.append({**event, "frame": {**event["frame"], "header": header}})
+    return events
+
+
+def _database_size(frames: list[tuple[dict, list]], payload: str) -> tuple[int, int, int]:
+    """Return the database size, the number of states and of distinct attributes."""
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "recorder.db")
+        connection = sqlite3.connect(path)
+        connection.executescript(SCHEMA)
+        attributes_ids: dict[bytes, int] = {}
+        states = 0
+        for event, configs in frames:
+            for config in configs:
+                attributes: dict[str, str] = {"friendly_name": config.name}
+                if payload == "full":
+                    attributes["event_data"] = json.dumps(event)
+                elif payload == "compact":
+                    attributes["event_data"] = config.get_event_payload(event)
+                shared_attrs = json_bytes(attributes)
+                if (attributes_id := attributes_ids.get(shared_attrs)) is None:
+                    cursor = connection.execute(
+                        "INSERT INTO state_attributes (hash, shared_attrs) VALUES (?, ?)",
+                        (hash(shared_attrs) & 0xFFFFFFFF, shared_attrs.decode()),
+                    )
+                    attributes_id = attributes_ids[shared_attrs] = cursor.lastrowid or 0
+                state = config.state.get_value(event) if hasattr(config, "state") else None
+                connection.execute(
+                    "INSERT INTO states (entity_id, state, attributes_id) VALUES (?, ?, ?)",
+                    (config.name, state, attributes_id),
+                )
+                states += 1
+        connection.commit()
+        connection.execute("VACUUM")
+        connection.close()
+        return os.path.getsize(path), states, len(attributes_ids)
+
+
+def main():
+    """Run the benchmark."""
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    registry = _get_profile_registry(verbose=False)
+    frames = []
+    for event in _traffic(rounds):
+        profile = registry.get_profile(registry.get_profile_name_from_event(event))
+        if profile is None:
+            continue
+        frames.append((event, list(profile.platforms.platform_configs())))
+
+    print(f"{len(frames)} frames")  # noqa: T201
+    for payload in ("full", "compact", "unrecorded"):
+        size, states, attributes = _database_size(frames, payload)
+        print(f"  {payload:10}: {size / 1024:9.1f} KiB, {states} states, {attributes} attribute rows")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Measure the profile registry load time of a cold and a warm integration startup.
+
+A cold start parses device-profiles.yaml with the pure Python or the C YAML
+loader and validates the profiles with pydantic. A warm start loads the
+compiled registry cache.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_registry_startup.py [rounds]
+"""
+
+from pathlib import Path
+import sys
+import tempfile
+import timeit
+from unittest.mock import patch
+
+import yaml
+
+from custom_components.rfplayer import device_profiles
+from custom_components.rfplayer.device_profiles import ProfileRegistry
+
+PROFILES_FILE = Path(device_profiles.__file__).parent / "device-profiles.yaml"
+
+
+def main():
+    """Run the benchmark."""
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as cache_dir:
+        ProfileRegistry.load(PROFILES_FILE, False, Path(cache_dir))
+        with patch.object(device_profiles, "_YamlLoader", yaml.SafeLoader):
+            python_time = timeit.timeit(lambda: ProfileRegistry.load(PROFILES_FILE, False), number=rounds)
+        c_time = timeit.timeit(lambda: ProfileRegistry.load(PROFILES_FILE, False), number=rounds)
+        warm_time = timeit.timeit(lambda: ProfileRegistry.load(PROFILES_FILE, False, Path(cache_dir)), number=rounds)
+
+    print(f"cold, python yaml loader: {python_time * 1e3 / rounds:8.2f} ms")  # noqa: T201
+    print(f"cold, C yaml loader:      {c_time * 1e3 / rounds:8.2f} ms")  # noqa: T201
+    print(f"warm, compiled cache:     {warm_time * 1e3 / rounds:8.2f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
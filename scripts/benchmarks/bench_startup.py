@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Measure the integration startup time when the gateway is slow to connect.
+
+The gateway is a local TCP stand-in, reached through a connection delayed like a
+slow ser2net host. The startup loads the profile registry and prepares the
+configured devices of the platforms, either after the connection as before or
+while the gateway connects in the background.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_startup.py [latency_ms] [devices]
+"""
+
+import asyncio
+import json
+from pathlib import Path
+import sys
+import time
+from unittest.mock import patch
+
+from frames import load_events
+
+from custom_components.rfplayer import device_profiles
+from custom_components.rfplayer.device_context import build_device_context
+from custom_components.rfplayer.device_profiles import UNDEFINED_PROFILE, ProfileRegistry
+from custom_components.rfplayer.rfplayerlib import RfPlayerClient
+
+PROFILES_FILE = Path(device_profiles.__file__).parent / "device-profiles.yaml"
+
+
+async def _stand_in(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    while await reader.readline():
+        pass
+    writer.close()
+
+
+def _setup(devices: int) -> int:
+    registry = ProfileRegistry.load(PROFILES_FILE, False)
+    events = [event for event in load_events() if registry.get_profile_name_from_event(event) != UNDEFINED_PROFILE]
+    device_contexts = []
+    for index in range(devices):
+        event = events[index % len(events)]
+        device_info = {
+            "protocol": event["frame"]["header"]["protocolMeaning"],
+            "address": str(index),
+            "profile_name": registry.get_profile_name_from_event(event),
+            "event_data": json.dumps(event),
+        }
+        device_contexts.append(build_device_context(registry, device_info))
+    return len(device_contexts)
+
+
+async def _startup(port: int, latency: float, devices: int, background: bool) -> tuple[float, float]:
+    """Return the time to set up the integration and to connect the gateway."""
+
+    loop = asyncio.get_running_loop()
+    create_connection = loop.create_connection
+
+    async def _slow_connection(*args, **kwargs):
+        await asyncio.sleep(latency)
+        return await create_connection(*args, **kwargs)
+
+    client = RfPlayerClient(
+        event_callback=lambda event: None,
+        disconnect_callback=lambda exc: None,
+        loop=loop,
+        port=f"tcp://127.0.0.1:{port}",
+        receiver_protocols=[],
+        init_commands=[],
+        verbose=False,
+    )
+    start = time.perf_counter()
+    connected = 0.0
+
+    async def _connect() -> None:
+        nonlocal connected
+        await client.connect()
+        connected = time.perf_counter() - start
+
+    with patch.object(loop, "create_connection", _slow_connection):
+        if background:
+            connection = asyncio.create_task(_connect())
+            await loop.run_in_executor(None, _setup, devices)
+            setup = time.perf_counter() - start
+            await connection
+        else:
+            await _connect()
+            await loop.run_in_executor(None, _setup, devices)
+            setup = time.perf_counter() - start
+    client.close()
+    return setup, connected
+
+
+async def _run(latency: float, devices: int) -> None:
+    server = await asyncio.start_server(_stand_in, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    print(f"{latency * 1000:.0f} ms connection latency, {devices} devices")  # noqa: T201
+    for name, background in (("blocking", False), ("background", True)):
+        setup, connected = await _startup(port, latency, devices, background)
+        print(f"  {name:10}: set up in {setup * 1000:8.1f} ms, connected in {connected * 1000:8.1f} ms")  # noqa: T201
+    server.close()
+    await server.wait_closed()
+
+
+def main():
+    """Run the benchmark."""
+
+    latency = int(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 2.0
+    devices = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    asyncio.run(_run(latency, devices))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Compare string round trip value conversion with typed conversions.
+
+The converted values of the shipped device-profiles.yaml are extracted from
+the captured test frames of their profile, then read as a sensor number or an on/off
+state as the entities do: either with the former string pipeline or with the
+compiled typed conversions.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_value_conversion.py [rounds]
+"""
+
+import sys
+import timeit
+
+from frames import load_events
+
+from custom_components.rfplayer.const import COMMAND_OFF_LIST, COMMAND_ON_LIST
+from custom_components.rfplayer.device_profiles import RfpSensorConfig, _get_profile_registry, command_state
+from custom_components.rfplayer.json_path import NOT_FOUND, compile_json_path
+from homeassistant.const import Platform
+
+
+def _string_convert(config, value):
+    if config.bit_mask:
+        value = str(int(value) & config.bit_mask)
+    if config.bit_offset:
+        value = str(int(value) >> config.bit_offset)
+    if config.map:
+        value = config.map.get(value, "undefined")
+    if config.factor:
+        value = str(float(value) * config.factor)
+    return value
+
+
+def _string_read(config, value, numeric):
+    value = _string_convert(config, value)
+    if numeric:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    command = value.lower()
+    return True if command in COMMAND_ON_LIST else False if command in COMMAND_OFF_LIST else None
+
+
+def _typed_read(conversion, value, numeric):
+    if conversion is not None:
+        value = conversion.convert(value)
+    if numeric:
+        try:
+            return value if isinstance(value, float) else float(value)
+        except ValueError:
+            return None
+    return command_state(value)
+
+
+def main():
+    """Run the benchmark."""
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    registry = _get_profile_registry(verbose=False)
+    events = load_events()
+    samples = []
+    for event in events:
+        profile_name = registry.get_profile_name_from_event(event)
+        for platform, numeric in ((Platform.SENSOR, True), (Platform.BINARY_SENSOR, False)):
+            for config in registry.get_platform_config(profile_name, platform) or []:
+                assert isinstance(config, RfpSensorConfig)
+                value = compile_json_path(config.state.value_path).find(event)
+                if value is not NOT_FOUND:
+                    samples.append((config.state, config.state.compile_conversion(), value, numeric))
+
+    def string_pipeline():
+        for config, _, value, numeric in samples:
+            _string_read(config, value, numeric)
+
+    def typed_pipeline():
+        for _, conversion, value, numeric in samples:
+            _typed_read(conversion, value, numeric)
+
+    string_time = timeit.timeit(string_pipeline, number=rounds)
+    typed_time = timeit.timeit(typed_pipeline, number=rounds)
+    print(f"{len(samples)} converted values x {rounds} rounds")  # noqa: T201
+    print(f"string round trips: {string_time * 1e9 / rounds / len(samples):8.1f} ns/value")  # noqa: T201
+    print(f"typed conversions:  {typed_time * 1e9 / rounds / len(samples):8.1f} ns/value")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
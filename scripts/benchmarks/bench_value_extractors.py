@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Compare per-event jsonpath_ng parsing with precompiled value extractors.
+
+Every value_path/unit_path of the shipped device-profiles.yaml is evaluated
+against every captured test frame.
+
+Usage: PYTHONPATH=. python scripts/benchmarks/bench_value_extractors.py [rounds]
+"""
+
+import sys
+import timeit
+
+from frames import load_events
+from jsonpath_ng.ext import parse
+
+from custom_components.rfplayer.device_profiles import _get_profile_registry
+from custom_components.rfplayer.json_path import compile_json_path
+
+
+def main():
+    """Run the benchmark."""
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    paths = sorted(_get_profile_registry(verbose=False).get_json_paths())
+    events = load_events()
+    extractors = [compile_json_path(path) for path in paths]
+
+    def legacy():
+        for event in events:
+            for path in paths:
+                parse(path).find(event)
+
+    def compiled():
+        for event in events:
+            for extractor in extractors:
+                extractor.find(event)
+
+    lookups = len(events) * len(paths) * rounds
+    legacy_time = timeit.timeit(legacy, number=rounds)
+    compiled_time = timeit.timeit(compiled, number=rounds)
+
+    print(f"{len(paths)} paths x {len(events)} frames x {rounds} rounds = {lookups} lookups")  # noqa: T201
+    print(f"jsonpath_ng parse+find: {legacy_time * 1e6 / lookups:8.2f} us/lookup")  # noqa: T201
+    print(f"compiled extractor:     {compiled_time * 1e6 / lookups:8.2f} us/lookup")  # noqa: T201
+    print(f"speedup:                {legacy_time / compiled_time:8.1f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""Captured RfPlayer frames shared by the benchmarks."""
+
+import json
+from pathlib import Path
+
+FRAMES_PATH = Path(__file__).parents[2] / "tests" / "rfplayer" / "device_profiles" / "frames"
+
+
+def load_events() -> list[dict]:
+    """Load the JSON events of all captured test frames."""
+    events = []
+    for filename in sorted(FRAMES_PATH.glob("*.json")):
+        with open(filename, encoding="utf-8") as f:
+            events.extend(item["given"]["event"] for item in json.load(f))
+    return events
+
+
+def load_packets() -> list[bytes]:
+    """Load the captured test frames as ZIA33 JSON packets sent by the dongle."""
+    return [f"ZIA33{json.dumps(event)}\n\r".encode() for event in load_events()]
@@ -8,7 +8,7 @@ from typing import cast
 from unittest.mock import Mock
 
 import pytest
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
 from pytest_mock import MockerFixture
 
 from custom_components.rfplayer.const import (
@@ -17,7 +17,9 @@ from custom_components.rfplayer.const import (
     CONF_RECEIVER_PROTOCOLS,
     CONF_RECONNECT_INTERVAL,
     CONF_REDIRECT_ADDRESS,
+    CONF_REPEAT_WINDOW,
     CONF_VERBOSE_MODE,
+    DISCOVERY_BATCH_DELAY,
     INIT_COMMANDS_EMPTY,
 )
 from custom_components.rfplayer.rfplayerlib import RfPlayerClient, RfplayerProtocol
@@ -25,6 +27,7 @@ from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_DEVICE, CONF_DEVICES
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 
 @pytest.fixture(autouse=True)
@@ -85,12 +88,14 @@ def test_client(serial_connection_mock: Mock, test_protocol: RfplayerProtocol) -
     )
 
 
-def create_rfplayer_test_cfg(
+def create_rfplayer_test_cfg(  # noqa: PLR0913
     device: str = "/dev/tty123",
     automatic_add: bool = False,
     protocols: list[str] | None = None,
     init_commands: str | None = INIT_COMMANDS_EMPTY,
     devices: dict[str, dict] | None = None,
+    *,
+    repeat_window: int = 0,
 ):
     """Create rfplayer config entry data."""
     return {
@@ -102,6 +107,7 @@ def create_rfplayer_test_cfg(
         CONF_RECONNECT_INTERVAL: 10,
         CONF_DEVICES: devices or {},
         CONF_REDIRECT_ADDRESS: {},
+        CONF_REPEAT_WINDOW: repeat_window,
     }
 
 
@@ -114,10 +120,16 @@ async def setup_rfplayer_test_cfg(  # noqa: PLR0913
     protocols: list[str] | None = None,
     init_commands: str | None = INIT_COMMANDS_EMPTY,
     minor_version=2,
+    repeat_window: int = 0,
 ) -> ConfigEntry:
     """Construct a rfplayer config entry."""
     entry_data = create_rfplayer_test_cfg(
-        device=device, automatic_add=automatic_add, devices=devices, protocols=protocols, init_commands=init_commands
+        device=device,
+        automatic_add=automatic_add,
+        devices=devices,
+        protocols=protocols,
+        init_commands=init_commands,
+        repeat_window=repeat_window,
     )
     mock_entry = MockConfigEntry(
         domain="rfplayer", unique_id="a_player", data=entry_data, version=1, minor_version=minor_version
@@ -130,3 +142,10 @@ async def setup_rfplayer_test_cfg(  # noqa: PLR0913
     await hass.async_start()
     await hass.async_block_till_done()
     return mock_entry
+
+
+async def async_add_discovered_entities(hass: HomeAssistant) -> None:
+    """Wait for the entities of the discovered devices to be added."""
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + DISCOVERY_BATCH_DELAY)
+    await hass.async_block_till_done()
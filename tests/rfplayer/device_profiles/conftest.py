@@ -68,6 +68,15 @@ def _load_expectations(platform: Platform) -> list[tuple[str, FrameExpectation]]
     return result
 
 
+def load_all_events() -> list[dict]:
+    """Load the events of all frame files."""
+    result = []
+    for filename in FRAMES_PATH.glob("*.json"):
+        with open(filename, encoding="utf-8") as f:
+            result.extend(item["given"]["event"] for item in json.load(f))
+    return result
+
+
 def pytest_generate_tests(metafunc):
     if "profile" in metafunc.fixturenames:
         if "binary_sensor_expectation" in metafunc.fixturenames:
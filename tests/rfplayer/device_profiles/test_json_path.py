@@ -0,0 +1,84 @@
+from jsonpath_ng.ext import parse
+import pytest
+
+from custom_components.rfplayer.json_path import (
+    NOT_FOUND,
+    _FilterPathExtractor,
+    _JsonPathExtractor,
+    _KeyPathExtractor,
+    compile_json_path,
+    project,
+)
+from tests.rfplayer.constants import OREGON_EVENT_DATA
+from tests.rfplayer.device_profiles.conftest import load_all_events
+from tests.rfplayer.device_profiles.test_profile_registry import REGISTRY
+
+
+def _jsonpath_ng_value(path: str, event: dict):
+    all_match = parse(path).find(event)
+    return all_match[0].value if all_match else NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    ("path", "expected_type"),
+    [
+        ("$.frame.infos.qualifier", _KeyPathExtractor),
+        ("$.frame.infos.measures[?(@.type=='total rain')].value", _FilterPathExtractor),
+        ("$.frame.infos.measures[0].value", _JsonPathExtractor),
+        ("$..value", _JsonPathExtractor),
+    ],
+)
+def test_compile_json_path(path: str, expected_type: type):
+    assert isinstance(compile_json_path(path), expected_type)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "$.frame.header.rfLevel",
+        "$.frame.infos.missing",
+        "$.frame.infos.measures.value",
+        "$.frame.infos.measures[?(@.type=='total rain')].value",
+        "$.frame.infos.measures[?(@.type=='current rain')].unit",
+        "$.frame.infos.measures[?(@.type=='wind speed')].value",
+        "$.frame.infos.measures[?(@.type=='total rain')].missing",
+        "$.frame.infos.qualifier[?(@.type=='total rain')].value",
+    ],
+)
+def test_extractor_matches_jsonpath_ng(path: str):
+    assert compile_json_path(path).find(OREGON_EVENT_DATA) == _jsonpath_ng_value(path, OREGON_EVENT_DATA)
+
+
+def test_registry_paths_match_jsonpath_ng():
+    """All paths of the shipped profiles give the same result as jsonpath_ng on all test frames."""
+
+    paths = REGISTRY.get_json_paths()
+    assert paths
+
+    for event in load_all_events():
+        for path in paths:
+            assert compile_json_path(path).find(event) == _jsonpath_ng_value(path, event), path
+
+
+def test_project():
+    event = {"frame": {"infos": {"id": "1", "measures": [{"type": "a", "value": 1}, {"type": "b", "value": 2}]}}}
+    extractors = [
+        compile_json_path("$.frame.infos.id"),
+        compile_json_path("$.frame.infos.measures[?(@.type=='b')].value"),
+    ]
+    assert project(event, extractors) == {"frame": {"infos": {"id": "1", "measures": [{"type": "b", "value": 2}]}}}
+    # Missing fields are not added
+    assert project(event, [compile_json_path("$.frame.header.rfLevel")]) == {}
+    # Whole event when the read fields are unknown
+    assert project(event, [*extractors, compile_json_path("$..value")]) is event
+
+
+def test_registry_paths_projection():
+    """All paths of the shipped profiles read the same values from the projected test frames."""
+
+    extractors = [compile_json_path(path) for path in REGISTRY.get_json_paths()]
+
+    for event in load_all_events():
+        projected_event = project(event, extractors)
+        for extractor in extractors:
+            assert extractor.find(projected_event) == extractor.find(event), extractor.path
@@ -1,15 +1,28 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from custom_components.rfplayer import device_profiles
 from custom_components.rfplayer.device_profiles import (
     AnyRfpPlatformConfig,
     ClimateEventTypes,
+    EvaluationPlan,
+    JsonValueConfig,
+    ProfileRegistry,
     RfpClimateConfig,
     RfpCoverConfig,
     RfpLightConfig,
     RfpSensorConfig,
     RfpSwitchConfig,
     _get_profile_registry,
+    command_state,
 )
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
 from homeassistant.const import Platform
+from tests.rfplayer.constants import OREGON_EVENT_DATA
 from tests.rfplayer.device_profiles.conftest import AnyTest, ClimateTest, FrameExpectation, SensorTest, StateTest
 
 
@@ -20,7 +33,15 @@ def _get_config(all_config: list[AnyRfpPlatformConfig], name: str) -> AnyRfpPlat
     return named_config
 
 
+def _sensor_configs(registry: ProfileRegistry, profile_name: str, platform: Platform) -> list[RfpSensorConfig]:
+    all_config = registry.get_platform_config(profile_name, platform)
+    configs = [config for config in all_config if isinstance(config, RfpSensorConfig)]
+    assert len(configs) == len(all_config)
+    return configs
+
+
 REGISTRY = _get_profile_registry(verbose=True)
+PROFILES_FILE = Path(device_profiles.__file__).parent / "device-profiles.yaml"
 
 
 def _get_platform_tests(
@@ -143,3 +164,221 @@ def test_is_valid_protocol():
 
     assert REGISTRY.is_valid_protocol("X10|CHACON|KD101|BLYSS|FS20 On/Off", "OREGON") is False
     assert REGISTRY.is_valid_protocol("X10|CHACON|KD101|BLYSS|FS20 On/Off", "CHACON") is True
+
+
+def _event(protocol: str, info_type: str, **infos: Any) -> RfPlayerEventData:
+    return RfPlayerEventData(
+        {"frame": {"header": {"protocolMeaning": protocol, "infoType": info_type}, "infos": infos}}
+    )
+
+
+def test_profile_name_from_event():
+    # First profile in file order wins
+    assert REGISTRY.get_profile_name_from_event(_event("CHACON", "1")) == "X10|CHACON|KD101|BLYSS|FS20 On/Off"
+    assert REGISTRY.get_profile_name_from_event(_event("X10", "1")) == "X10|CHACON|KD101|BLYSS|FS20 Motion detector"
+    # Sub type
+    assert REGISTRY.get_profile_name_from_event(_event("RTS", "3", subType="1")) == "RTS Portal"
+    assert REGISTRY.get_profile_name_from_event(_event("RTS", "3", subType="2")) == "undefined"
+    # Physical id
+    assert REGISTRY.get_profile_name_from_event(_event("OREGON", "4", id_PHY="0xFA28")) == (
+        "Oregon Temperature/Humidity Sensor"
+    )
+    assert REGISTRY.get_profile_name_from_event(_event("OREGON", "4", id_PHY="0x1234")) == "undefined"
+    # Unknown protocol
+    assert REGISTRY.get_profile_name_from_event(_event("OTHER", "1")) == "undefined"
+
+
+def test_evaluation_plan():
+    configs = _sensor_configs(REGISTRY, "Visonic Sensor/Detector", Platform.BINARY_SENSOR)
+    profile = REGISTRY.get_profile("Visonic Sensor/Detector")
+    assert profile
+    plan = profile.plan
+    # qualifier and rfLevel, one slot per distinct bit field
+    assert plan.path_count == 2
+    assert plan.slot_count == 5
+
+    event = _event("VISONIC", "2", subType="0", qualifier="10")
+    assert [config.state.get_value(event) for config in configs] == ["0", "1", "0", "1"]
+    # A new frame is evaluated again
+    event = _event("VISONIC", "2", subType="0", qualifier="5")
+    assert [config.state.get_value(event) for config in configs] == ["1", "0", "1", "0"]
+
+
+def test_event_payload():
+    profile_name = REGISTRY.get_profile_name_from_event(OREGON_EVENT_DATA)
+    configs = _sensor_configs(REGISTRY, profile_name, Platform.SENSOR)
+    configs += _sensor_configs(REGISTRY, profile_name, Platform.BINARY_SENSOR)
+    # Serialized once per frame for all the entities of the device
+    payload = configs[0].get_event_payload(OREGON_EVENT_DATA)
+    assert all(config.get_event_payload(OREGON_EVENT_DATA) is payload for config in configs)
+
+    # Trimmed to the fields read by the profile or used to match it
+    trimmed_event = json.loads(payload)
+    assert "qualifier" not in trimmed_event["frame"]["infos"]
+    assert len(payload) < len(json.dumps(OREGON_EVENT_DATA))
+    assert REGISTRY.get_profile_name_from_event(trimmed_event) == profile_name
+    for config in configs:
+        assert config.state.get_value(trimmed_event) == config.state.get_value(OREGON_EVENT_DATA)
+
+    # Not bound to a profile
+    config = RfpSensorConfig(name="test", state=JsonValueConfig(value_path="$.frame.infos.qualifier"))
+    assert config.get_event_payload(OREGON_EVENT_DATA) == json.dumps(OREGON_EVENT_DATA)
+
+
+def test_evaluation_plan_shared_slots():
+    plan = EvaluationPlan()
+    alarm = JsonValueConfig(value_path="$.frame.infos.qualifier", bit_mask=2, bit_offset=1)
+    same_alarm = JsonValueConfig(value_path="$.frame.infos.qualifier", bit_mask=2, bit_offset=1)
+    raw = JsonValueConfig(value_path="$.frame.infos.qualifier", unit_path="$.frame.infos.unit")
+    for config in (alarm, same_alarm, raw):
+        config.bind(plan)
+    assert plan.path_count == 2
+    assert plan.slot_count == 3
+
+    event = _event("VISONIC", "2", qualifier="x")
+    assert raw.get_value(event) == "x"
+    assert raw.get_unit(event) is None
+    with pytest.raises(ValueError, match="invalid literal"):
+        alarm.get_value(event)
+
+
+def test_native_value_conversion():
+    event = _event("VISONIC", "2", qualifier="13", power="2.5")
+    bits = JsonValueConfig(value_path="$.frame.infos.qualifier", bit_mask=12, bit_offset=2)
+    assert bits.get_native_value(event) == 3
+    assert bits.get_value(event) == "3"
+    mapped = JsonValueConfig(
+        value_path="$.frame.infos.qualifier", bit_mask=12, bit_offset=2, map={"03": "x", "3": "on"}
+    )
+    assert mapped.get_native_value(event) == "on"
+    assert mapped.get_state(event) is True
+    scaled = JsonValueConfig(value_path="$.frame.infos.power", factor=1000)
+    assert scaled.get_native_value(event) == 2500.0
+    assert scaled.get_value(event) == "2500.0"
+    assert JsonValueConfig(value_path="$.frame.infos.power", map={"1": "on"}).get_value(event) == "undefined"
+    assert JsonValueConfig(value_path="$.frame.infos.missing").get_native_value(event) is None
+
+    # Values without conversion keep their JSON type
+    event = _event("VISONIC", "2", rfLevel=-71, lowBatt=True)
+    assert JsonValueConfig(value_path="$.frame.infos.rfLevel").get_value(event) == -71
+    assert JsonValueConfig(value_path="$.frame.infos.lowBatt").get_value(event) is True
+    assert JsonValueConfig(value_path="$.frame.infos.rfLevel", factor=2).get_value(event) == "-142.0"
+
+
+def test_command_state():
+    assert command_state("ON") is True
+    assert command_state("all_on") is True
+    assert command_state("Off") is False
+    assert command_state(1) is True
+    assert command_state(0) is False
+    assert command_state(2) is None
+    assert command_state(1.0) is None
+    assert command_state("dim") is None
+    assert command_state(None) is None
+
+
+def test_registry_cache(tmp_path: Path, mocker: MockerFixture):
+    profiles_file = tmp_path / "device-profiles.yaml"
+    profiles_file.write_text(PROFILES_FILE.read_text(encoding="utf-8"), encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    (cache_dir / "device-profiles.stale.pickle").parent.mkdir()
+    (cache_dir / "device-profiles.stale.pickle").write_bytes(b"")
+
+    registry = ProfileRegistry.load(profiles_file, False, cache_dir)
+    cache_files = list(cache_dir.glob("*.pickle"))
+    assert len(cache_files) == 1
+
+    # Warm load without yaml nor pydantic validation
+    yaml_load = mocker.patch("custom_components.rfplayer.device_profiles.yaml.load", side_effect=AssertionError)
+    cached = ProfileRegistry.load(profiles_file, True, cache_dir)
+    assert yaml_load.call_count == 0
+    assert cached.verbose is True
+    assert cached.get_profile_names() == registry.get_profile_names()
+    event = _event("VISONIC", "2", subType="0", qualifier="10")
+    assert cached.get_profile_name_from_event(event) == "Visonic Sensor/Detector"
+    configs = _sensor_configs(cached, "Visonic Sensor/Detector", Platform.BINARY_SENSOR)
+    assert [config.state.get_value(event) for config in configs] == ["0", "1", "0", "1"]
+
+    # Invalid cache is rebuilt
+    mocker.stopall()
+    cache_files[0].write_bytes(b"invalid")
+    assert ProfileRegistry.load(profiles_file, False, cache_dir).get_profile_names() == registry.get_profile_names()
+    assert cache_files[0].read_bytes() != b"invalid"
+
+    # Profile changes use another cache file
+    profiles_file.write_text(profiles_file.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    ProfileRegistry.load(profiles_file, False, cache_dir)
+    assert list(cache_dir.glob("*.pickle")) != cache_files
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+
+OVERLAY_PROFILES = """
+- name: X10|CHACON|KD101|BLYSS|FS20 Motion detector
+  match:
+    protocol: "X10|CHACON"
+    info_type: "1"
+  platforms:
+    binary_sensor:
+      - name: "Motion"
+        device_class: motion
+        state:
+          value_path: "$.frame.infos.qualifier"
+- name: Custom Chacon Switch
+  match:
+    protocol: "CHACON"
+    info_type: "1"
+  platforms:
+    switch:
+      - name: "Switch"
+        status:
+          value_path: "$.frame.infos.subTypeMeaning"
+        cmd_turn_on: "ON CHACON ID {address}"
+        cmd_turn_off: "OFF CHACON ID {address}"
+"""
+
+
+def test_profile_overlays():
+    registry = ProfileRegistry(PROFILES_FILE, False)
+    profile_names = registry.get_profile_names()
+
+    changed = registry.register_profiles(OVERLAY_PROFILES, "custom.yaml")
+    assert changed == {"X10|CHACON|KD101|BLYSS|FS20 Motion detector", "Custom Chacon Switch"}
+    # Overlay profiles are matched first, the bundled profile is replaced
+    assert registry.get_profile_name_from_event(_event("CHACON", "1")) == "X10|CHACON|KD101|BLYSS|FS20 Motion detector"
+    assert registry.get_profile_name_from_event(_event("BLYSS", "1")) == "X10|CHACON|KD101|BLYSS|FS20 On/Off"
+    assert registry.get_profile_name_from_event(_event("RTS", "3", subType="1")) == "RTS Portal"
+    configs = _sensor_configs(registry, "X10|CHACON|KD101|BLYSS|FS20 Motion detector", Platform.BINARY_SENSOR)
+    assert configs[0].state.get_value(_event("CHACON", "1", qualifier="1")) == "1"
+    assert not registry.get_platform_config("X10|CHACON|KD101|BLYSS|FS20 Motion detector", Platform.SENSOR)
+
+    # Unchanged overlay
+    assert registry.register_profiles(OVERLAY_PROFILES, "custom.yaml") == set()
+
+    # Removed overlay restores the bundled profile
+    changed = registry.register_profiles("", "custom.yaml")
+    assert changed == {"X10|CHACON|KD101|BLYSS|FS20 Motion detector", "Custom Chacon Switch"}
+    assert registry.get_profile_names() == profile_names
+    assert registry.get_profile_name_from_event(_event("CHACON", "1")) == "X10|CHACON|KD101|BLYSS|FS20 On/Off"
+
+
+def test_scan_overlays(tmp_path: Path):
+    registry = ProfileRegistry(PROFILES_FILE, False)
+    overlay = tmp_path / "custom.yaml"
+    invalid = tmp_path / "invalid.yaml"
+    (tmp_path / "readme.txt").write_text("not a profile", encoding="utf-8")
+    overlay.write_text(OVERLAY_PROFILES, encoding="utf-8")
+    invalid.write_text("- name: Invalid\n", encoding="utf-8")
+
+    changes = registry.scan_overlays(tmp_path)
+    assert changes == {"custom.yaml": OVERLAY_PROFILES, "invalid.yaml": "- name: Invalid\n"}
+    # Invalid overlay files are ignored
+    assert registry.apply_overlays(changes) == {"X10|CHACON|KD101|BLYSS|FS20 Motion detector", "Custom Chacon Switch"}
+    assert "Invalid" not in registry.get_profile_names()
+
+    # Unchanged files are not read again
+    assert registry.scan_overlays(tmp_path) == {}
+
+    overlay.unlink()
+    changes = registry.scan_overlays(tmp_path)
+    assert changes == {"custom.yaml": None}
+    assert registry.apply_overlays(changes) == {"X10|CHACON|KD101|BLYSS|FS20 Motion detector", "Custom Chacon Switch"}
@@ -0,0 +1,138 @@
+"""Unit tests for rfplayer binary frames."""
+
+import asyncio
+import struct
+from typing import cast
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from custom_components.rfplayer.device_publishers import EdisioHandler
+from custom_components.rfplayer.rfplayerlib.binary import decode_binary_frame
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceEventAdapter
+from custom_components.rfplayer.rfplayerlib.protocol import RfplayerProtocol
+from tests.rfplayer.constants import BLYSS_OFF_EVENT_DATA, OREGON_EVENT_DATA
+
+
+def _frame(protocol: int, info_type: int, *infos: int) -> bytes:
+    return struct.pack("<BBBbbBBB10H", 0, 0, 0, -71, -98, 5, protocol, info_type, *infos, *[0] * (10 - len(infos)))
+
+
+def _container(payload: bytes) -> bytes:
+    return b"ZI\x01" + struct.pack("<H", len(payload)) + payload
+
+
+OREGON_RAIN_FRAME = _frame(5, 9, 0, 0x2A19, 39168, 48, 10401, 0, 0)
+
+
+def test_decode_oregon():
+    event_data = decode_binary_frame(OREGON_RAIN_FRAME)
+
+    assert event_data
+    header = {k: v for k, v in OREGON_EVENT_DATA["frame"]["header"].items() if k != "frequency"}
+    assert event_data["frame"]["header"] == {**header, "cluster": "0"}
+    assert event_data["frame"]["infos"] == OREGON_EVENT_DATA["frame"]["infos"]
+
+
+def test_decode_id():
+    event_data = decode_binary_frame(_frame(3, 1, 0, 4261483730 & 0xFFFF, 4261483730 >> 16))
+
+    assert event_data
+    assert event_data["frame"]["infos"] == BLYSS_OFF_EVENT_DATA["frame"]["infos"]
+
+
+@pytest.mark.parametrize(
+    ("info_type", "infos", "expected"),
+    [
+        (4, (0, 0x1A2D, 32260, 33, (-15) & 0xFFFF, 58), {"temperature": "-1.5", "hygrometry": "58"}),
+        (6, (0, 0x1A89, 40192, 48, 4, 225), {"wind speed": "0.4", "direction": "225"}),
+        (8, (0, 3, 784, 6, 45150, 0, 346, 345, 2, 3), {"energy": "45150", "power": "346", "P3": "3"}),
+    ],
+)
+def test_decode_measures(info_type: int, infos: tuple[int, ...], expected: dict[str, str]):
+    event_data = decode_binary_frame(_frame(5, info_type, *infos))
+
+    assert event_data
+    measures = {m["type"]: m["value"] for m in event_data["frame"]["infos"]["measures"]}
+    assert measures.items() >= expected.items()
+
+
+def test_decode_edisio():
+    event_data = decode_binary_frame(_frame(16, 15, 25, 0x61F0, 0xB41A, 2, 0x2308, 2212, 0))
+
+    assert event_data
+    callback = Mock()
+    RfDeviceEventAdapter(callback).raw_event_callback(event_data)
+    event = callback.call_args[0][0]
+    assert event.device.address == "3021627888"
+    handler = EdisioHandler()
+    assert handler.match(event)
+    assert handler.get_event_data(event)["battery"] == "3.5V"
+
+
+def test_decode_unsupported():
+    assert decode_binary_frame(b"\x01" + OREGON_RAIN_FRAME[1:]) is None
+    assert decode_binary_frame(OREGON_RAIN_FRAME[:-1]) is None
+
+
+@pytest.mark.asyncio
+async def test_received_binary(test_protocol: RfplayerProtocol):
+    # A length byte is an end of line
+    frame = _container(_frame(5, 9, 0, 0x2A19, 39168, 48, 10, 0, 0))
+    assert b"\n" in frame
+    await test_protocol.send_raw_command("FORMAT BINARY")
+    payload = b"ZIA--Welcome\n\r" + frame + b"\r" + frame
+
+    for i in range(0, len(payload), 7):
+        test_protocol.data_received(payload[i : i + 7])
+
+    cb = cast(Mock, test_protocol.event_callback)
+    assert cb.call_count == 2
+    assert cb.call_args.args[0]["frame"]["infos"]["measures"][0]["value"] == "1.0"
+    assert not test_protocol.buffer
+
+
+@pytest.mark.asyncio
+async def test_received_binary_burst(test_protocol: RfplayerProtocol):
+    await test_protocol.send_raw_command("FORMAT BINARY")
+    test_protocol.events.maxlen = 2
+    frames = [_container(_frame(5, 9, 0, 0x2A19, 39168, 48, n, 0, 0)) for n in range(5)]
+
+    test_protocol.data_received(b"".join(frames))
+
+    # The frames received while the queue is full are parsed when it is drained
+    assert not test_protocol.events.dropped
+    while test_protocol.events:
+        await asyncio.sleep(0)
+    cb = cast(Mock, test_protocol.event_callback)
+    values = [call.args[0]["frame"]["infos"]["measures"][0]["value"] for call in cb.call_args_list]
+    assert values == ["0.0", "0.1", "0.2", "0.3", "0.4"]
+    assert not test_protocol.buffer
+
+
+@pytest.mark.asyncio
+async def test_received_binary_text_line(test_protocol: RfplayerProtocol, mocker: MockerFixture):
+    await test_protocol.send_raw_command("FORMAT BINARY")
+    handle_response = mocker.patch.object(test_protocol, "handle_response")
+
+    # A header is only looked for at the start of a line
+    test_protocol.data_received(b"ZIA--Firmware ZI0? V1.2\n\r" + _container(OREGON_RAIN_FRAME))
+
+    handle_response.assert_called_once_with("Firmware ZI0? V1.2")
+    cb = cast(Mock, test_protocol.event_callback)
+    assert cb.call_count == 1
+    assert not test_protocol.buffer
+
+
+@pytest.mark.asyncio
+async def test_binary_format_reset(test_protocol: RfplayerProtocol):
+    await test_protocol.send_raw_command("FORMAT BINARY")
+    assert test_protocol.binary_frames
+    await test_protocol.send_raw_command("FORMAT JSON")
+    assert not test_protocol.binary_frames
+
+    # Set again by the init commands after a reconnection
+    await test_protocol.send_raw_command("FORMAT BIN")
+    test_protocol.connection_lost(None)
+    assert not test_protocol.binary_frames
@@ -1,5 +1,6 @@
 """Unit tests for rfplayer client."""
 
+import copy
 from typing import cast
 from unittest.mock import ANY, Mock
 
@@ -96,6 +97,46 @@ async def test_receiver_protocols(
     assert protocol.init_script == ["FORMAT JSON", "RECEIVER -* +X2D +RTS", "PING", "HELLO"]
 
 
+@pytest.mark.asyncio
+async def test_binary_format(
+    test_client: RfPlayerClient,
+    serial_connection_mock: Mock,
+):
+    test_client.binary_format = True
+
+    await test_client.connect()
+
+    protocol_factory = serial_connection_mock.call_args[0][1]
+    protocol = protocol_factory()
+    assert protocol.init_script == ["FORMAT JSON", "FORMAT BINARY", "RECEIVER -* +X2D +RTS", "PING", "HELLO"]
+
+
+@pytest.mark.asyncio
+async def test_repeat_window(
+    test_client: RfPlayerClient,
+    serial_connection_mock: Mock,
+):
+    test_client.repeat_window = 0.25
+
+    await test_client.connect()
+
+    protocol = serial_connection_mock.call_args[0][1]()
+    protocol.event_callback(copy.deepcopy(OREGON_EVENT_DATA))
+    protocol.event_callback(copy.deepcopy(OREGON_EVENT_DATA))
+    event_callback = cast(Mock, test_client.event_callback)
+    event_callback.assert_not_called()
+    # Window closed
+    _, flush_frame, key = cast(Mock, test_client.loop.call_later).call_args.args
+    flush_frame(key)
+    event = cast(RfDeviceEvent, event_callback.call_args.args[0])
+    assert event.data["frame"]["header"]["repeats"] == "2"
+
+    # Held frames are dropped when the connection is closed
+    protocol.event_callback(copy.deepcopy(OREGON_EVENT_DATA))
+    test_client.close()
+    assert event_callback.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_send_command_connected(test_client: RfPlayerClient, test_protocol: RfplayerProtocol):
     # GIVEN
@@ -136,6 +177,20 @@ async def test_send_request_connected(test_client: RfPlayerClient, test_protocol
     tr.write.assert_called_once_with(b"ZIA++HELLO\n\r")
 
 
+@pytest.mark.asyncio
+async def test_submit_request(test_client: RfPlayerClient, test_protocol: RfplayerProtocol):
+    await test_client.connect()
+
+    request = test_client.submit_raw_request("HELLO")
+    test_protocol.data_received(b"ZIA--Welcome\n\r")
+
+    assert await request.future == "Welcome"
+    assert request.latency is not None
+    test_client.close()
+    with pytest.raises(RfPlayerException):
+        test_client.submit_raw_request("HELLO")
+
+
 @pytest.mark.asyncio
 async def test_send_request_disconnected(test_client: RfPlayerClient):
     # GIVEN
@@ -1,7 +1,12 @@
+import copy
+import pickle
 from typing import cast
 from unittest.mock import Mock
 
-from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceEventAdapter, RfDeviceId
+import pytest
+
+from custom_components.rfplayer.rfplayerlib.device import FrameHeader, RfDeviceEvent, RfDeviceEventAdapter, RfDeviceId
+from custom_components.rfplayer.rfplayerlib.protocol import PacketSummary
 from tests.rfplayer.constants import BLYSS_ADDRESS, BLYSS_OFF_EVENT_DATA, OREGON_ADDRESS, OREGON_EVENT_DATA
 
 
@@ -13,6 +18,7 @@ def test_raw_event_callback_oregon():
     event = cast(RfDeviceEvent, mock_callback.call_args[0][0])
     assert event.device == RfDeviceId(protocol="OREGON", address=OREGON_ADDRESS, model="PCR800")
     assert event.data == OREGON_EVENT_DATA
+    assert event.header == FrameHeader("OREGON", "9", "0", "0x2A19", -71, -98, 433920)
 
 
 def test_raw_event_callback_blyss():
@@ -25,6 +31,16 @@ def test_raw_event_callback_blyss():
     assert event.data == BLYSS_OFF_EVENT_DATA
 
 
+def test_accept_packet():
+    adapter = RfDeviceEventAdapter(Mock(), device_filter=lambda device, _: device.id_string == "BLYSS-1")
+
+    assert adapter.accept_packet(PacketSummary("BLYSS", "1", "1")) is True
+    assert adapter.accept_packet(PacketSummary("BLYSS", "1", "2")) is False
+    assert adapter.accept_packet(PacketSummary("BLYSS", "1", None)) is True
+    assert adapter.accept_packet(PacketSummary("BLYSS", "1", "invalid")) is True
+    assert RfDeviceEventAdapter(Mock()).accept_packet(PacketSummary("BLYSS", "1", "2")) is True
+
+
 def test_valid_address():
     assert RfDeviceId.is_valid_address("123456789") is True
     assert RfDeviceId.is_valid_address("-1") is False
@@ -61,7 +77,7 @@ def test_integer_address():
     assert device.integer_address == 255
     assert device.id_string == "X2D-255"
 
-    device.address = "P1"
+    device = device.with_address("P1")
     assert device.integer_address == 240
     assert device.id_string == "X2D-240"
 
@@ -78,3 +94,31 @@ def test_group_unit_code():
     device = RfDeviceId(protocol="RTS", address="B1")
     assert device.group_code == "0"
     assert device.unit_code == "16"
+
+
+def test_interned_device_id():
+    device = RfDeviceId(protocol="X2D", address="A1")
+    assert RfDeviceId(protocol="X2D", address="A1") is device
+    assert RfDeviceId(protocol="X2D", address="A1", model="switch") is not device
+    assert device.with_address("A1") is device
+    assert device.with_address("A2") == RfDeviceId(protocol="X2D", address="A2")
+    assert copy.deepcopy(device) is device
+    assert pickle.loads(pickle.dumps(device)) is device
+    assert {device: 1}[RfDeviceId(protocol="X2D", address="A1")] == 1
+
+
+def test_immutable_device_id():
+    device = RfDeviceId(protocol="X2D", address="A1")
+    with pytest.raises(AttributeError):
+        device.address = "A2"
+    with pytest.raises(AttributeError):
+        device.extra = 1
+    assert device.id_string == "X2D-0"
+
+
+def test_frame_header_from_event_data():
+    assert RfDeviceEvent(RfDeviceId("BLYSS", "1"), BLYSS_OFF_EVENT_DATA).header == FrameHeader.from_event_data(
+        BLYSS_OFF_EVENT_DATA
+    )
+    assert FrameHeader.from_event_data({"foo": "bar"}) is None
+    assert FrameHeader.from_frame({"header": {"protocolMeaning": "X10", "rfLevel": "x"}}) == FrameHeader("X10", "")
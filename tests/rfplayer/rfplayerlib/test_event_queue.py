@@ -0,0 +1,40 @@
+"""Unit tests for rfplayer event queue."""
+
+import copy
+
+from custom_components.rfplayer.rfplayerlib.event_queue import EventQueue, OverflowPolicy
+from tests.rfplayer.constants import BLYSS_OFF_EVENT_DATA, CHACON_ON_EVENT_DATA, OREGON_EVENT_DATA
+
+
+def _events(queue: EventQueue) -> list[dict]:
+    return [queue.get() for _ in range(len(queue))]
+
+
+def test_drop_oldest():
+    # GIVEN
+    queue = EventQueue(maxlen=2)
+
+    # WHEN
+    for event_data in (CHACON_ON_EVENT_DATA, BLYSS_OFF_EVENT_DATA, OREGON_EVENT_DATA):
+        queue.put(event_data)
+
+    # THEN
+    assert queue.full
+    assert queue.dropped == 1
+    assert _events(queue) == [BLYSS_OFF_EVENT_DATA, OREGON_EVENT_DATA]
+
+
+def test_coalesce():
+    # GIVEN
+    queue = EventQueue(maxlen=2, policy=OverflowPolicy.COALESCE)
+    newer_chacon = copy.deepcopy(CHACON_ON_EVENT_DATA)
+    newer_chacon["frame"]["infos"]["subType"] = "0"
+
+    # WHEN
+    for event_data in (CHACON_ON_EVENT_DATA, BLYSS_OFF_EVENT_DATA, newer_chacon, OREGON_EVENT_DATA):
+        queue.put(event_data)
+
+    # THEN
+    assert queue.coalesced == 1
+    assert queue.dropped == 1
+    assert _events(queue) == [BLYSS_OFF_EVENT_DATA, OREGON_EVENT_DATA]
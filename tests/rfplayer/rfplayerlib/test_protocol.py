@@ -1,6 +1,7 @@
 """Unit tests for rfplayer client."""
 
 import asyncio
+import dataclasses
 import json
 from typing import cast
 from unittest.mock import Mock, call
@@ -8,7 +9,20 @@ from unittest.mock import Mock, call
 import pytest
 from pytest_mock import MockerFixture
 
-from custom_components.rfplayer.rfplayerlib.protocol import RfplayerProtocol
+from custom_components.rfplayer.rfplayerlib.event_queue import OverflowPolicy
+from custom_components.rfplayer.rfplayerlib.protocol import (
+    EVENT_SLICE_SIZE,
+    JSON_DECODERS,
+    LATE_RESPONSE_DELAY,
+    MAX_BUFFER_SIZE,
+    PacketSummary,
+    RfPlayerException,
+    RfplayerProtocol,
+    get_json_decoder,
+    peek_json_packet,
+    summarize_event,
+)
+from tests.rfplayer.device_profiles.conftest import load_all_events
 
 
 @pytest.mark.asyncio
@@ -65,6 +79,82 @@ def test_received_json_multiple(test_protocol: RfplayerProtocol):
     cb.assert_has_calls([call(json.loads(bodies[0])), call(json.loads(bodies[1]))])
 
 
+@pytest.mark.asyncio
+async def test_received_burst(test_protocol: RfplayerProtocol):
+    # GIVEN
+    transport = Mock(spec=asyncio.Transport)
+    test_protocol.transport = transport
+    test_protocol.events.maxlen = 3 * EVENT_SLICE_SIZE
+    payload = "".join(f'ZIA33{{"n": {n}}}\n\r' for n in range(4 * EVENT_SLICE_SIZE))
+
+    # WHEN
+    test_protocol.data_received(payload.encode())
+
+    # THEN
+    cb = cast(Mock, test_protocol.event_callback)
+    assert cb.call_count == EVENT_SLICE_SIZE
+    assert cb.call_args_list[0] == call({"n": 0})
+    # The packets received while the queue was full are parsed instead of dropped
+    assert not test_protocol.events.dropped
+    assert len(test_protocol.events) == 3 * EVENT_SLICE_SIZE
+    transport.pause_reading.assert_called_once()
+
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert cb.call_count == 3 * EVENT_SLICE_SIZE
+    transport.resume_reading.assert_called_once()
+
+    await asyncio.sleep(0)
+    assert cb.call_count == 4 * EVENT_SLICE_SIZE
+    assert cb.call_args_list == [call({"n": n}) for n in range(4 * EVENT_SLICE_SIZE)]
+    assert not test_protocol.events
+
+
+@pytest.mark.asyncio
+async def test_received_burst_while_full(test_protocol: RfplayerProtocol):
+    # GIVEN
+    test_protocol.events.maxlen = EVENT_SLICE_SIZE
+    payload = "".join(f'ZIA33{{"n": {n}}}\n\r' for n in range(3 * EVENT_SLICE_SIZE))
+    test_protocol.data_received(payload.encode())
+    test_protocol.data_received(b'ZIA33{"n": -1}\n\r')
+
+    # WHEN
+    test_protocol.connection_lost(None)
+    await asyncio.sleep(0)
+
+    # THEN
+    cb = cast(Mock, test_protocol.event_callback)
+    assert cb.call_count == EVENT_SLICE_SIZE
+    assert not test_protocol.events
+    assert not test_protocol.buffer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("policy", "counter"), [(OverflowPolicy.DROP_OLDEST, "dropped"), (OverflowPolicy.COALESCE, "coalesced")]
+)
+async def test_received_while_paused(test_protocol: RfplayerProtocol, policy: OverflowPolicy, counter: str):
+    # GIVEN
+    transport = Mock(spec=asyncio.Transport)
+    test_protocol.transport = transport
+    test_protocol.events.maxlen = EVENT_SLICE_SIZE
+    test_protocol.events.policy = policy
+    payload = "".join(f'ZIA33{{"n": {n}}}\n\r' for n in range(1000)).encode()
+    test_protocol.data_received(payload)
+    transport.pause_reading.assert_called_once()
+
+    # WHEN
+    # The transport keeps delivering data after pause_reading
+    for _ in range(10):
+        test_protocol.data_received(payload)
+
+    # THEN
+    # The overflow policy applies instead of the buffer growing
+    assert getattr(test_protocol.events, counter) > 0
+    assert len(test_protocol.buffer) <= MAX_BUFFER_SIZE
+    assert len(test_protocol.events) == EVENT_SLICE_SIZE
+
+
 def test_received_incomplete(test_protocol: RfplayerProtocol):
     bodies = ['{"foo1": "bar1"}', '{"foo2": "bar2"}']
 
@@ -84,6 +174,54 @@ def test_received_strip(test_protocol: RfplayerProtocol):
     cb.assert_called_once_with(json.loads(body))
 
 
+def test_received_split_utf8(test_protocol: RfplayerProtocol):
+    body = '{"foo": "température"}'
+    payload = f"ZIA33{body}\n\r".encode()
+    split = payload.index("é".encode()) + 1
+
+    test_protocol.data_received(payload[:split])
+    test_protocol.data_received(payload[split:])
+
+    cb = cast(Mock, test_protocol.event_callback)
+    cb.assert_called_once_with(json.loads(body))
+
+
+def test_received_byte_by_byte(test_protocol: RfplayerProtocol):
+    bodies = ['{"foo1": "bar1"}', '{"foo2": "bar2"}']
+    payload = "".join(f"ZIA33{body}\n\r" for body in bodies).encode()
+
+    for i in range(len(payload)):
+        test_protocol.data_received(payload[i : i + 1])
+
+    cb = cast(Mock, test_protocol.event_callback)
+    cb.assert_has_calls([call(json.loads(bodies[0])), call(json.loads(bodies[1]))])
+    # Only the trailing carriage return of the last line is left
+    assert test_protocol.buffer == b"\r"
+
+
+def test_received_resync(test_protocol: RfplayerProtocol):
+    bodies = ['{"foo1": "bar1"}', '{"foo2": "bar2"}']
+
+    test_protocol.data_received(f"\xff\xfegarbageZIA33{bodies[0]}\n\r".encode("latin-1"))
+    test_protocol.data_received(b"\xff\xfe\n\r")
+    test_protocol.data_received(f"ZIA33{bodies[1]}\n\r".encode())
+
+    cb = cast(Mock, test_protocol.event_callback)
+    cb.assert_has_calls([call(json.loads(bodies[0])), call(json.loads(bodies[1]))])
+
+
+def test_received_overflow(test_protocol: RfplayerProtocol):
+    body = '{"foo": "bar"}'
+
+    test_protocol.data_received(b"x" * (MAX_BUFFER_SIZE + 1))
+    assert not test_protocol.buffer
+
+    test_protocol.data_received(f"ZIA33{body}\n\r".encode())
+
+    cb = cast(Mock, test_protocol.event_callback)
+    cb.assert_called_once_with(json.loads(body))
+
+
 def test_received_invalid(test_protocol: RfplayerProtocol):
     test_protocol.data_received(b"ZIA33 \n\r")
 
@@ -91,6 +229,50 @@ def test_received_invalid(test_protocol: RfplayerProtocol):
     cb.assert_not_called()
 
 
+@pytest.mark.parametrize("decoder_name", list(JSON_DECODERS))
+def test_json_decoders(test_protocol: RfplayerProtocol, decoder_name: str):
+    try:
+        test_protocol.json_decoder = get_json_decoder(decoder_name)
+    except ImportError:
+        pytest.skip(f"{decoder_name} is not installed")
+    events = load_all_events()
+
+    test_protocol.data_received(b"".join(f"ZIA33{json.dumps(event)}\n\r".encode() for event in events))
+    test_protocol.data_received(b'ZIA33{"foo": "\xff"}\n\rZIA33{"foo": \n\r')
+
+    cb = cast(Mock, test_protocol.event_callback)
+    assert cb.call_args_list == [call(event) for event in events]
+
+
+def test_peek_json_packet():
+    for event in load_all_events():
+        assert peek_json_packet(json.dumps(event).encode()) == summarize_event(event)
+    assert peek_json_packet(b'{"frame": {"header": {"infoType": 1, "protocolMeaning": "X10"}}}') is None
+    assert peek_json_packet(b'{"frame": {"header": {"infoType": "1", "protocolMeaning": "X\\"1"}}}') is None
+
+
+def test_received_filtered(test_protocol: RfplayerProtocol):
+    # GIVEN
+    packet_filter = Mock(side_effect=lambda summary: summary.address == "1")
+    test_protocol.packet_filter = packet_filter
+    loads = Mock(wraps=test_protocol.json_decoder.loads)
+    test_protocol.json_decoder = dataclasses.replace(test_protocol.json_decoder, loads=loads)
+    header = '"header": {"protocolMeaning": "BLYSS", "infoType": "1"}'
+
+    # WHEN
+    test_protocol.data_received(f'ZIA33{{"frame": {{{header}, "infos": {{"id": "2"}}}}}}\n\r'.encode())
+    test_protocol.data_received(f'ZIA33{{"frame": {{{header}, "infos": {{"id": "1"}}}}}}\n\r'.encode())
+
+    # THEN
+    assert packet_filter.call_args_list == [
+        call(PacketSummary("BLYSS", "1", "2")),
+        call(PacketSummary("BLYSS", "1", "1")),
+    ]
+    loads.assert_called_once()
+    assert test_protocol.filtered_packets == 1
+    cast(Mock, test_protocol.event_callback).assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_send_command(test_protocol: RfplayerProtocol):
     body = "FORMAT JSON"
@@ -111,7 +293,8 @@ async def test_send_command_error(test_protocol: RfplayerProtocol, mocker: Mocke
     tr.write.side_effect = send_response
 
     body = "ON X2DELE A0 %3"
-    await test_protocol.send_raw_request(body)
+    with pytest.raises(RfPlayerException, match="error request number"):
+        await test_protocol.send_raw_request(body)
 
     tr.write.assert_called_once_with(f"ZIA++{body}\n\r".encode())
     logger_mock.warning.assert_called()
@@ -146,13 +329,115 @@ async def test_send_request_error(test_protocol: RfplayerProtocol, mocker: Mocke
     tr.write.side_effect = send_response
 
     body = "HELL"
-    actual = await test_protocol.send_raw_request(body)
+    with pytest.raises(RfPlayerException, match="HELL: error request number=0"):
+        await test_protocol.send_raw_request(body)
 
     tr.write.assert_called_once_with(f"ZIA++{body}\n\r".encode())
-    assert actual == ""
     logger_mock.warning.assert_called()
 
 
+@pytest.mark.asyncio
+async def test_send_requests_pipelined_error(test_protocol: RfplayerProtocol):
+    first = test_protocol.submit_raw_request("HELL")
+    second = test_protocol.submit_raw_request("STATUS")
+    third = test_protocol.submit_raw_request("HELLO")
+
+    # The error lines of the first request are not delivered to the second one
+    test_protocol.data_received(b"ZIA--\n\rerror request number=0\n\rSyntax error: HELL\n\rZIA--Status\n\r")
+    test_protocol.data_received(b"ZIA--\n\rSyntax error: HELLO\n\r")
+
+    with pytest.raises(RfPlayerException):
+        await first.future
+    assert await second.future == "Status"
+    with pytest.raises(RfPlayerException, match="HELLO"):
+        await third.future
+    assert test_protocol.pending_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_send_request_with_failing_command(test_protocol: RfplayerProtocol, mocker: MockerFixture):
+    logger_mock = mocker.patch("custom_components.rfplayer.rfplayerlib.protocol._LOGGER")
+    request = test_protocol.submit_raw_request("STATUS")
+
+    # The error of a command sent without request is only logged
+    await test_protocol.send_raw_command("HELL")
+    test_protocol.data_received(b"Syntax error: HELL\n\r")
+    logger_mock.warning.assert_called_once()
+    assert not request.future.done()
+    assert test_protocol.pending_requests == 1
+
+    test_protocol.data_received(b"ZIA--Status\n\r")
+    assert await request.future == "Status"
+
+
+@pytest.mark.asyncio
+async def test_send_request_empty_response(test_protocol: RfplayerProtocol):
+    request = test_protocol.submit_raw_request("PING")
+
+    test_protocol.data_received(b"ZIA--\n\r")
+    assert not request.future.done()
+
+    # Resolved when no error line follows
+    assert await asyncio.wait_for(request.future, 1) == ""
+    assert request.latency is not None
+
+
+@pytest.mark.asyncio
+async def test_send_requests_pipelined(test_protocol: RfplayerProtocol):
+    first = test_protocol.submit_raw_request("HELLO")
+    second = test_protocol.submit_raw_request("STATUS")
+    assert test_protocol.pending_requests == 2
+
+    # A command doesn't wait for the pending requests
+    await test_protocol.send_raw_command("ON A1 X10")
+    test_protocol.data_received(b"ZIA--Welcome\n\rZIA--Status\n\r")
+
+    assert await first.future == "Welcome"
+    assert await second.future == "Status"
+    assert first.latency is not None
+    assert test_protocol.pending_requests == 0
+    tr = cast(Mock, test_protocol.transport)
+    assert tr.write.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_send_request_timeout(test_protocol: RfplayerProtocol, mocker: MockerFixture):
+    with pytest.raises(TimeoutError):
+        await test_protocol.send_raw_request("STATUS", timeout=0.01)
+
+    request = test_protocol.submit_raw_request("HELLO")
+
+    # The late response of the abandoned request is not delivered to the next one
+    test_protocol.data_received(b"ZIA--Status\n\rZIA--Welcome\n\r")
+    assert await request.future == "Welcome"
+
+    # Abandoned requests are eventually forgotten
+    with pytest.raises(TimeoutError):
+        await test_protocol.send_raw_request("STATUS", timeout=0.01)
+    mocker.patch.object(test_protocol.loop, "time", return_value=test_protocol.loop.time() + LATE_RESPONSE_DELAY + 1)
+    request = test_protocol.submit_raw_request("HELLO")
+    test_protocol.data_received(b"ZIA--Welcome\n\r")
+    assert await request.future == "Welcome"
+
+
+def test_unexpected_response(test_protocol: RfplayerProtocol, mocker: MockerFixture):
+    logger_mock = mocker.patch("custom_components.rfplayer.rfplayerlib.protocol._LOGGER")
+
+    test_protocol.data_received(b"ZIA--Welcome\n\r")
+
+    logger_mock.warning.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_connection_lost_pending_request(test_protocol: RfplayerProtocol):
+    request = test_protocol.submit_raw_request("HELLO")
+
+    test_protocol.connection_lost(None)
+
+    with pytest.raises(RfPlayerException):
+        await request.future
+
+
 def test_connection_lost_error(test_protocol: RfplayerProtocol):
     ex = Exception()
     test_protocol.connection_lost(ex)
@@ -0,0 +1,50 @@
+"""Unit tests for rfplayer receive filter."""
+
+import pytest
+
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceId
+from custom_components.rfplayer.rfplayerlib.receive_filter import DeviceRules, ReceiveFilter
+
+
+def _device(id_string: str) -> RfDeviceId:
+    protocol, _, address = id_string.rpartition("-")
+    return RfDeviceId(protocol=protocol, address=address)
+
+
+def test_device_rules():
+    rules = DeviceRules.parse("blyss-12, OREGON:100-200,OREGON:150-300, OREGON:1000-1000, X10:A1-A16, ,CHACON:*")
+
+    assert rules.range_starts["OREGON"] == [100, 1000]
+    assert rules.range_ends["OREGON"] == [300, 1000]
+    for id_string in ("BLYSS-12", "OREGON-100", "OREGON-300", "OREGON-1000", "X10-A16", "CHACON-123456"):
+        assert _device(id_string) in rules, id_string
+    for id_string in ("BLYSS-13", "OREGON-99", "OREGON-301", "OREGON-1001", "X10-B1", "DOMIA-1"):
+        assert _device(id_string) not in rules, id_string
+    assert not DeviceRules.parse("")
+
+
+@pytest.mark.parametrize("rule", ["BLYSS", "-12", "BLYSS-xyz", "OREGON:200-100", "OREGON:100", "OREGON:a-b"])
+def test_invalid_device_rules(rule: str):
+    with pytest.raises(ValueError, match="Invalid"):
+        DeviceRules.parse(rule)
+
+
+def test_receive_filter():
+    receive_filter = ReceiveFilter(
+        allow=DeviceRules.parse("OREGON:*"),
+        deny=DeviceRules.parse("OREGON:100-200, BLYSS-1"),
+        min_rf_level=-80,
+        known_device=lambda device: device.protocol == "BLYSS",
+    )
+
+    assert receive_filter.accepts(_device("BLYSS-2"), -100)
+    assert not receive_filter.accepts(_device("BLYSS-1"), -50)
+    assert not receive_filter.accepts(_device("OREGON-150"), -50)
+    assert receive_filter.accepts(_device("OREGON-300"), -80)
+    assert receive_filter.accepts(_device("OREGON-300"))
+    assert not receive_filter.accepts(_device("OREGON-300"), -81)
+    assert not receive_filter.accepts(_device("CHACON-1"), -50)
+
+    receive_filter.discovery = False
+    assert receive_filter.accepts(_device("BLYSS-2"), -100)
+    assert not receive_filter.accepts(_device("OREGON-300"), -50)
@@ -0,0 +1,93 @@
+"""Unit tests for rfplayer repeated frame suppression."""
+
+import asyncio
+import copy
+from unittest.mock import Mock
+
+from custom_components.rfplayer.rfplayerlib.repeat import RepeatFilter
+from tests.rfplayer.constants import BLYSS_OFF_EVENT_DATA, CHACON_ON_EVENT_DATA
+
+
+def _copy(event_data: dict, rf_level: str, floor_noise: str = "-98") -> dict:
+    result = copy.deepcopy(event_data)
+    result["frame"]["header"].update({"rfLevel": rf_level, "floorNoise": floor_noise})
+    return result
+
+
+def _flush_timers(loop: Mock):
+    for call in loop.call_later.call_args_list:
+        _, callback, *args = call.args
+        callback(*args)
+
+
+def test_collapse_repeats():
+    # GIVEN
+    loop = Mock(spec=asyncio.AbstractEventLoop)
+    callback = Mock()
+    repeat_filter = RepeatFilter(loop, 0.25, callback)
+
+    # WHEN
+    repeat_filter.raw_event_callback(_copy(CHACON_ON_EVENT_DATA, "-80", "-99"))
+    repeat_filter.raw_event_callback(_copy(CHACON_ON_EVENT_DATA, "-62", "-97"))
+    repeat_filter.raw_event_callback(_copy(CHACON_ON_EVENT_DATA, "-75"))
+    repeat_filter.raw_event_callback(_copy(BLYSS_OFF_EVENT_DATA, "-70"))
+
+    # THEN
+    callback.assert_not_called()
+    assert loop.call_later.call_count == 2
+    _flush_timers(loop)
+    assert callback.call_count == 2
+    chacon, blyss = (call.args[0]["frame"] for call in callback.call_args_list)
+    assert chacon["header"]["rfLevel"] == "-62"
+    assert chacon["header"]["repeats"] == "3"
+    assert chacon["infos"] == CHACON_ON_EVENT_DATA["frame"]["infos"]
+    assert blyss["header"]["repeats"] == "1"
+
+
+def test_different_payloads():
+    # GIVEN
+    loop = Mock(spec=asyncio.AbstractEventLoop)
+    callback = Mock()
+    repeat_filter = RepeatFilter(loop, 0.25, callback)
+    other = _copy(CHACON_ON_EVENT_DATA, "-70")
+    other["frame"]["infos"]["subType"] = "0"
+
+    # WHEN
+    repeat_filter.raw_event_callback(_copy(CHACON_ON_EVENT_DATA, "-70"))
+    repeat_filter.raw_event_callback(other)
+    _flush_timers(loop)
+
+    # THEN
+    assert callback.call_count == 2
+    assert all(call.args[0]["frame"]["header"]["repeats"] == "1" for call in callback.call_args_list)
+
+
+def test_clear():
+    # GIVEN
+    loop = Mock(spec=asyncio.AbstractEventLoop)
+    callback = Mock()
+    repeat_filter = RepeatFilter(loop, 0.25, callback)
+    repeat_filter.raw_event_callback(_copy(CHACON_ON_EVENT_DATA, "-70"))
+    repeat_filter.raw_event_callback(_copy(BLYSS_OFF_EVENT_DATA, "-70"))
+
+    # WHEN
+    repeat_filter.clear()
+    _flush_timers(loop)
+
+    # THEN
+    callback.assert_not_called()
+    assert loop.call_later.return_value.cancel.call_count == 2
+
+
+def test_pass_through():
+    # GIVEN
+    loop = Mock(spec=asyncio.AbstractEventLoop)
+    callback = Mock()
+    repeat_filter = RepeatFilter(loop, 0.25, callback)
+
+    # WHEN
+    repeat_filter.raw_event_callback({"systemStatus": {}})
+
+    # THEN
+    callback.assert_called_once_with({"systemStatus": {}})
+    loop.call_later.assert_not_called()
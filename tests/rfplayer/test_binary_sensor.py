@@ -1,22 +1,32 @@
+from datetime import timedelta
 import json
+from pathlib import Path
 from typing import cast
 from unittest.mock import Mock
 
 import pytest
-from pytest_homeassistant_custom_component.common import mock_restore_cache
-
-from custom_components.rfplayer.const import ATTR_EVENT_DATA, DOMAIN, RFPLAYER_CLIENT
+from pytest_homeassistant_custom_component.common import async_fire_time_changed, mock_restore_cache
+
+from custom_components.rfplayer.const import (
+    ATTR_EVENT_DATA,
+    DOMAIN,
+    PROFILE_OVERLAYS_DIR,
+    PROFILE_OVERLAYS_SCAN_INTERVAL,
+    RFPLAYER_CLIENT,
+)
 from custom_components.rfplayer.rfplayerlib import RfPlayerClient
 from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
 from homeassistant.const import ATTR_FRIENDLY_NAME, STATE_OFF, STATE_ON, STATE_UNKNOWN
 from homeassistant.core import HomeAssistant, State
-from tests.rfplayer.conftest import setup_rfplayer_test_cfg
+from homeassistant.util import dt as dt_util
+from tests.rfplayer.conftest import async_add_discovered_entities, setup_rfplayer_test_cfg
 from tests.rfplayer.constants import (
     BLYSS_BINARY_SENSOR_MOTION_ENTITY_ID,
     BLYSS_BINARY_SENSOR_MOTION_FRIENDLY_NAME,
     BLYSS_BINARY_SENSOR_SMOKE_ENTITY_ID,
     BLYSS_BINARY_SENSOR_SMOKE_FRIENDLY_NAME,
+    BLYSS_MOTION_ADDRESS,
     BLYSS_MOTION_DEVICE_INFO,
     BLYSS_MOTION_ID_STRING,
     BLYSS_SMOKE_DEVICE_INFO,
@@ -83,7 +93,7 @@ async def test_automatic_add(serial_connection_mock: Mock, hass: HomeAssistant):
         )
     )
 
-    await hass.async_block_till_done()
+    await async_add_discovered_entities(hass)
 
     state = hass.states.get(OREGON_BINARY_SENSOR_ENTITY_ID)
     assert state
@@ -145,3 +155,60 @@ async def test_state_restore(serial_connection_mock: Mock, hass: HomeAssistant)
     state = hass.states.get(OREGON_BINARY_SENSOR_ENTITY_ID)
     assert state
     assert state.state == OREGON_BINARY_SENSOR_STATE
+
+
+@pytest.mark.asyncio
+async def test_profile_overlay_rebind(serial_connection_mock: Mock, hass: HomeAssistant, tmp_path: Path):
+    hass.config.config_dir = str(tmp_path)
+    await setup_rfplayer_test_cfg(hass, devices={BLYSS_MOTION_ID_STRING: BLYSS_MOTION_DEVICE_INFO})
+
+    client = cast(RfPlayerClient, hass.data[DOMAIN][RFPLAYER_CLIENT])
+    client.event_callback(
+        RfDeviceEvent(
+            device=RfDeviceId(protocol="BLYSS", address=BLYSS_MOTION_ADDRESS),
+            data=RfPlayerEventData(
+                {
+                    "frame": {
+                        "header": {"protocolMeaning": "BLYSS", "infoType": "1"},
+                        "infos": {"subType": "0", "id": BLYSS_MOTION_ADDRESS, "subTypeMeaning": "ON"},
+                    }
+                }
+            ),
+        )
+    )
+    await hass.async_block_till_done()
+    state = hass.states.get(BLYSS_BINARY_SENSOR_MOTION_ENTITY_ID)
+    assert state
+    assert state.state == STATE_ON
+
+    # The overlay profile reads the motion state from the sub type, the last event is applied again
+    overlay = tmp_path / PROFILE_OVERLAYS_DIR / "motion.yaml"
+    overlay.parent.mkdir()
+    overlay.write_text(
+        """
+- name: X10|CHACON|KD101|BLYSS|FS20 Motion detector
+  match:
+    protocol: "X10|CHACON|KD101|BLYSS|FS20"
+    info_type: "1"
+  platforms:
+    binary_sensor:
+      - name: "Motion"
+        device_class: motion
+        state:
+          value_path: "$.frame.infos.subType"
+""",
+        encoding="utf-8",
+    )
+    async_fire_time_changed(hass, dt_util.utcnow() + PROFILE_OVERLAYS_SCAN_INTERVAL)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    state = hass.states.get(BLYSS_BINARY_SENSOR_MOTION_ENTITY_ID)
+    assert state
+    assert state.state == STATE_OFF
+
+    # Removing the overlay restores the bundled profile
+    overlay.unlink()
+    async_fire_time_changed(hass, dt_util.utcnow() + PROFILE_OVERLAYS_SCAN_INTERVAL * 2 + timedelta(seconds=1))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    state = hass.states.get(BLYSS_BINARY_SENSOR_MOTION_ENTITY_ID)
+    assert state
+    assert state.state == STATE_ON
@@ -25,7 +25,7 @@ from homeassistant.const import (
     Platform,
 )
 from homeassistant.core import HomeAssistant, State
-from tests.rfplayer.conftest import setup_rfplayer_test_cfg
+from tests.rfplayer.conftest import async_add_discovered_entities, setup_rfplayer_test_cfg
 from tests.rfplayer.constants import (
     X2D_ADDRESS,
     X2D_COMFORT_EVENT_DATA,
@@ -122,7 +122,7 @@ async def test_automatic_add(serial_connection_mock: Mock, hass: HomeAssistant):
         )
     )
 
-    await hass.async_block_till_done()
+    await async_add_discovered_entities(hass)
 
     state = hass.states.get(X2D_ENTITY_ID)
     assert state
@@ -8,7 +8,8 @@ import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.rfplayer import DOMAIN, config_flow
-from custom_components.rfplayer.const import INIT_COMMANDS_EMPTY, RFPLAYER_CLIENT
+from custom_components.rfplayer.const import INIT_COMMANDS_EMPTY, RFPLAYER_CLIENT, RFPLAYER_GATEWAY
+from custom_components.rfplayer.gateway import Gateway
 from custom_components.rfplayer.helpers import get_identifiers_from_device_id
 from custom_components.rfplayer.rfplayerlib import RfPlayerClient
 from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
@@ -19,7 +20,7 @@ from homeassistant.const import STATE_OFF, STATE_OPEN, STATE_UNKNOWN
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.helpers import device_registry as dr
-from tests.rfplayer.conftest import create_rfplayer_test_cfg
+from tests.rfplayer.conftest import async_add_discovered_entities, create_rfplayer_test_cfg
 from tests.rfplayer.constants import (
     CHACON_BINARY_SENSOR_DEVICE_INFO,
     OREGON_ADDRESS,
@@ -107,8 +108,13 @@ async def test_setup_serial(serial_connection_mock: Mock, hass: HomeAssistant) -
         "receiver_protocols": ALL_RECEIVER_PROTOCOLS,
         "init_commands": "",
         "verbose_mode": False,
-        "devices": {},
-        "redirect_address": {},
+        "record_event_data": False,
+        "binary_format": False,
+        "repeat_window": 0,
+        "overflow_policy": "drop_oldest",
+        "allow_devices": "",
+        "deny_devices": "",
+        "min_rf_level": None,
     }
 
 
@@ -133,8 +139,13 @@ async def test_setup_serial_simulator(serial_connection_mock: Mock, hass: HomeAs
         "receiver_protocols": ALL_RECEIVER_PROTOCOLS,
         "init_commands": "",
         "verbose_mode": False,
-        "devices": {},
-        "redirect_address": {},
+        "record_event_data": False,
+        "binary_format": False,
+        "repeat_window": 0,
+        "overflow_policy": "drop_oldest",
+        "allow_devices": "",
+        "deny_devices": "",
+        "min_rf_level": None,
     }
 
 
@@ -161,8 +172,13 @@ async def test_setup_tcp(serial_connection_mock: Mock, hass: HomeAssistant) -> N
         "receiver_protocols": ALL_RECEIVER_PROTOCOLS,
         "init_commands": "",
         "verbose_mode": False,
-        "devices": {},
-        "redirect_address": {},
+        "record_event_data": False,
+        "binary_format": False,
+        "repeat_window": 0,
+        "overflow_policy": "drop_oldest",
+        "allow_devices": "",
+        "deny_devices": "",
+        "min_rf_level": None,
     }
 
 
@@ -214,6 +230,11 @@ async def test_options_gateway(serial_connection_mock: Mock, hass: HomeAssistant
             "receiver_protocols": ["RTS"],
             "init_commands": INIT_COMMANDS_EMPTY,
             "verbose_mode": True,
+            "binary_format": True,
+            "repeat_window": 250,
+            "overflow_policy": "coalesce",
+            "deny_devices": "OREGON:1000-2000, BLYSS-12",
+            "min_rf_level": -90,
         },
     )
 
@@ -226,6 +247,12 @@ async def test_options_gateway(serial_connection_mock: Mock, hass: HomeAssistant
     assert entry.data["receiver_protocols"] == ["RTS"]
     assert entry.data["init_commands"] == ""
     assert entry.data["verbose_mode"] is True
+    assert entry.data["binary_format"] is True
+    assert entry.data["repeat_window"] == 250
+    assert entry.data["overflow_policy"] == "coalesce"
+    assert entry.data["allow_devices"] == ""
+    assert entry.data["deny_devices"] == "OREGON:1000-2000, BLYSS-12"
+    assert entry.data["min_rf_level"] == -90
 
 
 @pytest.mark.asyncio
@@ -265,6 +292,37 @@ async def test_options_gateway_no_receiver_protocols(serial_connection_mock: Moc
     assert result["errors"] == {"receiver_protocols": "no_receiver_protocol"}
 
 
+@pytest.mark.asyncio
+async def test_options_gateway_invalid_device_rules(serial_connection_mock: Mock, hass: HomeAssistant) -> None:
+    """Test we reject invalid allow and deny rules."""
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=create_rfplayer_test_cfg(),
+        unique_id=DOMAIN,
+    )
+    result = await start_options_flow(hass, entry)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"next_step_id": "configure_gateway"},
+    )
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            "automatic_add": True,
+            "reconnect_interval": 20,
+            "receiver_protocols": ["RTS"],
+            "verbose_mode": False,
+            "allow_devices": "OREGON:2000-1000",
+            "deny_devices": "BLYSS",
+        },
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"allow_devices": "invalid_device_rules", "deny_devices": "invalid_device_rules"}
+
+
 @pytest.mark.asyncio
 async def test_options_gateway_init_commands(serial_connection_mock: Mock, hass: HomeAssistant) -> None:
     """Test we set protocols to None if none are selected."""
@@ -337,9 +395,10 @@ async def test_options_add_rf_device(serial_connection_mock: Mock, hass: HomeAss
 
     assert result["type"] is FlowResultType.CREATE_ENTRY
 
-    await hass.async_block_till_done()
+    await async_add_discovered_entities(hass)
 
-    device_options = entry.data["devices"][RTS_ID_STRING]
+    gateway = cast(Gateway, hass.data[DOMAIN][RFPLAYER_GATEWAY])
+    device_options = gateway.device_store.devices[RTS_ID_STRING]
 
     assert not device_options["redirect_address"]
     assert device_options["profile_name"] == RTS_DEVICE_INFO["profile_name"]
@@ -450,8 +509,11 @@ async def test_options_configure_rf_device(
 
     await hass.async_block_till_done()
 
-    assert entry.data["devices"][OREGON_ID_STRING]["redirect_address"] == OREGON_REDIRECT_ADDRESS
-    assert entry.data["devices"][OREGON_ID_STRING]["profile_name"] == OREGON_DEVICE_INFO["profile_name"]
+    # The devices are updated without updating and reloading the config entry
+    assert "devices" not in entry.data
+    gateway = cast(Gateway, hass.data[DOMAIN][RFPLAYER_GATEWAY])
+    assert gateway.device_store.devices[OREGON_ID_STRING]["redirect_address"] == OREGON_REDIRECT_ADDRESS
+    assert gateway.device_store.devices[OREGON_ID_STRING]["profile_name"] == OREGON_DEVICE_INFO["profile_name"]
 
     state = hass.states.get(OREGON_BINARY_SENSOR_ENTITY_ID)
     assert state
@@ -497,8 +559,8 @@ async def test_options_configure_rf_device(
 
     await hass.async_block_till_done()
 
-    assert not entry.data["devices"][OREGON_ID_STRING]["redirect_address"]
-    assert entry.data["devices"][OREGON_ID_STRING]["profile_name"] == OREGON_DEVICE_INFO["profile_name"]
+    assert not gateway.device_store.devices[OREGON_ID_STRING]["redirect_address"]
+    assert gateway.device_store.devices[OREGON_ID_STRING]["profile_name"] == OREGON_DEVICE_INFO["profile_name"]
 
 
 def test_get_serial_by_id_no_dir() -> None:
@@ -0,0 +1,49 @@
+"""Tests for the device contexts."""
+
+from __future__ import annotations
+
+import json
+
+from custom_components.rfplayer import binary_sensor, sensor
+from custom_components.rfplayer.device_context import build_device_context
+from custom_components.rfplayer.device_profiles import UNDEFINED_PROFILE, _get_profile_registry
+from homeassistant.const import CONF_EVENT_DATA, CONF_PROFILE_NAME, Platform
+from tests.rfplayer.constants import OREGON_ADDRESS, OREGON_DEVICE_INFO, OREGON_EVENT_DATA, OREGON_ID_STRING
+
+
+def test_device_context() -> None:
+    registry = _get_profile_registry(False)
+    device = build_device_context(registry, {**OREGON_DEVICE_INFO, CONF_EVENT_DATA: json.dumps(OREGON_EVENT_DATA)})
+
+    assert device.id_string == OREGON_ID_STRING
+    assert device.profile is registry.get_profile("Oregon Rain Sensor")
+    # Event the device was discovered with
+    assert device.event_data == OREGON_EVENT_DATA
+    assert device.registry_info["name"] == f"OREGON {OREGON_ADDRESS}"
+    assert device.get_platform_configs(Platform.SENSOR)
+    assert not device.get_platform_configs(Platform.LIGHT)
+
+    # The entities of all the platforms share the device
+    builders = {Platform.SENSOR: sensor._builder, Platform.BINARY_SENSOR: binary_sensor._builder}  # noqa: SLF001
+    entities = [
+        entity
+        for platform, builder in builders.items()
+        for entity in builder(device, device.get_platform_configs(platform), False)
+    ]
+    assert len(entities) > 1
+    assert all(entity.device_info is device.registry_info for entity in entities)
+
+
+def test_device_context_last_event() -> None:
+    last_event = {"frame": {**OREGON_EVENT_DATA["frame"]}}
+    device = build_device_context(_get_profile_registry(False), OREGON_DEVICE_INFO, last_event)
+    assert device.event_data is last_event
+
+
+def test_device_context_undefined_profile() -> None:
+    device = build_device_context(
+        _get_profile_registry(False), {**OREGON_DEVICE_INFO, CONF_PROFILE_NAME: UNDEFINED_PROFILE}
+    )
+    assert device.profile is None
+    assert device.event_data is None
+    assert not device.get_platform_configs(Platform.SENSOR)
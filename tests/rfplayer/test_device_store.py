@@ -0,0 +1,46 @@
+"""Tests for the device store."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from custom_components.rfplayer.const import DOMAIN
+from custom_components.rfplayer.device_store import DeviceStore
+from homeassistant.core import HomeAssistant
+from tests.rfplayer.constants import OREGON_DEVICE_INFO, OREGON_ID_STRING, OREGON_REDIRECT_ADDRESS
+
+STORAGE_KEY = f"{DOMAIN}.an_entry.devices"
+
+
+@pytest.mark.asyncio
+async def test_device_store(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    store = DeviceStore(hass, "an_entry")
+    await store.async_load()
+    assert not store.devices
+
+    store.async_update_devices({OREGON_ID_STRING: OREGON_DEVICE_INFO})
+    store.async_update_devices({OREGON_ID_STRING: {"redirect_address": OREGON_REDIRECT_ADDRESS}})
+    assert store.devices[OREGON_ID_STRING] == {**OREGON_DEVICE_INFO, "redirect_address": OREGON_REDIRECT_ADDRESS}
+    assert store.redirects == {f"OREGON-{OREGON_REDIRECT_ADDRESS}": OREGON_ID_STRING}
+    assert STORAGE_KEY not in hass_storage
+
+    await store.async_flush()
+    assert store.coalesced_writes == 1
+    assert hass_storage[STORAGE_KEY]["data"]["devices"] == store.devices
+
+    # Loaded again from the storage file
+    store = DeviceStore(hass, "an_entry")
+    await store.async_load()
+    assert OREGON_ID_STRING in store
+    assert store.redirects == {f"OREGON-{OREGON_REDIRECT_ADDRESS}": OREGON_ID_STRING}
+
+    store.async_remove_device(OREGON_ID_STRING)
+    assert OREGON_ID_STRING not in store
+    assert not store.redirects
+    await store.async_flush()
+    assert not hass_storage[STORAGE_KEY]["data"]["devices"]
+
+    await store.async_remove()
+    assert STORAGE_KEY not in hass_storage
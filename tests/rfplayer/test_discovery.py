@@ -0,0 +1,106 @@
+"""Tests for the discovery service."""
+
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from custom_components.rfplayer import discovery
+from custom_components.rfplayer.const import DISCOVERY_MISS_EXPIRY
+from custom_components.rfplayer.device_context import DeviceContext
+from custom_components.rfplayer.device_profiles import _get_profile_registry
+from custom_components.rfplayer.discovery import DiscoveryService
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
+from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from tests.rfplayer.conftest import async_add_discovered_entities
+from tests.rfplayer.constants import (
+    BLYSS_ADDRESS,
+    BLYSS_ALL_ON_EVENT_DATA,
+    BLYSS_ID_STRING,
+    BLYSS_OFF_EVENT_DATA,
+    OREGON_ADDRESS,
+    OREGON_EVENT_DATA,
+    OREGON_ID_STRING,
+)
+
+UNKNOWN_EVENT_DATA = {"frame": {"header": {"protocolMeaning": "OTHER", "infoType": "1"}, "infos": {"id": "1"}}}
+
+
+def _event(protocol: str, address: str, data: dict) -> RfDeviceEvent:
+    return RfDeviceEvent(device=RfDeviceId(protocol=protocol, address=address), data=RfPlayerEventData(data))
+
+
+def _service(hass: HomeAssistant, configured: set[str] | None = None) -> tuple[DiscoveryService, Mock]:
+    device_callback = Mock()
+    service = DiscoveryService(hass, _get_profile_registry(False), (configured or set()).__contains__, device_callback)
+    return service, device_callback
+
+
+def _builder(device: DeviceContext) -> list:
+    return [device.id_string]
+
+
+@pytest.mark.asyncio
+async def test_discovery_batch(hass: HomeAssistant) -> None:
+    service, device_callback = _service(hass, {OREGON_ID_STRING})
+    add_sensors = Mock()
+    add_lights = Mock()
+    service.async_register_platform(Platform.SENSOR, _builder, add_sensors)
+    service.async_register_platform(Platform.LIGHT, lambda device: [], add_lights)
+
+    service.async_discover(_event("BLYSS", BLYSS_ADDRESS, BLYSS_OFF_EVENT_DATA))
+    service.async_discover(_event("BLYSS", BLYSS_ADDRESS, BLYSS_ALL_ON_EVENT_DATA))
+    service.async_discover(_event("BLYSS", "1", BLYSS_OFF_EVENT_DATA))
+    # Configured device
+    service.async_discover(_event("OREGON", OREGON_ADDRESS, OREGON_EVENT_DATA))
+    add_sensors.assert_not_called()
+
+    await async_add_discovered_entities(hass)
+
+    add_sensors.assert_called_once_with([BLYSS_ID_STRING, "BLYSS-1"])
+    add_lights.assert_not_called()
+    assert device_callback.call_count == 2
+    device = device_callback.call_args_list[0].args[0]
+    assert device.id_string == BLYSS_ID_STRING
+    assert device.profile_name == "X10|CHACON|KD101|BLYSS|FS20 On/Off"
+    # Last event before the entities are added
+    assert device.event_data == BLYSS_ALL_ON_EVENT_DATA
+
+    # Discovered once
+    service.async_discover(_event("BLYSS", BLYSS_ADDRESS, BLYSS_OFF_EVENT_DATA))
+    assert device_callback.call_count == 2
+    service.async_forget(BLYSS_ID_STRING)
+    service.async_discover(_event("BLYSS", BLYSS_ADDRESS, BLYSS_OFF_EVENT_DATA))
+    assert device_callback.call_count == 3
+
+    service.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_discovery_misses(hass: HomeAssistant, mocker: MockerFixture) -> None:
+    service, device_callback = _service(hass)
+    build_device_info = mocker.spy(discovery, "build_device_info_from_event")
+    monotonic = mocker.patch.object(discovery, "monotonic", return_value=1000.0)
+    event = _event("OTHER", "1", UNKNOWN_EVENT_DATA)
+
+    service.async_discover(event)
+    service.async_discover(event)
+    assert build_device_info.call_count == 1
+
+    # Matched again when the miss expires
+    monotonic.return_value += DISCOVERY_MISS_EXPIRY.total_seconds()
+    service.async_discover(event)
+    service.async_discover(event)
+    assert build_device_info.call_count == 2
+
+    # Matched again when the profiles change
+    service.async_clear_misses()
+    service.async_discover(event)
+    assert build_device_info.call_count == 3
+    device_callback.assert_not_called()
+
+    service.async_shutdown()
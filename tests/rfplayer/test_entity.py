@@ -2,17 +2,17 @@
 
 from __future__ import annotations
 
+from custom_components.rfplayer.device_context import DeviceContext
 from custom_components.rfplayer.entity import RfDeviceEntity
 from custom_components.rfplayer.rfplayerlib.device import RfDeviceId
 
 
 def test_unique_id_normalization() -> None:
     """Test that unique_id follows Home Assistant 2026.2+ requirements."""
-    device = RfDeviceId(protocol="BLYSS", address="4261483730")
+    device = DeviceContext(RfDeviceId(protocol="BLYSS", address="4261483730"), {}, None, None)
     entity = RfDeviceEntity(
-        device_id=device,
+        device=device,
         profile_name="Motion Detector",
-        event_data=None,
         verbose=False,
     )
 
@@ -0,0 +1,75 @@
+"""Tests for the event router."""
+
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+from custom_components.rfplayer.event_router import EventRouter
+from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
+from tests.rfplayer.constants import BLYSS_OFF_EVENT_DATA
+
+
+def _event(protocol: str, address: str) -> RfDeviceEvent:
+    return RfDeviceEvent(device=RfDeviceId(protocol=protocol, address=address), data=BLYSS_OFF_EVENT_DATA)
+
+
+def test_route_device() -> None:
+    router = EventRouter()
+    handler = Mock()
+    other_handler = Mock()
+    router.async_register(RfDeviceId(protocol="BLYSS", address="1"), handler)
+    router.async_register(RfDeviceId(protocol="BLYSS", address="2"), other_handler)
+
+    event = _event("BLYSS", "1")
+    router.async_route(event)
+
+    handler.assert_called_once_with(event)
+    other_handler.assert_not_called()
+
+
+def test_route_group() -> None:
+    router = EventRouter()
+    group_handler = Mock()
+    other_group_handler = Mock()
+    router.async_register(RfDeviceId(protocol="CHACON", address=str(0x100 + 1)), group_handler, group=True)
+    router.async_register(RfDeviceId(protocol="CHACON", address=str(0x200 + 1)), other_group_handler, group=True)
+
+    event = _event("CHACON", str(0x100 + 5))
+    router.async_route(event)
+
+    group_handler.assert_called_once_with(event)
+    other_group_handler.assert_not_called()
+
+
+def test_has_routes() -> None:
+    router = EventRouter()
+    router.async_register(RfDeviceId(protocol="BLYSS", address="1"), Mock())
+    router.async_register(RfDeviceId(protocol="CHACON", address=str(0x100 + 1)), Mock(), group=True)
+
+    assert router.has_routes(RfDeviceId(protocol="BLYSS", address="1"))
+    assert not router.has_routes(RfDeviceId(protocol="BLYSS", address="2"))
+    assert router.has_routes(RfDeviceId(protocol="CHACON", address=str(0x100 + 5)))
+    assert not router.has_routes(RfDeviceId(protocol="CHACON", address=str(0x200 + 1)))
+
+
+def test_unregister() -> None:
+    router = EventRouter()
+    handler = Mock()
+    other_handler = Mock()
+    device_id = RfDeviceId(protocol="BLYSS", address="1")
+    unregister = router.async_register(device_id, handler)
+    router.async_register(device_id, other_handler)
+
+    unregister()
+    router.async_route(_event("BLYSS", "1"))
+
+    handler.assert_not_called()
+    other_handler.assert_called_once()
+
+
+def test_redirect() -> None:
+    router = EventRouter()
+    router.async_set_redirect("OREGON-2", "1")
+
+    assert router.get_redirect_address("OREGON-2") == "1"
+    assert router.get_redirect_address("OREGON-1") is None
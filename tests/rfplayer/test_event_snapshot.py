@@ -0,0 +1,46 @@
+"""Tests for the event snapshot."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+
+from custom_components.rfplayer.const import DOMAIN
+from custom_components.rfplayer.event_snapshot import EventSnapshot
+from homeassistant.core import HomeAssistant
+from tests.rfplayer.constants import BLYSS_ID_STRING, BLYSS_OFF_EVENT_DATA, OREGON_EVENT_DATA, OREGON_ID_STRING
+
+STORAGE_KEY = f"{DOMAIN}.an_entry.events"
+
+
+@pytest.mark.asyncio
+async def test_event_snapshot(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    snapshot = EventSnapshot(hass, "an_entry")
+    await snapshot.async_load({OREGON_ID_STRING})
+    assert snapshot.get(OREGON_ID_STRING) is None
+
+    snapshot.async_record(OREGON_ID_STRING, json.dumps(OREGON_EVENT_DATA))
+    snapshot.async_record(BLYSS_ID_STRING, json.dumps(BLYSS_OFF_EVENT_DATA))
+    assert STORAGE_KEY not in hass_storage
+    await snapshot.async_flush()
+    # Payloads are saved as JSON objects
+    assert hass_storage[STORAGE_KEY]["data"]["events"] == {
+        OREGON_ID_STRING: OREGON_EVENT_DATA,
+        BLYSS_ID_STRING: BLYSS_OFF_EVENT_DATA,
+    }
+
+    # Only the events of configured devices are restored
+    snapshot = EventSnapshot(hass, "an_entry")
+    await snapshot.async_load({OREGON_ID_STRING})
+    assert snapshot.get(OREGON_ID_STRING) == OREGON_EVENT_DATA
+    assert snapshot.get(BLYSS_ID_STRING) is None
+
+    snapshot.async_remove_device(OREGON_ID_STRING)
+    assert snapshot.get(OREGON_ID_STRING) is None
+    await snapshot.async_flush()
+    assert not hass_storage[STORAGE_KEY]["data"]["events"]
+
+    await snapshot.async_remove()
+    assert STORAGE_KEY not in hass_storage
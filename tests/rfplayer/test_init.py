@@ -2,25 +2,37 @@
 
 from __future__ import annotations
 
+import asyncio
+import copy
+from datetime import timedelta
 import json
-from typing import cast
+from typing import Any, cast
 from unittest.mock import ANY, Mock
 
 import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 from pytest_homeassistant_custom_component.typing import WebSocketGenerator
 from pytest_mock import MockerFixture
 from serialx import SerialException
 
-from custom_components.rfplayer.const import DOMAIN, RFPLAYER_CLIENT, SIGNAL_RFPLAYER_EVENT
+from custom_components.rfplayer.const import (
+    DEVICES_SAVE_DELAY,
+    DOMAIN,
+    RFPLAYER_CLIENT,
+    RFPLAYER_GATEWAY,
+    SIGNAL_RFPLAYER_EVENT,
+)
+from custom_components.rfplayer.gateway import Gateway
 from custom_components.rfplayer.rfplayerlib import RfPlayerClient
 from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData, RfplayerProtocol
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.const import STATE_OFF, STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
 from tests.rfplayer.constants import (
     BLYSS_ADDRESS,
     BLYSS_ID_STRING,
@@ -28,13 +40,16 @@ from tests.rfplayer.constants import (
     JAMMING_BINARY_SENSOR_ENTITY_ID,
     JAMMING_ID_STRING,
     OREGON_ADDRESS,
+    OREGON_BINARY_SENSOR_ENTITY_ID,
+    OREGON_DEVICE_INFO,
     OREGON_EVENT_DATA,
     OREGON_ID_STRING,
+    OREGON_REDIRECT_ADDRESS,
     SOME_INIT_COMMANDS,
     SOME_PROTOCOLS,
 )
 
-from .conftest import setup_rfplayer_test_cfg
+from .conftest import async_add_discovered_entities, setup_rfplayer_test_cfg
 
 
 @pytest.mark.asyncio
@@ -78,6 +93,8 @@ async def test_fire_event(
         )
     )
 
+    await async_add_discovered_entities(hass)
+
     # Ensure blyss is not duplicated
     device_entries = dr.async_entries_for_config_entry(device_registry, entry.entry_id)
     assert len(device_entries) == 3
@@ -104,6 +121,47 @@ async def test_fire_event(
     assert calls[2].device.id_string == BLYSS_ID_STRING
 
 
+@pytest.mark.asyncio
+async def test_save_discovered_devices(
+    serial_connection_mock: Mock, hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test discovered devices are saved together in the device store."""
+    entry = await setup_rfplayer_test_cfg(hass, device="/dev/null", automatic_add=True, devices={})
+    gateway = cast(Gateway, hass.data[DOMAIN][RFPLAYER_GATEWAY])
+    client = cast(RfPlayerClient, hass.data[DOMAIN][RFPLAYER_CLIENT])
+    storage_key = f"{DOMAIN}.{entry.entry_id}.devices"
+    entry_data = entry.data
+
+    for address in ("1", "2", BLYSS_ADDRESS):
+        client.event_callback(
+            RfDeviceEvent(
+                device=RfDeviceId(protocol="BLYSS", address=address),
+                data=RfPlayerEventData(BLYSS_OFF_EVENT_DATA),
+            )
+        )
+    await async_add_discovered_entities(hass)
+    assert "BLYSS-1" not in hass_storage[storage_key]["data"]["devices"]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + DEVICES_SAVE_DELAY)
+    await hass.async_block_till_done()
+
+    stored_devices = hass_storage[storage_key]["data"]["devices"]
+    assert set(stored_devices) == {JAMMING_ID_STRING, "BLYSS-1", "BLYSS-2", BLYSS_ID_STRING}
+    assert stored_devices["BLYSS-1"]["profile_name"] == "X10|CHACON|KD101|BLYSS|FS20 On/Off"
+    # The jamming detector and the 3 discovered devices are saved in one write
+    assert gateway.device_store.coalesced_writes == 3
+    # The config entry is not updated
+    assert entry.data is entry_data
+
+    # Unsaved devices are saved on unload
+    client.event_callback(
+        RfDeviceEvent(device=RfDeviceId(protocol="BLYSS", address="3"), data=RfPlayerEventData(BLYSS_OFF_EVENT_DATA))
+    )
+    assert "BLYSS-3" not in hass_storage[storage_key]["data"]["devices"]
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert "BLYSS-3" in hass_storage[storage_key]["data"]["devices"]
+
+
 @pytest.mark.asyncio
 async def test_send_raw_command(
     serial_connection_mock: Mock, hass: HomeAssistant, test_protocol: RfplayerProtocol
@@ -154,6 +212,7 @@ async def test_simulate_event(
     await setup_rfplayer_test_cfg(hass, device="/dev/null", automatic_add=True, devices={})
 
     await hass.services.async_call("rfplayer", "simulate_event", {"event_data": OREGON_EVENT_DATA}, blocking=True)
+    await async_add_discovered_entities(hass)
 
     device_oregon = device_registry.async_get_device(identifiers={(DOMAIN, OREGON_ID_STRING)})
     assert device_oregon is not None
@@ -195,9 +254,10 @@ async def test_ws_device_remove(
     # Verify device entry is removed
     assert device_registry.async_get_device(identifiers={("rfplayer", BLYSS_ID_STRING)}) is None
 
-    # Verify that the config entry has removed the device
-    assert len(mock_entry.data["devices"]) == 1
-    assert JAMMING_ID_STRING in mock_entry.data["devices"]
+    # Verify that the device store has removed the device
+    gateway = cast(Gateway, hass.data[DOMAIN][RFPLAYER_GATEWAY])
+    assert len(gateway.device_store.devices) == 1
+    assert JAMMING_ID_STRING in gateway.device_store
 
 
 @pytest.mark.asyncio
@@ -246,25 +306,85 @@ async def test_connect_with_init_commands(serial_connection_mock: Mock, hass: Ho
 
 @pytest.mark.asyncio
 async def test_connect_timeout(serial_connection_mock: Mock, mocker: MockerFixture, hass: HomeAssistant) -> None:
-    """Test that we attempt to connect to the device."""
+    """Test that the entities are unavailable until the connection succeeds."""
 
-    mocker.patch("custom_components.rfplayer.gateway.asyncio.timeout").side_effect = TimeoutError
+    timeout = mocker.patch("custom_components.rfplayer.gateway.asyncio.timeout")
+    timeout.side_effect = TimeoutError
 
     config_entry = await setup_rfplayer_test_cfg(hass, device="/dev/ttyUSBfake")
 
-    assert config_entry.state is ConfigEntryState.SETUP_RETRY
+    assert config_entry.state is ConfigEntryState.LOADED
+    state = hass.states.get(JAMMING_BINARY_SENSOR_ENTITY_ID)
+    assert state
+    assert state.state == STATE_UNAVAILABLE
+
+    # Reconnected by the gateway
+    timeout.side_effect = None
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+    await hass.async_block_till_done()
+
+    state = hass.states.get(JAMMING_BINARY_SENSOR_ENTITY_ID)
+    assert state
+    assert state.state == STATE_UNKNOWN
 
 
 @pytest.mark.asyncio
 async def test_connect_failed(serial_connection_mock: Mock, hass: HomeAssistant) -> None:
-    """Test that we attempt to connect to the device."""
+    """Test that the setup does not fail when the gateway cannot be connected."""
 
     serial_connection_mock.side_effect = SerialException
 
     config_entry = await setup_rfplayer_test_cfg(hass, device="/dev/ttyUSBfake")
     serial_connection_mock.assert_called_once_with(hass.loop, ANY, "/dev/ttyUSBfake", 115200)
 
-    assert config_entry.state is ConfigEntryState.SETUP_RETRY
+    assert config_entry.state is ConfigEntryState.LOADED
+    state = hass.states.get(JAMMING_BINARY_SENSOR_ENTITY_ID)
+    assert state
+    assert state.state == STATE_UNAVAILABLE
+
+
+@pytest.mark.asyncio
+async def test_unload_with_scheduled_reconnect(serial_connection_mock: Mock, hass: HomeAssistant) -> None:
+    """Test that an unloaded gateway is not reconnected."""
+
+    serial_connection_mock.side_effect = SerialException
+    config_entry = await setup_rfplayer_test_cfg(hass, device="/dev/ttyUSBfake")
+    assert serial_connection_mock.call_count == 1
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+    await hass.async_block_till_done()
+
+    assert serial_connection_mock.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_connect_in_background(
+    serial_connection_mock: Mock, test_protocol: RfplayerProtocol, hass: HomeAssistant
+) -> None:
+    """Test that the entities are set up while the gateway connects."""
+
+    connected = asyncio.Event()
+
+    async def _slow_connection(*args: Any) -> tuple[None, RfplayerProtocol]:
+        await connected.wait()
+        return None, test_protocol
+
+    serial_connection_mock.side_effect = _slow_connection
+
+    config_entry = await setup_rfplayer_test_cfg(hass, device="/dev/ttyUSBfake")
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    state = hass.states.get(JAMMING_BINARY_SENSOR_ENTITY_ID)
+    assert state
+    assert state.state == STATE_UNAVAILABLE
+
+    connected.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get(JAMMING_BINARY_SENSOR_ENTITY_ID)
+    assert state
+    assert state.state == STATE_UNKNOWN
 
 
 @pytest.mark.asyncio
@@ -295,3 +415,46 @@ async def test_reconnect(serial_connection_mock, hass: HomeAssistant) -> None:
 
     assert config_entry.state is ConfigEntryState.LOADED
     serial_connection_mock.call_count = 2
+
+
+@pytest.mark.asyncio
+async def test_unload_with_held_frame(serial_connection_mock: Mock, hass: HomeAssistant) -> None:
+    """Test that the frames held by the repeat window are dropped on unload."""
+
+    config_entry = await setup_rfplayer_test_cfg(hass, device="/dev/ttyUSBfake", automatic_add=True, repeat_window=250)
+    calls: list[RfDeviceEvent] = []
+    async_dispatcher_connect(hass, SIGNAL_RFPLAYER_EVENT, calls.append)  # type: ignore[has-type]
+
+    protocol = serial_connection_mock.call_args[0][1]()
+    protocol.event_callback(RfPlayerEventData(copy.deepcopy(OREGON_EVENT_DATA)))
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    assert config_entry.state is ConfigEntryState.NOT_LOADED
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert not calls
+
+
+@pytest.mark.asyncio
+async def test_receive_redirected_frame(serial_connection_mock: Mock, hass: HomeAssistant) -> None:
+    """Test that the frames of a redirect address pass the packet filter without automatic add."""
+
+    await setup_rfplayer_test_cfg(hass, device="/dev/ttyUSBfake", automatic_add=False)
+    gateway = cast(Gateway, hass.data[DOMAIN][RFPLAYER_GATEWAY])
+    gateway.async_update_devices(
+        {OREGON_ID_STRING: {**OREGON_DEVICE_INFO, "redirect_address": OREGON_REDIRECT_ADDRESS}}
+    )
+    await async_add_discovered_entities(hass)
+
+    protocol = serial_connection_mock.call_args[0][1]()
+    assert protocol.packet_filter
+    redirected_event = copy.deepcopy(OREGON_EVENT_DATA)
+    redirected_event["frame"]["infos"]["adr_channel"] = OREGON_REDIRECT_ADDRESS
+    protocol.data_received(f"ZIA33{json.dumps(redirected_event)}\n\r".encode())
+    await hass.async_block_till_done()
+
+    assert protocol.filtered_packets == 0
+    state = hass.states.get(OREGON_BINARY_SENSOR_ENTITY_ID)
+    assert state
+    assert state.state == STATE_OFF
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
+from typing import Any
 from unittest.mock import Mock
 
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from pytest_mock import MockerFixture
 
-from custom_components.rfplayer.const import DOMAIN
-from homeassistant.const import Platform
+from custom_components.rfplayer.const import CONF_REDIRECT_ADDRESS, DOMAIN
+from homeassistant.const import CONF_DEVICES, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from homeassistant.util import slugify
@@ -96,21 +97,22 @@ async def test_async_migrate_version_from_1_1(
     )
     assert spy_async_update_entity.call_count == 2
 
-    # Test that the config entry version was updated to 1.2
+    # Test that the config entry version was updated to 1.3
     assert mock_entry.version == 1
-    assert mock_entry.minor_version == 2
+    assert mock_entry.minor_version == 3
 
 
 @pytest.mark.asyncio
 async def test_async_migrate_version_from_1_2(
     hass: HomeAssistant,
+    hass_storage: dict[str, Any],
     serial_connection_mock: Mock,
     mocker: MockerFixture,
 ) -> None:
 
     migrate_mock = mocker.patch("custom_components.rfplayer.migration.async_migrate_version_1_2")
 
-    await setup_rfplayer_test_cfg(
+    mock_entry = await setup_rfplayer_test_cfg(
         hass,
         devices={
             OREGON_ID_STRING: OREGON_DEVICE_INFO,
@@ -119,3 +121,10 @@ async def test_async_migrate_version_from_1_2(
     )
 
     assert migrate_mock.call_count == 0
+
+    # The devices were moved from the config entry to the device store
+    assert mock_entry.minor_version == 3
+    assert CONF_DEVICES not in mock_entry.data
+    assert CONF_REDIRECT_ADDRESS not in mock_entry.data
+    stored_devices = hass_storage[f"{DOMAIN}.{mock_entry.entry_id}.devices"]["data"]["devices"]
+    assert stored_devices[OREGON_ID_STRING] == OREGON_DEVICE_INFO
@@ -1,24 +1,37 @@
 import json
-from typing import cast
+from typing import Any, cast
 from unittest.mock import Mock
 
 import pytest
 from pytest_homeassistant_custom_component.common import mock_restore_cache
-
-from custom_components.rfplayer.const import ATTR_EVENT_DATA, DOMAIN, RFPLAYER_CLIENT
+from pytest_mock import MockerFixture
+
+from custom_components.rfplayer.const import (
+    ATTR_EVENT_DATA,
+    ATTR_RECORDED_EVENT_DATA,
+    CONF_RECORD_EVENT_DATA,
+    DOMAIN,
+    RFPLAYER_CLIENT,
+)
+from custom_components.rfplayer.event_snapshot import EventSnapshot
 from custom_components.rfplayer.rfplayerlib import RfPlayerClient
 from custom_components.rfplayer.rfplayerlib.device import RfDeviceEvent, RfDeviceId
 from custom_components.rfplayer.rfplayerlib.protocol import RfPlayerEventData
 from homeassistant.const import (
     ATTR_FRIENDLY_NAME,
     ATTR_UNIT_OF_MEASUREMENT,
+    CONF_EVENT_DATA,
     STATE_UNKNOWN,
     UnitOfPrecipitationDepth,
     UnitOfSoundPressure,
 )
 from homeassistant.core import HomeAssistant, State
-from tests.rfplayer.conftest import setup_rfplayer_test_cfg
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import slugify
+from tests.rfplayer.conftest import async_add_discovered_entities, setup_rfplayer_test_cfg
 from tests.rfplayer.constants import (
+    JAMMING_ID_STRING,
     OREGON_ADDRESS,
     OREGON_DEVICE_INFO,
     OREGON_EVENT_DATA,
@@ -58,7 +71,7 @@ async def test_automatic_add(serial_connection_mock: Mock, hass: HomeAssistant):
         )
     )
 
-    await hass.async_block_till_done()
+    await async_add_discovered_entities(hass)
 
     state = hass.states.get(OREGON_RAIN_SENSOR_ENTITY_ID)
     assert state
@@ -98,3 +111,68 @@ async def test_state_restore(serial_connection_mock: Mock, hass: HomeAssistant)
     state = hass.states.get(OREGON_RAIN_SENSOR_ENTITY_ID)
     assert state
     assert state.state == OREGON_RAIN_SENSOR_STATE
+
+
+@pytest.mark.asyncio
+async def test_event_snapshot_restore(
+    serial_connection_mock: Mock, hass: HomeAssistant, hass_storage: dict[str, Any], mocker: MockerFixture
+) -> None:
+    """State restoration from the last events of the devices."""
+
+    entry = await setup_rfplayer_test_cfg(hass, devices={OREGON_ID_STRING: OREGON_DEVICE_INFO})
+    client = cast(RfPlayerClient, hass.data[DOMAIN][RFPLAYER_CLIENT])
+    record = mocker.spy(EventSnapshot, "async_record")
+    client.event_callback(
+        RfDeviceEvent(device=RfDeviceId(protocol="OREGON", address=OREGON_ADDRESS), data=OREGON_EVENT_DATA)
+    )
+    state = hass.states.get(OREGON_RAIN_SENSOR_ENTITY_ID)
+    assert state
+    # Recorded once for all the entities of the device
+    assert record.call_count == 1
+
+    # The compact payload of the state attributes is saved on unload
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    events = hass_storage[f"{DOMAIN}.{entry.entry_id}.events"]["data"]["events"]
+    assert events == {OREGON_ID_STRING: json.loads(state.attributes[ATTR_EVENT_DATA])}
+
+    get_last_state = mocker.patch.object(RestoreEntity, "async_get_last_state", autospec=True, return_value=None)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(OREGON_RAIN_SENSOR_ENTITY_ID)
+    assert state
+    assert state.state == OREGON_RAIN_SENSOR_STATE
+    # Only the entities of devices without event, e.g. the jamming detector, look up their last state
+    assert get_last_state.call_count == 1
+    assert get_last_state.call_args.args[0].unique_id.startswith(slugify(JAMMING_ID_STRING))
+
+
+def _unrecorded_attributes(hass: HomeAssistant, entity_id: str) -> frozenset[str]:
+    entity = next(
+        platform.entities[entity_id] for platform in async_get_platforms(hass, DOMAIN) if entity_id in platform.entities
+    )
+    return entity._state_info["unrecorded_attributes"]  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_unrecorded_event_data(serial_connection_mock: Mock, hass: HomeAssistant) -> None:
+    entry = await setup_rfplayer_test_cfg(
+        hass,
+        devices={OREGON_ID_STRING: {**OREGON_DEVICE_INFO, CONF_EVENT_DATA: json.dumps(OREGON_EVENT_DATA)}},
+    )
+
+    assert ATTR_EVENT_DATA in _unrecorded_attributes(hass, OREGON_RAIN_SENSOR_ENTITY_ID)
+    state = hass.states.get(OREGON_RAIN_SENSOR_ENTITY_ID)
+    assert state
+    assert ATTR_EVENT_DATA in state.attributes
+    assert ATTR_RECORDED_EVENT_DATA not in state.attributes
+
+    # Recorded for debugging
+    hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_RECORD_EVENT_DATA: True})
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert ATTR_RECORDED_EVENT_DATA not in _unrecorded_attributes(hass, OREGON_RAIN_SENSOR_ENTITY_ID)
+    state = hass.states.get(OREGON_RAIN_SENSOR_ENTITY_ID)
+    assert state
+    assert state.attributes[ATTR_RECORDED_EVENT_DATA] == state.attributes[ATTR_EVENT_DATA]